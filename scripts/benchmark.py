@@ -0,0 +1,459 @@
+# ------------------------------------------------------------------------------
+# Copyright (c) 2022 Korawich Anuttra. All rights reserved.
+# Licensed under the MIT License. See LICENSE in the project root for
+# license information.
+# ------------------------------------------------------------------------------
+"""Benchmark suite for the open file, store, register, and path objects. It
+generates the deterministic synthetic data on a temporary dir, measures the
+latency of every case, and reports the percentiles with the throughput.
+
+    The result can save as a Json file, and compare with the baseline result
+that was saved before, so it can tell the case that got slower between two
+releases.
+
+Examples:
+    $ python scripts/benchmark.py --output baseline.json
+    $ python scripts/benchmark.py --baseline baseline.json --threshold 0.2
+    $ python scripts/benchmark.py --scale 0.1 --filter "files.*"
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import fnmatch
+import itertools
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import string
+import sys
+import tempfile
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Optional
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import yaml  # noqa: E402
+
+from ddeutil.io import __version__  # noqa: E402
+from ddeutil.io.config import Params  # noqa: E402
+from ddeutil.io.files import (  # noqa: E402
+    CsvFl,
+    JsonLineFl,
+    YamlEnvFl,
+)
+from ddeutil.io.paths import PathSearch  # noqa: E402
+from ddeutil.io.register import Register  # noqa: E402
+from ddeutil.io.stores import Store  # noqa: E402
+from ddeutil.io.utils import search_env_replace  # noqa: E402
+
+SEED: int = 20240101
+DOMAIN: str = "bench"
+
+
+@dataclass
+class Size:
+    """Size dataclass that keep the numbers of the synthetic data generators,
+    and it scales all numbers together with the scale value.
+    """
+
+    files: int = 50
+    keys: int = 20
+    versions: int = 20
+    rows: int = 20_000
+    depth: int = 4
+    fanout: int = 4
+    leaves: int = 5
+
+    def scale(self, value: float) -> Size:
+        return Size(
+            files=max(1, round(self.files * value)),
+            keys=max(1, round(self.keys * value)),
+            versions=max(2, round(self.versions * value)),
+            rows=max(10, round(self.rows * value)),
+            depth=self.depth,
+            fanout=self.fanout,
+            leaves=max(1, round(self.leaves * value)),
+        )
+
+
+@dataclass
+class Case:
+    """Case dataclass that keep a benchmark function and the number of bytes
+    that this function processes per call. The setup function will call before
+    every call of the benchmark function, and it does not measure.
+    """
+
+    name: str
+    func: Callable[[], Any]
+    size: int = 0
+    params: dict[str, Any] = field(default_factory=dict)
+    setup: Optional[Callable[[], Any]] = None
+
+
+def words(rnd: random.Random, n: int = 8) -> str:
+    return "".join(rnd.choices(string.ascii_lowercase, k=n))
+
+
+def gen_config(rnd: random.Random, index: int, keys: int) -> dict[str, Any]:
+    """Return the config data with the number of keys, and the nested values
+    that have the env var templates.
+    """
+    return {
+        f"conn_{index:05d}": {
+            "type": "conn.Dummy",
+            "endpoint": "file:///${BENCH_ROOT}/" + words(rnd),
+            **{
+                f"key_{k:03d}": (
+                    {"value": words(rnd), "env": "${BENCH_ENV:default}"}
+                    if k % 4 == 0
+                    else rnd.choice([words(rnd), rnd.randint(0, 10**6), True])
+                )
+                for k in range(keys)
+            },
+        }
+    }
+
+
+def gen_configs(root: Path, size: Size) -> list[Path]:
+    """Generate the N config files with M keys per config."""
+    rnd = random.Random(SEED)
+    (path := root / "conf" / DOMAIN).mkdir(parents=True, exist_ok=True)
+    files: list[Path] = []
+    for i in range(size.files):
+        files.append(file := path / f"conf_{i:05d}.yaml")
+        with open(file, mode="w", encoding="utf-8") as f:
+            yaml.dump(gen_config(rnd, i, size.keys), f)
+    return files
+
+
+def gen_csv(path: Path, size: Size) -> Path:
+    """Generate the large CSV file."""
+    rnd = random.Random(SEED)
+    with open(path, mode="w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, quoting=csv.QUOTE_ALL, lineterminator="\n")
+        writer.writerow(["id", "name", "amount", "updated"])
+        for i in range(size.rows):
+            writer.writerow(
+                [
+                    i,
+                    words(rnd),
+                    f"{rnd.random() * 1000:.2f}",
+                    f"{datetime(2024, 1, 1) + timedelta(seconds=i):%Y-%m-%d}",
+                ]
+            )
+    return path
+
+
+def gen_jsonl(path: Path, size: Size) -> Path:
+    """Generate the large Json line file."""
+    rnd = random.Random(SEED)
+    with open(path, mode="w", encoding="utf-8") as f:
+        for i in range(size.rows):
+            f.write(
+                json.dumps(
+                    {"id": i, "name": words(rnd), "tags": [words(rnd, 4)] * 3}
+                )
+                + "\n"
+            )
+    return path
+
+
+def gen_tree(root: Path, size: Size) -> Path:
+    """Generate the deep directory tree with the files on every directory."""
+
+    def recurse(path: Path, level: int) -> None:
+        path.mkdir(parents=True, exist_ok=True)
+        for i in range(size.leaves):
+            (path / f"file_{i:03d}.yaml").write_text("key: value\n")
+            (path / f"file_{i:03d}.json").write_text("{}\n")
+        if level < size.depth:
+            for i in range(size.fanout):
+                recurse(path / f"dir_{i:02d}", level + 1)
+
+    recurse(root, 1)
+    return root
+
+
+def gen_stages(root: Path, size: Size) -> Params:
+    """Generate the K stage versions of one config by deploying it with the
+    changed value on every deployment.
+    """
+    params = Params(
+        **{
+            "paths": {"root": root},
+            "stages": {
+                "raw": {"format": "{naming:%s}.{version:v%m.%n.%c}"},
+                "persisted": {"format": "{naming:%s}.{version:v%m.%n.%c}"},
+            },
+        }
+    )
+    (conf := root / "conf" / DOMAIN).mkdir(parents=True, exist_ok=True)
+    for i in range(size.versions):
+        with open(conf / "stage.yaml", mode="w", encoding="utf-8") as f:
+            yaml.dump({"conn_stage": {"type": "conn.Dummy", "value": i}}, f)
+        with patch(
+            "ddeutil.io.register.get_date",
+            return_value=datetime(2024, 1, 1) + timedelta(minutes=i),
+        ):
+            Register(name=f"{DOMAIN}:conn_stage", params=params).deploy()
+    return params
+
+
+def cases(root: Path, size: Size, pattern: str = "*") -> Iterator[Case]:
+    """Generate the synthetic data and yield the benchmark cases that match
+    with a name pattern. It generates the data of a case only if this case was
+    selected.
+    """
+
+    def selected(*names: str) -> bool:
+        return any(fnmatch.fnmatch(name, pattern) for name in names)
+
+    os.environ.setdefault("BENCH_ROOT", str(root))
+    if selected(
+        "files.YamlEnvFl.read", "utils.search_env_replace", "stores.Store.get"
+    ):
+        files: list[Path] = gen_configs(root, size)
+        if selected("files.YamlEnvFl.read"):
+            yield Case(
+                "files.YamlEnvFl.read",
+                lambda: YamlEnvFl(files[0]).read(),
+                size=files[0].stat().st_size,
+                params={"keys": size.keys},
+            )
+
+        if selected("utils.search_env_replace"):
+            content: str = "\n".join(
+                f.read_text(encoding="utf-8") for f in files
+            )
+            yield Case(
+                "utils.search_env_replace",
+                lambda: search_env_replace(content),
+                size=len(content.encode("utf-8")),
+                params={"files": size.files, "keys": size.keys},
+            )
+
+        if selected("stores.Store.get"):
+            yield Case(
+                "stores.Store.get",
+                lambda: Store(root / "conf" / DOMAIN).get(
+                    name=f"conn_{size.files - 1:05d}"
+                ),
+                size=sum(f.stat().st_size for f in files),
+                params={"files": size.files, "keys": size.keys},
+            )
+
+    if selected("files.CsvFl.read"):
+        csv_file: Path = gen_csv(root / "large.csv", size)
+        yield Case(
+            "files.CsvFl.read",
+            lambda: CsvFl(csv_file).read(),
+            size=csv_file.stat().st_size,
+            params={"rows": size.rows},
+        )
+
+    if selected("files.JsonLineFl.read"):
+        jsonl_file: Path = gen_jsonl(root / "large.jsonl", size)
+        yield Case(
+            "files.JsonLineFl.read",
+            lambda: JsonLineFl(jsonl_file).read(),
+            size=jsonl_file.stat().st_size,
+            params={"rows": size.rows},
+        )
+
+    if selected("paths.PathSearch"):
+        tree: Path = gen_tree(root / "tree", size)
+        yield Case(
+            "paths.PathSearch",
+            lambda: PathSearch(tree).pick("*.yaml"),
+            params={
+                "depth": size.depth,
+                "fanout": size.fanout,
+                "leaves": size.leaves,
+            },
+        )
+
+    if selected("register.Register.get", "register.Register.deploy"):
+        params: Params = gen_stages(root / "register", size)
+        if selected("register.Register.get"):
+            yield Case(
+                "register.Register.get",
+                lambda: Register(
+                    name=f"{DOMAIN}:conn_stage", params=params, lazy=True
+                ).get(stage="raw", order=size.versions),
+                params={"versions": size.versions},
+            )
+
+        if selected("register.Register.deploy"):
+            stage: Path = root / "register" / "conf" / DOMAIN / "stage.yaml"
+            values: Iterator[int] = itertools.count(size.versions)
+
+            def change() -> None:
+                """Change the config value, so every deployment moves the new
+                data through all stages instead of the unchanged shortcut.
+                """
+                with open(stage, mode="w", encoding="utf-8") as f:
+                    yaml.dump(
+                        {
+                            "conn_stage": {
+                                "type": "conn.Dummy",
+                                "value": next(values),
+                            }
+                        },
+                        f,
+                    )
+
+            yield Case(
+                "register.Register.deploy",
+                lambda: Register(
+                    name=f"{DOMAIN}:conn_stage", params=params
+                ).deploy(),
+                params={"versions": size.versions},
+                setup=change,
+            )
+
+
+def measure(case: Case, repeat: int, warmup: int = 1) -> dict[str, Any]:
+    """Return the latency percentiles in milliseconds and the throughput of a
+    benchmark case.
+    """
+    for _ in range(warmup):
+        if case.setup:
+            case.setup()
+        case.func()
+
+    durations: list[float] = []
+    for _ in range(repeat):
+        if case.setup:
+            case.setup()
+        start: float = time.perf_counter()
+        case.func()
+        durations.append((time.perf_counter() - start) * 1000)
+
+    values: list[float] = sorted(durations)
+
+    def percentile(q: float) -> float:
+        return values[min(len(values) - 1, max(0, round(q * len(values)) - 1))]
+
+    mean: float = statistics.fmean(values)
+    rs: dict[str, Any] = {
+        "repeat": repeat,
+        "mean_ms": mean,
+        "stdev_ms": statistics.pstdev(values),
+        "min_ms": values[0],
+        "p50_ms": percentile(0.5),
+        "p90_ms": percentile(0.9),
+        "p99_ms": percentile(0.99),
+        "max_ms": values[-1],
+        "ops_per_sec": 1000 / mean if mean else 0.0,
+        "params": case.params,
+    }
+    if case.size:
+        rs["bytes"] = case.size
+        rs["mb_per_sec"] = (case.size / 1_048_576) / (mean / 1000)
+    return rs
+
+
+def compare(
+    results: dict[str, Any],
+    baseline: dict[str, Any],
+    threshold: float,
+) -> list[str]:
+    """Return the names of cases that the p50 latency is slower than the
+    baseline more than the threshold ratio, and print the comparison table.
+    """
+    regressions: list[str] = []
+    print(f"\n{'case':<28} {'base p50':>10} {'p50':>10} {'change':>8}")
+    for name, rs in results["results"].items():
+        if (base := baseline.get("results", {}).get(name)) is None:
+            print(f"{name:<28} {'-':>10} {rs['p50_ms']:>10.3f} {'new':>8}")
+            continue
+        change: float = rs["p50_ms"] / base["p50_ms"] - 1
+        flag: str = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = " !"
+        print(
+            f"{name:<28} {base['p50_ms']:>10.3f} {rs['p50_ms']:>10.3f} "
+            f"{change:>+8.1%}{flag}"
+        )
+    return regressions
+
+
+@contextmanager
+def workdir(path: Optional[str]) -> Iterator[Path]:
+    if path:
+        (root := Path(path)).mkdir(parents=True, exist_ok=True)
+        yield root
+        return
+    with tempfile.TemporaryDirectory(prefix="ddeutil-io-bench-") as tmp:
+        yield Path(tmp)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--filter", default="*", help="A case name pattern.")
+    parser.add_argument("--output", help="A Json file that save the result.")
+    parser.add_argument("--baseline", help="A Json file of baseline result.")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    parser.add_argument("--workdir", help="A dir of the synthetic data.")
+    args = parser.parse_args(argv)
+
+    # NOTE: The unchanged deployment logs the warning on every call.
+    logging.getLogger("ddeutil.io").setLevel(logging.ERROR)
+
+    size: Size = Size().scale(args.scale)
+    results: dict[str, Any] = {
+        "meta": {
+            "version": __version__,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "datetime": f"{datetime.now():%Y-%m-%d %H:%M:%S}",
+            "scale": args.scale,
+            "repeat": args.repeat,
+            "seed": SEED,
+        },
+        "results": {},
+    }
+    print(
+        f"{'case':<28} {'p50 ms':>10} {'p90 ms':>10} {'p99 ms':>10} "
+        f"{'ops/s':>10} {'MB/s':>8}"
+    )
+    with workdir(args.workdir) as root:
+        for case in cases(root, size, pattern=args.filter):
+            rs: dict[str, Any] = measure(case, repeat=args.repeat)
+            results["results"][case.name] = rs
+            print(
+                f"{case.name:<28} {rs['p50_ms']:>10.3f} {rs['p90_ms']:>10.3f} "
+                f"{rs['p99_ms']:>10.3f} {rs['ops_per_sec']:>10.1f} "
+                f"{rs.get('mb_per_sec', 0):>8.1f}"
+            )
+
+    if args.output:
+        Path(args.output).write_text(
+            json.dumps(results, indent=4), encoding="utf-8"
+        )
+
+    if args.baseline:
+        baseline: dict[str, Any] = json.loads(
+            Path(args.baseline).read_text(encoding="utf-8")
+        )
+        if regressions := compare(results, baseline, args.threshold):
+            print(f"\nRegression over {args.threshold:.0%}: {regressions}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,6 +6,11 @@
 from . import files as base
 from .__about__ import __version__
 from .__regex import RegexConf
+from .catalog import (
+    BaseCatalog,
+    JsonCatalog,
+    SqliteCatalog,
+)
 from .config import (
     UPDATE_KEY,
     VERSION_KEY,
@@ -36,7 +41,16 @@ from .files import (
     YamlFl,
     YamlFlResolve,
 )
+from .hooks import (
+    Aggregator,
+    Record,
+    add_hook,
+    hooked,
+    instrument,
+    remove_hook,
+)
 from .paths import (
+    IgnoreMatcher,
     PathSearch,
     glob_files,
     is_ignored,
@@ -44,14 +58,27 @@ from .paths import (
     read_ignore,
     replace_sep,
 )
+from .snapshots import (
+    FrozenDict,
+    Snapshot,
+    freeze,
+    thaw,
+)
 from .stores import (
     BaseStore,
+    DbmStore,
+    Generations,
+    SqliteStore,
     Store,
     StoreJsonToCsv,
+    StoreLog,
     StoreToJsonLine,
 )
 from .utils import (
+    fsync_dir,
+    lock_file,
     map_func,
+    move_files,
     rm,
     search_env,
     search_env_replace,
@@ -59,3 +86,7 @@ from .utils import (
     template_secret,
     touch,
 )
+from .watchers import (
+    Watcher,
+    signature,
+)
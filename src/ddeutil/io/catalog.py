@@ -0,0 +1,359 @@
+# ------------------------------------------------------------------------------
+# Copyright (c) 2022 Korawich Anuttra. All rights reserved.
+# Licensed under the MIT License. See LICENSE in the project root for
+# license information.
+# ------------------------------------------------------------------------------
+"""Metadata catalog objects that keep the latest hashed context data of any
+config name and stage for the Register object. This module will provide the
+standard and abstraction objects for your customize usage.
+
+    *   JsonCatalog     : Catalog that keeps one Json file per config name and
+                          stage (default).
+    *   SqliteCatalog   : Catalog that keeps one row per config name and stage
+                          on the SQLite database file.
+"""
+from __future__ import annotations
+
+import abc
+import json
+import logging
+import os
+import sqlite3
+import threading
+from collections.abc import Iterable, Iterator
+from datetime import datetime
+from pathlib import Path
+from typing import Any, ClassVar, Optional, Union
+
+from .__type import TupleStr
+from .config import DATE_FMT, DIGEST_KEY, UPDATE_KEY, VERSION_KEY
+from .hooks import instrument
+from .stores import Store
+
+logger = logging.getLogger("ddeutil.io")
+
+CatalogKey = tuple[str, str, str]
+
+__all__: TupleStr = (
+    "BaseCatalog",
+    "JsonCatalog",
+    "SqliteCatalog",
+)
+
+
+class BaseCatalog(abc.ABC):
+    """Base Catalog object that keep metadata of config names by the key of
+    domain, name, and stage.
+
+    :param path: A metadata directory path.
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path: Path = Path(path) if isinstance(path, str) else path
+        self.path.mkdir(parents=True, exist_ok=True)
+
+    @abc.abstractmethod
+    def load(self, domain: str, name: str, stage: str) -> dict[str, Any]:
+        """Return the metadata of a config name and stage, default empty dict.
+
+        :param domain: A domain value of config.
+        :param name: A name of config.
+        :param stage: A stage value.
+        :rtype: dict[str, Any]
+        """
+
+    @abc.abstractmethod
+    def save(
+        self,
+        domain: str,
+        name: str,
+        stage: str,
+        data: dict[str, Any],
+    ) -> None:
+        """Save the metadata of a config name and stage.
+
+        :param domain: A domain value of config.
+        :param name: A name of config.
+        :param stage: A stage value.
+        :param data: A metadata.
+        """
+
+    def save_many(
+        self, records: Iterable[tuple[CatalogKey, dict[str, Any]]]
+    ) -> None:
+        """Save many metadata in one batch.
+
+        :param records: A pair of the catalog key and its metadata.
+        """
+        for (domain, name, stage), data in records:
+            self.save(domain, name, stage, data)
+
+    @abc.abstractmethod
+    def delete(self, domain: str, name: str, stage: str) -> None:
+        """Delete the metadata of a config name and stage if it exists.
+
+        :param domain: A domain value of config.
+        :param name: A name of config.
+        :param stage: A stage value.
+        """
+
+
+class JsonCatalog(BaseCatalog):
+    """Json Catalog object that keep metadata with one Json file per config name
+    and stage on the metadata directory.
+    """
+
+    def file(self, domain: str, name: str, stage: str) -> Path:
+        """Return the metadata file path of a config name and stage.
+
+        :rtype: Path
+        """
+        return self.path / f"{domain or ''}{name}.{stage}.json"
+
+    def load(self, domain: str, name: str, stage: str) -> dict[str, Any]:
+        return Store(path=self.path).load(
+            path=self.file(domain, name, stage), default={}
+        )
+
+    def save(
+        self,
+        domain: str,
+        name: str,
+        stage: str,
+        data: dict[str, Any],
+    ) -> None:
+        Store(path=self.path).save(
+            path=self.file(domain, name, stage), data=data
+        )
+
+    def delete(self, domain: str, name: str, stage: str) -> None:
+        self.file(domain, name, stage).unlink(missing_ok=True)
+
+    def records(
+        self,
+        domains: Iterable[str] = (),
+    ) -> Iterator[tuple[CatalogKey, dict[str, Any]]]:
+        """Return all metadata in this catalog. The domain and name do not have
+        a separator on the metadata filename, so it will split them with the
+        longest matching domain from an input domains.
+
+        :param domains: A list of domain values that want to split.
+        :rtype: Iterator[tuple[CatalogKey, dict[str, Any]]]
+        """
+        _domains: list[str] = sorted(domains, key=len, reverse=True)
+        for file in sorted(self.path.glob("*.json")):
+            prefix, _, stage = file.stem.rpartition(".")
+            if not prefix:
+                continue
+            domain: str = next(
+                (
+                    d
+                    for d in _domains
+                    if prefix.startswith(d) and len(prefix) > len(d)
+                ),
+                "",
+            )
+            yield (domain, prefix[len(domain) :], stage), json.loads(
+                file.read_text(encoding="utf-8")
+            )
+
+
+class SqliteCatalog(BaseCatalog):
+    """SQLite Catalog object that keep metadata with one row per config name and
+    stage on a SQLite database file in the metadata directory. It uses the WAL
+    journal mode, so readers do not block a writer, and indexes by name,
+    stage, and the update timestamp.
+    """
+
+    filename: ClassVar[str] = "catalog.db"
+    schema: ClassVar[TupleStr] = (
+        (
+            "CREATE TABLE IF NOT EXISTS metadata ("
+            "domain TEXT NOT NULL, "
+            "name TEXT NOT NULL, "
+            "stage TEXT NOT NULL, "
+            "updt TEXT, "
+            "version TEXT, "
+            "digest TEXT, "
+            "data TEXT NOT NULL, "
+            "PRIMARY KEY (domain, name, stage))"
+        ),
+        "CREATE INDEX IF NOT EXISTS ix_metadata_name ON metadata (name)",
+        (
+            "CREATE INDEX IF NOT EXISTS ix_metadata_stage_updt "
+            "ON metadata (stage, updt)"
+        ),
+    )
+
+    # NOTE: Keep a connection per database path on each thread because the
+    #   SQLite connection should not share between threads or forked processes.
+    __local: ClassVar[threading.local] = threading.local()
+
+    @property
+    def db(self) -> Path:
+        """Return the database file path of this catalog.
+
+        :rtype: Path
+        """
+        return self.path / self.filename
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """Return the cached connection of this database file on the current
+        thread.
+
+        :rtype: sqlite3.Connection
+        """
+        if not hasattr(self.__local, "conns"):
+            self.__local.conns = {}
+        key: tuple[int, Path] = (os.getpid(), self.db)
+        if (conn := self.__local.conns.get(key)) is None:
+            conn = sqlite3.connect(self.db)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with conn:
+                for statement in self.schema:
+                    conn.execute(statement)
+            self.__local.conns[key] = conn
+        return conn
+
+    def close(self) -> None:
+        """Close the cached connection of this database file on the current
+        thread.
+        """
+        conns: dict[tuple[int, Path], sqlite3.Connection] = getattr(
+            self.__local, "conns", {}
+        )
+        if (conn := conns.pop((os.getpid(), self.db), None)) is not None:
+            conn.close()
+
+    @classmethod
+    def close_all(cls) -> None:
+        """Close all cached connections of the current process on the current
+        thread. It should call before a short-lived thread exits because its
+        connections will not close until garbage collection.
+        """
+        conns: dict[tuple[int, Path], sqlite3.Connection] = getattr(
+            cls.__local, "conns", {}
+        )
+        for key in [key for key in conns if key[0] == os.getpid()]:
+            conns.pop(key).close()
+
+    def load(self, domain: str, name: str, stage: str) -> dict[str, Any]:
+        row: Optional[tuple[str]] = self.conn.execute(
+            "SELECT data FROM metadata "
+            "WHERE domain = ? AND name = ? AND stage = ?",
+            (domain or "", name, stage),
+        ).fetchone()
+        return json.loads(row[0]) if row else {}
+
+    @staticmethod
+    def __row(
+        key: CatalogKey, data: dict[str, Any]
+    ) -> tuple[str, str, str, Any, Any, Any, str]:
+        domain, name, stage = key
+        return (
+            domain or "",
+            name,
+            stage,
+            data.get(UPDATE_KEY),
+            data.get(VERSION_KEY),
+            data.get(DIGEST_KEY),
+            json.dumps(data, default=str),
+        )
+
+    def save(
+        self,
+        domain: str,
+        name: str,
+        stage: str,
+        data: dict[str, Any],
+    ) -> None:
+        self.save_many([((domain, name, stage), data)])
+
+    @instrument("SqliteCatalog.save_many", path=lambda self: self.db)
+    def save_many(
+        self, records: Iterable[tuple[CatalogKey, dict[str, Any]]]
+    ) -> None:
+        """Save many metadata in one transaction.
+
+        :param records: A pair of the catalog key and its metadata.
+        """
+        with self.conn as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO metadata "
+                "(domain, name, stage, updt, version, digest, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (self.__row(key, data) for key, data in records),
+            )
+
+    def delete(self, domain: str, name: str, stage: str) -> None:
+        with self.conn as conn:
+            conn.execute(
+                "DELETE FROM metadata "
+                "WHERE domain = ? AND name = ? AND stage = ?",
+                (domain or "", name, stage),
+            )
+
+    def changed_since(
+        self,
+        since: datetime,
+        stage: Optional[str] = None,
+    ) -> list[CatalogKey]:
+        """Return the keys of config names that was updated since a datetime.
+
+        :param since: A datetime value.
+        :param stage: A stage value that want to filter.
+        :rtype: list[CatalogKey]
+        """
+        query: str = "SELECT domain, name, stage FROM metadata WHERE updt >= ?"
+        params: list[str] = [f"{since:{DATE_FMT}}"]
+        if stage is not None:
+            query += " AND stage = ?"
+            params.append(stage)
+        return [
+            tuple(row)
+            for row in self.conn.execute(f"{query} ORDER BY updt", params)
+        ]
+
+    def latest_versions(self, stage: Optional[str] = None) -> dict[str, str]:
+        """Return the latest version of every config name.
+
+        :param stage: A stage value that want to filter.
+        :rtype: dict[str, str]
+        """
+        query: str = "SELECT domain, name, version FROM metadata"
+        params: list[str] = []
+        if stage is not None:
+            query += " WHERE stage = ?"
+            params.append(stage)
+
+        rs: dict[str, str] = {}
+        for domain, name, version in self.conn.execute(
+            f"{query} ORDER BY updt", params
+        ):
+            if version is not None:
+                rs[f"{domain}:{name}" if domain else name] = version
+        return rs
+
+    def migrate(
+        self,
+        source: JsonCatalog,
+        domains: Iterable[str] = (),
+    ) -> int:
+        """Migrate all metadata from the Json catalog to this catalog in one
+        transaction.
+
+        :param source: A Json catalog.
+        :param domains: A list of domain values that use to split the domain
+            and name from the metadata filename.
+
+        :rtype: int
+        :returns: A number of migrated metadata.
+        """
+        records: list[tuple[CatalogKey, dict[str, Any]]] = list(
+            source.records(domains)
+        )
+        self.save_many(records)
+        logger.info(f"Migrate {len(records)} metadata to {self.db}.")
+        return len(records)
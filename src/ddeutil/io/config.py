@@ -8,6 +8,7 @@ from __future__ import annotations
 import os
 import re
 from dataclasses import asdict, dataclass, field
+from functools import lru_cache
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Optional, Union
 
@@ -20,6 +21,8 @@ from .files import YamlEnvFl
 
 UPDATE_KEY: str = "__updt"
 VERSION_KEY: str = "__version"
+DIGEST_KEY: str = "__digest"
+DELTA_KEY: str = "__delta"
 VERSION_DEFAULT: str = "1990-01-01"
 DATE_FMT: str = "%Y-%m-%d %H:%M:%S"
 DATE_LOG_FMT: str = "%Y%m%d%H%M%S"
@@ -36,6 +39,9 @@ RULE_NECESSARY_KEYS: TupleStr = (
     "timestamp",
     "compress",
 )
+FMT_NAME_PATTERN: re.Pattern[str] = re.compile(
+    r"{\s?(?P<name>\w+):?(?P<format>[^{}]+)?\s?}"
+)
 
 
 def get_root_path() -> Path:
@@ -49,6 +55,16 @@ def get_root_path() -> Path:
     return Path()
 
 
+@lru_cache(maxsize=256)
+def format_names(fmt: str) -> TupleStr:
+    """Return the cached format names that was found in a format string.
+
+    :param fmt: A format string value.
+    :rtype: TupleStr
+    """
+    return tuple(m.group("name") for m in FMT_NAME_PATTERN.finditer(fmt))
+
+
 @dataclass(frozen=True)
 class Rule:
     """Rule dataclass that keep rule setting data for Register object.
@@ -58,12 +74,23 @@ class Rule:
         ...     "timestamp": {"minutes": 15},
         ...     "excluded": [],
         ...     "compress": None,
+        ...     "delta": 0,
+        ...     "generations": 0,
         ... }
+
+        The delta value is a number of stage files in a chain of one full
+    snapshot and its JSON-patch deltas. It will write the full snapshot on
+    every move if it does not set.
+
+        The generations value is a number of immutable generation dirs that
+    the stage keeps. The stage uses the flat dir layout if it does not set.
     """
 
     timestamp: dict[str, int] = field(default_factory=dict)
     excluded: list = field(default_factory=list)
     compress: Optional[str] = field(default=None)
+    delta: int = field(default=0)
+    generations: int = field(default=0)
 
 
 @dataclass
@@ -92,19 +119,14 @@ class Stage:
 
         # VALIDATE: Check the name in format string should contain any format
         #   name.
-        if not (
-            _searches := re.findall(
-                r"{\s?(?P<name>\w+):?(?P<format>[^{}]+)?\s?}",
-                self.format,
-            )
-        ):
+        if not (_names := format_names(self.format)):
             raise ConfigArgumentError(
                 f"This `{self.alias}` stage format dose not include any format "
                 f"name, the stage file was duplicated."
             )
 
         # VALIDATE: Check the name in format string should exist in `FMT_NAMES`.
-        if any((_search[0] not in FMT_NAMES) for _search in _searches):
+        if any((_name not in FMT_NAMES) for _name in _names):
             raise ConfigArgumentError(
                 "The stage has an unsupported format name.",
             )
@@ -112,7 +134,7 @@ class Stage:
         # VALIDATE: Validate a format of stage that relate with rules.
         for rule_key in RULE_NECESSARY_KEYS:
             if getattr(self.rule, rule_key, None) and (
-                not re.search(rf"{rule_key}", self.format)
+                rule_key not in self.format
             ):
                 raise ConfigArgumentError(
                     f"This stage rule was set `{rule_key}` property but does "
@@ -5,21 +5,65 @@
 # ------------------------------------------------------------------------------
 from __future__ import annotations
 
+import bz2
+import gzip
+import hashlib
+import io
+import logging
+import lzma
+import os
+import struct
 import sys
+import tarfile
 import zipfile
+import zlib
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from tarfile import TarFile
 from typing import (
+    IO,
     Any,
+    ClassVar,
     Literal,
     Optional,
     Protocol,
+    TypedDict,
     Union,
 )
 
 from ddeutil.core import splitter
 
+from .files import JsonFl
+from .paths import ls
+from .utils import rm
+
+logger = logging.getLogger("ddeutil.io")
+
 DirCompressType = Literal["zip", "rar", "tar", "h5", "hdf5", "fits"]
+TAR_COMPRESS: dict[str, str] = {
+    "_": "gz",
+    "gz": "gz",
+    "bz2": "bz2",
+    "xz": "xz",
+}
+
+
+class MemberDigest(TypedDict):
+    """Member digest dict typing that keep on the archive manifest file."""
+
+    size: int
+    mtime: int
+    hash: str
+
+
+class MemberIndex(TypedDict):
+    """Member index dict typing that keep on the tar archive index file."""
+
+    size: int
+    members: dict[str, int]
+    checkpoints: list[tuple[int, int]]
 
 
 class OpenDirProtocol(Protocol):  # pragma: no cov
@@ -36,6 +80,60 @@ class CustomZipFl(zipfile.ZipFile):
     def safe_extract(self, path: str, members=None):
         self.extractall(path, members)
 
+    def write_compressed(self, zinfo: zipfile.ZipInfo, data: bytes) -> None:
+        """Write a member that already compressed with the compress type of an
+        input ZipInfo object. This method writes the local header and the
+        payload directly, so the compression step can run outside this object.
+
+        :param zinfo: A ZipInfo object that already set ``CRC``, ``file_size``
+            and ``compress_type`` values.
+        :param data: A compressed payload of this member.
+        """
+        if self._writing:  # pragma: no cov
+            raise ValueError(
+                "Can't write to the ZIP file while there is another write "
+                "handle open on it."
+            )
+        zinfo.compress_size = len(data)
+        zinfo.flag_bits = 0x00
+        if zinfo.compress_type == zipfile.ZIP_LZMA:
+            # NOTE: Compressed data includes an end-of-stream (EOS) marker.
+            zinfo.flag_bits |= 0x02
+        if not zinfo.external_attr:  # pragma: no cov
+            zinfo.external_attr = 0o600 << 16
+
+        with self._lock:
+            if self._seekable:
+                self.fp.seek(self.start_dir)
+            zinfo.header_offset = self.fp.tell()
+            self._writecheck(zinfo)
+            self._didModify = True
+            self.fp.write(zinfo.FileHeader())
+            self.fp.write(data)
+            self.start_dir = self.fp.tell()
+            self.filelist.append(zinfo)
+            self.NameToInfo[zinfo.filename] = zinfo
+
+    def read_compressed(self, name: str) -> bytes:
+        """Return the compressed payload of a member without decompression.
+
+        :param name: A member name that want to read.
+        :rtype: bytes
+        """
+        zinfo: zipfile.ZipInfo = self.getinfo(name)
+        with self._lock:
+            self.fp.seek(zinfo.header_offset)
+            header = struct.unpack(
+                zipfile.structFileHeader,
+                self.fp.read(zipfile.sizeFileHeader),
+            )
+            self.fp.seek(
+                header[zipfile._FH_FILENAME_LENGTH]
+                + header[zipfile._FH_EXTRA_FIELD_LENGTH],
+                os.SEEK_CUR,
+            )
+            return self.fp.read(zinfo.compress_size)
+
 
 class CustomTarFl(TarFile):
     """Override TarFile object."""
@@ -55,9 +153,160 @@ class CustomTarFl(TarFile):
         self.extractall(path, members)
 
 
+def _compress_stream(fileobj: IO[bytes], comptype: str, **kwargs) -> IO[bytes]:
+    """Return the compress stream object of a compress type that wrap an input
+    file object without closing it when the stream close.
+    """
+    if comptype == "gz":
+        return gzip.GzipFile(fileobj=fileobj, mode="wb", mtime=0, **kwargs)
+    elif comptype == "bz2":
+        return bz2.BZ2File(fileobj, mode="wb", **kwargs)
+    elif comptype == "xz":
+        return lzma.LZMAFile(fileobj, mode="wb", **kwargs)
+    raise NotImplementedError(f"Compress {comptype} does not implement yet")
+
+
+def _decompress_stream(fileobj: IO[bytes], comptype: str) -> IO[bytes]:
+    """Return the decompress stream object of a compress type that read from the
+    current position of an input file object.
+    """
+    if comptype == "gz":
+        return gzip.GzipFile(fileobj=fileobj, mode="rb")
+    elif comptype == "bz2":
+        return bz2.BZ2File(fileobj, mode="rb")
+    elif comptype == "xz":
+        return lzma.LZMAFile(fileobj, mode="rb")
+    raise NotImplementedError(f"Compress {comptype} does not implement yet")
+
+
+class BlockWriter:
+    """Block Writer object that compress written data to a sequence of
+    independent compressed streams. A new stream will start when the
+    ``checkpoint`` method was called, and it keeps the pair of compressed and
+    uncompressed offsets of this boundary.
+
+        A sequence of gzip, bz2, or xz streams is still a valid compressed
+    file, so any reader can read it as the normal compressed file.
+
+    :param fileobj: A binary file object that want to write.
+    :param comptype: A compress type.
+    """
+
+    def __init__(self, fileobj: IO[bytes], comptype: str, **kwargs) -> None:
+        self.fileobj: IO[bytes] = fileobj
+        self.comptype: str = comptype
+        self.kwargs: dict[str, Any] = kwargs
+        self.pos: int = 0
+        self.block: int = 0
+        self.checkpoints: list[tuple[int, int]] = [(fileobj.tell(), 0)]
+        self.stream: IO[bytes] = _compress_stream(fileobj, comptype, **kwargs)
+
+    def write(self, data: bytes) -> int:
+        self.stream.write(data)
+        self.pos += len(data)
+        self.block += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.pos
+
+    def checkpoint(self) -> None:
+        """Close the current compressed stream and start the new one."""
+        self.stream.close()
+        self.checkpoints.append((self.fileobj.tell(), self.pos))
+        self.block = 0
+        self.stream = _compress_stream(
+            self.fileobj, self.comptype, **self.kwargs
+        )
+
+    def close(self) -> None:
+        self.stream.close()
+
+
+def _compress_member(
+    file: Path,
+    arcname: str,
+    compress_type: int,
+    compresslevel: Optional[int] = None,
+) -> tuple[zipfile.ZipInfo, bytes]:
+    """Return the ZipInfo and the compressed payload of a file. This function
+    is safe to run on a worker thread because the compressor of zlib, bz2, and
+    lzma release the GIL while they compress data.
+    """
+    zinfo: zipfile.ZipInfo = zipfile.ZipInfo.from_file(file, arcname)
+    zinfo.compress_type = compress_type
+    raw: bytes = file.read_bytes()
+    zinfo.file_size = len(raw)
+    zinfo.CRC = zlib.crc32(raw)
+
+    # NOTE: The ``_get_compressor`` function return None for ZIP_STORED.
+    if compressor := zipfile._get_compressor(compress_type, compresslevel):
+        return zinfo, compressor.compress(raw) + compressor.flush()
+    return zinfo, raw
+
+
+def _digest_member(
+    file: Path,
+    previous: Optional[MemberDigest] = None,
+) -> MemberDigest:
+    """Return the digest of a file. It will return the previous digest without
+    hashing if the size and mtime of this file do not change.
+    """
+    st: os.stat_result = file.stat()
+    if (
+        previous
+        and previous["size"] == st.st_size
+        and previous["mtime"] == st.st_mtime_ns
+    ):
+        return previous
+
+    digest = hashlib.sha256()
+    with file.open(mode="rb") as f:
+        while chunk := f.read(1 << 20):
+            digest.update(chunk)
+    return {
+        "size": st.st_size,
+        "mtime": st.st_mtime_ns,
+        "hash": digest.hexdigest(),
+    }
+
+
+def _read_member(file: Path, arcname: str) -> tuple[tarfile.TarInfo, bytes]:
+    """Return the TarInfo and the content of a file."""
+    tinfo: tarfile.TarInfo = tarfile.TarInfo(arcname)
+    st: os.stat_result = file.stat()
+    tinfo.mode = st.st_mode & 0o7777
+    tinfo.mtime = int(st.st_mtime)
+    data: bytes = file.read_bytes()
+    tinfo.size = len(data)
+    return tinfo, data
+
+
+def _ordered_map(
+    executor: ThreadPoolExecutor,
+    fn,
+    items: list[tuple[Path, str]],
+    window: int,
+) -> Iterator[Any]:
+    """Yield results of an input function with the same order of items and
+    keep only the ``window`` number of pending futures in memory.
+    """
+    pending: deque[Future] = deque()
+    for item in items:
+        pending.append(executor.submit(fn, *item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
 class Dir:
     """Open Dir Object."""
 
+    manifest_suffix: ClassVar[str] = ".manifest.json"
+    index_suffix: ClassVar[str] = ".index.json"
+    index_block_size: ClassVar[int] = 1 << 20
+
     def __init__(
         self,
         path: Union[str, Path],
@@ -98,15 +347,305 @@ class Dir:
                 **kwargs,
             )
         elif self.compress in ("tar",):
-            tar_compress: dict[str, str] = {
-                "_": "gz",
-                "gz": "gz",
-                "bz2": "bz2",
-                "xz": "xz",
-            }
-
             return CustomTarFl.open(
                 self.path,
-                mode=f"{mode}:{tar_compress[self.sub_compress]}",
+                mode=f"{mode}:{TAR_COMPRESS[self.sub_compress]}",
+                **kwargs,
             )
         raise NotImplementedError
+
+    @property
+    def manifest_path(self) -> Path:
+        """Return the manifest file path that keep member digests of this
+        archive. It will keep beside the archive file.
+
+        :rtype: Path
+        """
+        return self.path.with_name(f"{self.path.name}{self.manifest_suffix}")
+
+    def read_manifest(self) -> dict[str, MemberDigest]:
+        """Return the member digests mapping from the manifest file, or an empty
+        dict if it does not exist or the archive file does not exist.
+
+        :rtype: dict[str, MemberDigest]
+        """
+        if not self.path.exists() or not self.manifest_path.exists():
+            return {}
+        return JsonFl(self.manifest_path).read()
+
+    @property
+    def index_path(self) -> Path:
+        """Return the index file path that keep member offsets of this tar
+        archive. It will keep beside the archive file.
+
+        :rtype: Path
+        """
+        return self.path.with_name(f"{self.path.name}{self.index_suffix}")
+
+    def read_index(self) -> Optional[MemberIndex]:
+        """Return the member index from the index file. It will return None if
+        the index file does not exist or the archive was rewritten after the
+        index file was written.
+
+        :rtype: MemberIndex | None
+        """
+        if not self.path.exists() or not self.index_path.exists():
+            return None
+        index: MemberIndex = JsonFl(self.index_path).read()
+        if index.get("size") != self.path.stat().st_size:
+            logger.warning(f"Index of {self.path} is stale, so it will skip.")
+            return None
+        return index
+
+    def read_member(self, name: str) -> bytes:
+        """Return the content of a member in this archive. A tar archive that
+        packed with the index flag will seek to the nearest compressed block
+        of this member instead of scanning the archive from the start.
+
+        :param name: A member name that want to read.
+        :rtype: bytes
+        """
+        if self.compress in ("zip",):
+            with self.open(mode="r") as d:
+                return d.read(name)
+
+        index: Optional[MemberIndex] = self.read_index()
+        if index is None or name not in index["members"]:
+            with self.open(mode="r") as d:
+                return d.extractfile(name).read()
+
+        offset: int = index["members"][name]
+        c_offset, u_offset = max(
+            (cp for cp in index["checkpoints"] if cp[1] <= offset),
+            key=lambda cp: cp[1],
+        )
+        with self.path.open(mode="rb") as f:
+            f.seek(c_offset)
+            with _decompress_stream(
+                f, TAR_COMPRESS[self.sub_compress]
+            ) as stream:
+                stream.seek(offset - u_offset)
+                with CustomTarFl.open(fileobj=stream, mode="r|") as d:
+                    tinfo: tarfile.TarInfo = d.next()
+                    return d.extractfile(tinfo).read()
+
+    def pack(
+        self,
+        source: Union[str, Path],
+        *,
+        workers: Optional[int] = None,
+        ignore_file: Optional[str] = None,
+        mode: Literal["w", "x", "a"] = "w",
+        incremental: bool = False,
+        index: bool = False,
+        **kwargs,
+    ) -> list[str]:
+        """Pack all files in a source directory to this archive path. Files
+        will walk with the ``paths.ls`` function, so it able to filter with an
+        ignore file, and write to the archive with deterministic order of their
+        relative paths.
+
+            For the zip compress type, members will compress in a thread pool
+        and write to the archive with their compressed payloads. For the tar
+        compress type, the compression is a single stream, so a thread pool
+        will only read file contents in parallel.
+
+            If the incremental flag was set, it will keep a manifest of member
+        digests (size, mtime, and sha256 hash) beside the archive. The packing
+        will skip if all members do not change, and the zip compress type will
+        copy compressed payloads of unchanged members from the old archive
+        without recompression. It rewrites the whole archive, so it does not
+        support the ``a`` mode that would duplicate changed members.
+
+            If the index flag was set on the tar compress type, it will write
+        the archive with independent compressed blocks and keep an index of
+        member offsets and block checkpoints beside the archive, so the
+        ``read_member`` method able to seek straight to a member.
+
+        :param source: A source directory that want to pack.
+        :param workers: A number of thread workers. It will use the default
+            number of ThreadPoolExecutor if it does not set.
+        :param ignore_file: An ignore filename in the source directory.
+        :param mode: An opening mode of this archive.
+        :param incremental: An incremental flag that use the manifest file.
+        :param index: An index flag that write the member index file for the
+            tar compress type.
+
+        :raise ValueError: If the incremental flag was set with the ``a`` mode.
+
+        :rtype: list[str]
+        :returns: A list of member names that packed to this archive.
+        """
+        if incremental and mode == "a":
+            raise ValueError(
+                "The incremental packing does not support the `a` mode."
+            )
+        source: Path = Path(source).resolve()
+        tmp: Path = self.path.with_name(f"{self.path.name}.tmp")
+        excluded: set[Path] = {
+            p.resolve()
+            for p in (self.path, self.manifest_path, self.index_path, tmp)
+        }
+        members: list[tuple[Path, str]] = sorted(
+            (
+                (file, file.relative_to(source).as_posix())
+                for file in ls(source, ignore_file=ignore_file)
+                if file not in excluded
+            ),
+            key=lambda x: x[1],
+        )
+        names: list[str] = [name for _, name in members]
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            if not incremental:
+                self.__pack(executor, members, mode=mode, index=index, **kwargs)
+                return names
+
+            previous: dict[str, MemberDigest] = self.read_manifest()
+            manifest: dict[str, MemberDigest] = dict(
+                zip(
+                    names,
+                    executor.map(
+                        lambda m: _digest_member(m[0], previous.get(m[1])),
+                        members,
+                    ),
+                )
+            )
+            if (
+                self.path.exists()
+                and manifest == previous
+                and (not index or self.read_index() is not None)
+            ):
+                logger.debug(f"Skip packing because {self.path} not change.")
+                return names
+
+            unchanged: set[str] = {
+                name
+                for name, digest in manifest.items()
+                if name in previous and previous[name]["hash"] == digest["hash"]
+            }
+            if (
+                self.compress in ("zip",)
+                and unchanged
+                and self.path.exists()
+                and mode == "w"
+            ):
+                tmp_dir: Dir = self.__class__(
+                    tmp, compress=f"{self.compress}:{self.sub_compress}"
+                )
+                with CustomZipFl(self.path, mode="r") as old:
+                    tmp_dir.__pack(
+                        executor,
+                        members,
+                        mode=mode,
+                        reuse=(old, unchanged),
+                        **kwargs,
+                    )
+                os.replace(tmp, self.path)
+            else:
+                self.__pack(executor, members, mode=mode, index=index, **kwargs)
+
+        JsonFl(self.manifest_path).write(manifest)
+        return names
+
+    def __pack(
+        self,
+        executor: ThreadPoolExecutor,
+        members: list[tuple[Path, str]],
+        *,
+        mode: Literal["w", "x", "a"],
+        reuse: Optional[tuple[CustomZipFl, set[str]]] = None,
+        index: bool = False,
+        **kwargs,
+    ) -> None:
+        """Write members to this archive path with an executor.
+
+        :param executor: A ThreadPoolExecutor object.
+        :param members: A list of pair of file path and member name.
+        :param mode: An opening mode of this archive.
+        :param reuse: A pair of the old zip archive and a set of member names
+            that want to copy compressed payloads from it.
+        :param index: An index flag that write the member index file for the
+            tar compress type.
+        """
+        window: int = executor._max_workers * 2
+        if self.compress in ("tar",) and index:
+            if mode != "w":  # pragma: no cov
+                raise ValueError("The tar index support only the `w` mode.")
+            self.__pack_index(executor, members, window, **kwargs)
+            return
+
+        # NOTE: Remove the index file because it will be stale after this
+        #   archive was rewritten.
+        if self.index_path.exists():
+            rm(self.index_path)
+
+        with self.open(mode=mode, **kwargs) as d:
+            if not isinstance(d, CustomZipFl):
+                for tinfo, data in _ordered_map(
+                    executor, _read_member, members, window
+                ):
+                    d.addfile(tinfo, fileobj=io.BytesIO(data))
+                return
+
+            old, unchanged = reuse or (None, set())
+
+            def compress(
+                file: Path, name: str
+            ) -> tuple[zipfile.ZipInfo, bytes]:
+                if name in unchanged:
+                    old_info: zipfile.ZipInfo = old.getinfo(name)
+
+                    # NOTE: Reuse the compressed payload only if it was
+                    #   compressed with the same compress type.
+                    if old_info.compress_type == d.compression:
+                        zinfo = zipfile.ZipInfo.from_file(file, name)
+                        zinfo.compress_type = old_info.compress_type
+                        zinfo.file_size = old_info.file_size
+                        zinfo.CRC = old_info.CRC
+                        return zinfo, old.read_compressed(name)
+                return _compress_member(
+                    file, name, d.compression, d.compresslevel
+                )
+
+            for zinfo, data in _ordered_map(
+                executor, compress, members, window
+            ):
+                d.write_compressed(zinfo, data)
+
+    def __pack_index(
+        self,
+        executor: ThreadPoolExecutor,
+        members: list[tuple[Path, str]],
+        window: int,
+        **kwargs,
+    ) -> None:
+        """Write members to this tar archive path with independent compressed
+        blocks and write the member index file.
+
+        :param executor: A ThreadPoolExecutor object.
+        :param members: A list of pair of file path and member name.
+        :param window: A number of pending futures.
+        """
+        offsets: dict[str, int] = {}
+        with self.path.open(mode="wb") as f:
+            writer = BlockWriter(f, TAR_COMPRESS[self.sub_compress], **kwargs)
+            with CustomTarFl.open(fileobj=writer, mode="w") as d:
+                for tinfo, data in _ordered_map(
+                    executor, _read_member, members, window
+                ):
+                    # NOTE: Start the new compressed block on the member
+                    #   boundary only.
+                    if writer.block >= self.index_block_size:
+                        writer.checkpoint()
+                    offsets[tinfo.name] = d.offset
+                    d.addfile(tinfo, fileobj=io.BytesIO(data))
+            writer.close()
+
+        JsonFl(self.index_path).write(
+            {
+                "size": self.path.stat().st_size,
+                "members": offsets,
+                "checkpoints": writer.checkpoints,
+            }
+        )
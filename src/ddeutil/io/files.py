@@ -25,8 +25,9 @@ import mmap
 import os
 import pickle
 import re
+import uuid
 from collections.abc import Iterator
-from contextlib import contextmanager
+from contextlib import ExitStack, contextmanager
 from pathlib import Path
 from threading import Lock
 from typing import (
@@ -65,7 +66,8 @@ try:
 except ImportError:  # pragma: no cov
     rtoml = None
 
-from .utils import search_env, search_env_replace
+from .hooks import file_size, instrument
+from .utils import lock_file, search_env, search_env_replace
 
 logger = logging.getLogger("ddeutil.io")
 FileCompressType = Literal["gzip", "gz", "xz", "bz2"]
@@ -129,6 +131,43 @@ def compress_lib(compress: Optional[FileCompressType]) -> CompressProtocol:
     raise NotImplementedError(f"Compress {compress} does not implement yet")
 
 
+class FlIO:
+    """File IO proxy object that delegates all attributes to the opened IO and
+    calls a close callback with the commit flag when it closes. The commit flag
+    will be false if the context of this IO raised any error.
+
+    :param file: An opened IO object.
+    :param callback: A close callback that receive the commit flag.
+    """
+
+    def __init__(self, file: IO, callback: Callable[[bool], None]) -> None:
+        self.__file: IO = file
+        self.__callback: Callable[[bool], None] = callback
+        self.__closed: bool = False
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.__file, name)
+
+    def __iter__(self) -> Iterator[AnyStr]:
+        return iter(self.__file)
+
+    def __enter__(self) -> FlIO:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.__close(commit=(exc_type is None))
+
+    def close(self) -> None:
+        self.__close(commit=True)
+
+    def __close(self, commit: bool) -> None:
+        if self.__closed:
+            return
+        self.__closed = True
+        self.__file.close()
+        self.__callback(commit)
+
+
 class FlABC(abc.ABC):  # pragma: no cov
     """Open File abstraction object for marking abstract methods that need to
     implement on any open file subclass.
@@ -161,8 +200,36 @@ class Fl(FlABC):
         ...     path='./<path>/<filename>.gz.txt', compress='gzip'
         ... ).open() as f:
         ...     data = f.readline()
+
+        The writing modes hold the exclusive lock of this file path. The write
+    mode writes to a temporary file in the same dir and replaces this file with
+    ``os.replace`` when it closes without any error, so readers never see a
+    partial file. The append mode writes in place, so the open file object
+    that allows appending should set ``lock_read`` to hold the shared lock on
+    the reading mode.
     """
 
+    lock_read: ClassVar[bool] = False
+    fsync: ClassVar[bool] = False
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        """Instrument the read and write methods that the subclass implements,
+        so the nested calling to the parent method such as the env mapping read
+        method emits its timing record separately.
+        """
+        super().__init_subclass__(**kwargs)
+        for method in ("read", "write"):
+            if method in cls.__dict__:
+                setattr(
+                    cls,
+                    method,
+                    instrument(
+                        f"{cls.__name__}.{method}",
+                        path=lambda self: self.path,
+                        size=lambda self, _: file_size(self.path),
+                    )(cls.__dict__[method]),
+                )
+
     def __init__(
         self,
         path: Union[str, Path],
@@ -228,6 +295,17 @@ class Fl(FlABC):
             f"{get_args(FileCompressType)}."
         )
 
+    def lock(self, *, shared: bool = False) -> Iterator[None]:
+        """Return the advisory lock context of this file path. It uses for the
+        read-modify-write process that should hold the exclusive lock between
+        reading and writing.
+
+        :param shared: A shared lock flag.
+        :rtype: Iterator[None]
+        """
+        return lock_file(self.path, shared=shared)
+
+    @instrument("Fl.open", path=lambda self: self.path)
     def open(self, *, mode: Optional[str] = None, **kwargs) -> IO:
         """Open this file object with standard libs that match with it file
         format subclass propose.
@@ -236,9 +314,43 @@ class Fl(FlABC):
         :type mode: Optional[str] (None)
         :rtype: IO
         """
-        return compress_lib(self.compress).open(
-            self.path, **(self.__mode(mode) | kwargs)
-        )
+        writing: bool = any(m in (mode or "r") for m in "wax+")
+        if not writing and not self.lock_read:
+            return compress_lib(self.compress).open(
+                self.path, **(self.__mode(mode) | kwargs)
+            )
+
+        stack: ExitStack = ExitStack()
+        stack.enter_context(self.lock(shared=not writing))
+        path: Path = self.path
+        if "w" in (mode or "r") and "+" not in mode:
+            path: Path = self.path.with_name(
+                f".{self.path.name}.{uuid.uuid4().hex[:8]}.tmp"
+            )
+        try:
+            file: IO = compress_lib(self.compress).open(
+                path, **(self.__mode(mode) | kwargs)
+            )
+        except BaseException:
+            stack.close()
+            raise
+
+        def callback(commit: bool) -> None:
+            with stack:
+                if path == self.path:
+                    return
+                elif not commit:
+                    path.unlink(missing_ok=True)
+                    return
+                if self.fsync:
+                    fd: int = os.open(path, os.O_RDONLY)
+                    try:
+                        os.fsync(fd)
+                    finally:
+                        os.close(fd)
+                os.replace(path, self.path)
+
+        return FlIO(file, callback)
 
     @contextmanager
     def mopen(self, *, mode: Optional[str] = None) -> Iterator[Union[IO, mmap]]:
@@ -295,6 +407,7 @@ class EnvFlMixin:
         """
         return value
 
+    @instrument("EnvFl.search_env_replace", size=lambda _, rs: len(rs))
     def search_env_replace(self, content: str) -> str:
         """Return environment variable replaced content.
 
@@ -494,6 +607,8 @@ class YamlEnvFl(YamlFl, EnvFlMixin):
 class CsvFl(Fl):
     """CSV open file object with comma (,) seperator charactor."""
 
+    lock_read: ClassVar[bool] = True
+
     def read(self, pre_load: int = 0) -> list[dict[Union[str, int], Any]]:
         """Return data context from csv file format.
 
@@ -711,6 +826,8 @@ class JsonLineFl(Fl):
     (.json) with a newline seperator.
     """
 
+    lock_read: ClassVar[bool] = True
+
     def read(self) -> list[Any]:
         rs: list[Any] = []
         with self.open(mode="rt") as f:
@@ -0,0 +1,345 @@
+# ------------------------------------------------------------------------------
+# Copyright (c) 2022 Korawich Anuttra. All rights reserved.
+# Licensed under the MIT License. See LICENSE in the project root for
+# license information.
+# ------------------------------------------------------------------------------
+"""Instrumentation hooks that emit the timing record of the hot-path operations
+such as the reading and writing of open file objects, the env substitution,
+the path searching, the store getting, and the register comparing. It does not
+do anything except one truth checking if it does not have any hook.
+
+    *   Record          : Timing record of an operation.
+    *   Aggregator      : In-memory hook that keeps the records per operation and
+                          reports their percentiles and the Prometheus text.
+
+Examples:
+    >>> aggregator = Aggregator()
+    >>> with hooked(aggregator):
+    ...     Store("./conf").get("conn")
+    >>> print(aggregator.report())
+"""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from functools import wraps
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    ClassVar,
+    NamedTuple,
+    Optional,
+    TypeVar,
+    Union,
+)
+
+from .__type import TupleStr
+
+logger = logging.getLogger("ddeutil.io")
+
+T = TypeVar("T", bound=Callable[..., Any])
+Hook = Callable[["Record"], None]
+
+__all__: TupleStr = (
+    "Record",
+    "Aggregator",
+    "add_hook",
+    "remove_hook",
+    "hooked",
+    "instrument",
+)
+
+# NOTE: The registered hooks. The instrumented functions check this list only
+#   once per call, so it should mutate in place with the hook functions.
+hooks: list[Hook] = []
+
+
+class Record(NamedTuple):
+    """Timing record of an operation.
+
+    :param operation: An operation name with the ``<Class>.<method>`` format.
+    :param path: A file path or a config name of this operation.
+    :param ms: A duration in milliseconds.
+    :param size: A number of bytes that was read or written.
+    :param hit: A cache hit flag if this operation has any cache.
+    """
+
+    operation: str
+    path: Optional[str]
+    ms: float
+    size: Optional[int] = None
+    hit: Optional[bool] = None
+
+
+def add_hook(hook: Hook) -> Hook:
+    """Register a hook that receive all timing records. It can use as a
+    decorator.
+
+    :param hook: A hook function that receive a record.
+    :rtype: Hook
+    """
+    if hook not in hooks:
+        hooks.append(hook)
+    return hook
+
+
+def remove_hook(hook: Hook) -> None:
+    """Unregister a hook if it was registered.
+
+    :param hook: A hook function.
+    """
+    if hook in hooks:
+        hooks.remove(hook)
+
+
+@contextmanager
+def hooked(*funcs: Hook) -> Iterator[None]:
+    """Register hooks only within this context.
+
+    :param funcs: Hook functions.
+    :rtype: Iterator[None]
+    """
+    for func in funcs:
+        add_hook(func)
+    try:
+        yield
+    finally:
+        for func in funcs:
+            remove_hook(func)
+
+
+def emit(record: Record) -> None:
+    """Send a record to all hooks. The error of any hook does not raise to the
+    instrumented operation.
+
+    :param record: A timing record.
+    """
+    for hook in tuple(hooks):
+        try:
+            hook(record)
+        except Exception as err:  # pragma: no cov
+            logger.exception(f"Hook {hook!r} was failed: {err}")
+
+
+def file_size(path: Union[str, Path, None]) -> Optional[int]:
+    """Return the file size of a path, or None if it does not exist.
+
+    :param path: A file path.
+    :rtype: Optional[int]
+    """
+    try:
+        return os.stat(path).st_size
+    except (OSError, TypeError, ValueError):
+        return None
+
+
+def instrument(
+    operation: str,
+    *,
+    path: Optional[Callable[[Any], Any]] = None,
+    size: Optional[Callable[[Any, Any], Optional[int]]] = None,
+    hit: Optional[Callable[[Any], Optional[bool]]] = None,
+) -> Callable[[T], T]:
+    """Instrument decorator of a method that emits the timing record of every
+    successful call if it has any hook. The extractor functions run only if it
+    has any hook.
+
+    :param operation: An operation name.
+    :param path: An extractor that receive the instance after calling and
+        return the path of this operation.
+    :param size: An extractor that receive the instance and the result after
+        calling and return a number of bytes.
+    :param hit: An extractor that receive the instance before calling and
+        return the cache hit flag.
+
+    :rtype: Callable[[T], T]
+    """
+
+    def decorator(func: T) -> T:
+        @wraps(func)
+        def wrapper(self, *args, **kwargs):
+            if not hooks:
+                return func(self, *args, **kwargs)
+
+            cached: Optional[bool] = hit(self) if hit else None
+            start: float = time.perf_counter()
+            rs: Any = func(self, *args, **kwargs)
+            ms: float = (time.perf_counter() - start) * 1000
+            target: Any = path(self) if path else None
+            emit(
+                Record(
+                    operation=operation,
+                    path=None if target is None else str(target),
+                    ms=ms,
+                    size=size(self, rs) if size else None,
+                    hit=cached,
+                )
+            )
+            return rs
+
+        return wrapper
+
+    return decorator
+
+
+class Aggregator:
+    """Aggregator hook object that keeps the durations of the latest records per
+    operation in memory, and reports their percentiles.
+
+    :param maxlen: A maximum number of durations per operation that keep to
+        compute the percentiles.
+    """
+
+    quantiles: ClassVar[tuple[float, ...]] = (0.5, 0.9, 0.99)
+
+    def __init__(self, maxlen: int = 10_000) -> None:
+        self.maxlen: int = maxlen
+        self.durations: dict[str, deque[float]] = defaultdict(
+            lambda: deque(maxlen=self.maxlen)
+        )
+        self.counts: dict[str, int] = defaultdict(int)
+        self.totals: dict[str, float] = defaultdict(float)
+        self.sizes: dict[str, int] = defaultdict(int)
+        self.hits: dict[str, int] = defaultdict(int)
+        self.misses: dict[str, int] = defaultdict(int)
+        self.__lock: threading.Lock = threading.Lock()
+
+    def __call__(self, record: Record) -> None:
+        with self.__lock:
+            self.durations[record.operation].append(record.ms)
+            self.counts[record.operation] += 1
+            self.totals[record.operation] += record.ms
+            if record.size is not None:
+                self.sizes[record.operation] += record.size
+            if record.hit is True:
+                self.hits[record.operation] += 1
+            elif record.hit is False:
+                self.misses[record.operation] += 1
+
+    def clear(self) -> None:
+        """Clear all kept records."""
+        with self.__lock:
+            for values in (
+                self.durations,
+                self.counts,
+                self.totals,
+                self.sizes,
+                self.hits,
+                self.misses,
+            ):
+                values.clear()
+
+    def percentile(self, operation: str, q: float) -> float:
+        """Return the nearest-rank percentile of durations of an operation in
+        milliseconds.
+
+        :param operation: An operation name.
+        :param q: A quantile value between 0 and 1.
+        :rtype: float
+        """
+        with self.__lock:
+            values: list[float] = sorted(self.durations.get(operation, ()))
+        if not values:
+            return 0.0
+        return values[min(len(values) - 1, max(0, round(q * len(values)) - 1))]
+
+    def summary(self) -> dict[str, dict[str, Any]]:
+        """Return the summary of all operations.
+
+        :rtype: dict[str, dict[str, Any]]
+        """
+        return {
+            operation: {
+                "count": self.counts[operation],
+                "total_ms": self.totals[operation],
+                **{
+                    f"p{q * 100:g}": self.percentile(operation, q)
+                    for q in self.quantiles
+                },
+                "bytes": self.sizes[operation],
+                "hits": self.hits[operation],
+                "misses": self.misses[operation],
+            }
+            for operation in sorted(self.counts)
+        }
+
+    def report(self) -> str:
+        """Return the text table of per-operation percentiles in milliseconds.
+
+        :rtype: str
+        """
+        summary: dict[str, dict[str, Any]] = self.summary()
+        width: int = max((len(op) for op in summary), default=9)
+        header: list[str] = [
+            "count",
+            *(f"p{q * 100:g}" for q in self.quantiles),
+        ]
+        lines: list[str] = [
+            f"{'operation':<{width}} "
+            + " ".join(f"{h:>10}" for h in header)
+            + f" {'bytes':>12} {'hits':>6}"
+        ]
+        for op, values in summary.items():
+            lines.append(
+                f"{op:<{width}} {values['count']:>10} "
+                + " ".join(
+                    f"{values[f'p{q * 100:g}']:>10.3f}" for q in self.quantiles
+                )
+                + f" {values['bytes']:>12} {values['hits']:>6}"
+            )
+        return "\n".join(lines)
+
+    def prometheus(self, prefix: str = "ddeutil_io") -> str:
+        """Return the Prometheus text exposition format of all operations. The
+        durations will export as the summary metric in seconds.
+
+        :param prefix: A metric name prefix.
+        :rtype: str
+        """
+        summary: dict[str, dict[str, Any]] = self.summary()
+        lines: list[str] = [
+            f"# HELP {prefix}_operation_seconds Duration of operations.",
+            f"# TYPE {prefix}_operation_seconds summary",
+        ]
+        for op, values in summary.items():
+            label: str = f'operation="{escape(op)}"'
+            for q in self.quantiles:
+                lines.append(
+                    f'{prefix}_operation_seconds{{{label},quantile="{q:g}"}} '
+                    f"{values[f'p{q * 100:g}'] / 1000:.9g}"
+                )
+            lines.append(
+                f"{prefix}_operation_seconds_sum{{{label}}} "
+                f"{values['total_ms'] / 1000:.9g}"
+            )
+            lines.append(
+                f"{prefix}_operation_seconds_count{{{label}}} {values['count']}"
+            )
+        for metric, key, doc in (
+            ("bytes", "bytes", "Bytes that was read or written"),
+            ("cache_hits", "hits", "Cache hits"),
+            ("cache_misses", "misses", "Cache misses"),
+        ):
+            lines.append(f"# HELP {prefix}_{metric}_total {doc}.")
+            lines.append(f"# TYPE {prefix}_{metric}_total counter")
+            for op, values in summary.items():
+                lines.append(
+                    f'{prefix}_{metric}_total{{operation="{escape(op)}"}} '
+                    f"{values[key]}"
+                )
+        return "\n".join(lines) + "\n"
+
+
+def escape(value: str) -> str:
+    """Return the escaped label value of the Prometheus text format.
+
+    :param value: A label value.
+    :rtype: str
+    """
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -6,19 +6,159 @@
 from __future__ import annotations
 
 import fnmatch
+import os
+import re
 from collections.abc import Collection, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Union
+from typing import Callable, NamedTuple, Optional, Union
 
 from .__type import Icon, icons
+from .hooks import instrument
 
 
 def replace_sep(value: str) -> str:
     return value.replace("\\", "/")
 
 
-def glob_files(path: Path) -> Iterator[Path]:  # pragma: no cov
-    yield from (file for file in path.rglob("*") if file.is_file())
+class ScanEntry(NamedTuple):
+    """Scan Entry object that keep the entry types that already stat from the
+    scanning worker thread.
+    """
+
+    name: str
+    path: str
+    is_dir: bool
+    is_file: bool
+    is_symlink: bool
+
+
+def scan_dir(path: Union[str, Path]) -> list[ScanEntry]:
+    """Return a list of sorted entries of a directory. It will return an empty
+    list if this directory does not exist or can not access.
+
+    :param path: A directory path that want to scan.
+    :rtype: list[ScanEntry]
+    """
+    try:
+        with os.scandir(path) as it:
+            return sorted(
+                (
+                    ScanEntry(
+                        name=entry.name,
+                        path=entry.path,
+                        is_dir=entry.is_dir(),
+                        is_file=entry.is_file(),
+                        is_symlink=entry.is_symlink(),
+                    )
+                    for entry in it
+                ),
+                key=lambda e: e.name,
+            )
+    except (FileNotFoundError, NotADirectoryError, PermissionError):
+        return []
+
+
+def scan_tree(
+    path: Union[str, Path],
+    *,
+    workers: Optional[int] = None,
+    prune: Optional[Callable[[str, bool], bool]] = None,
+) -> Iterator[tuple[str, ScanEntry]]:
+    """Yield pairs of a relative path and its entry of all entries in a
+    directory tree with deterministic order. Entries of a directory will yield
+    with sorted name before entries of its sub-directories.
+
+        This walker submits the scanning of every sub-directory to a bounded
+    thread pool as soon as it was found, so the metadata round-trips of many
+    directories run concurrently while ``os.scandir`` releases the GIL. It does
+    not walk into symlink directories like ``Path.rglob``.
+
+    :param path: A root path that want to walk.
+    :param workers: A number of thread workers.
+    :param prune: A function that receive a relative path and a directory flag
+        and return True if this entry should skip.
+
+    :rtype: Iterator[tuple[str, ScanEntry]]
+    """
+    executor = ThreadPoolExecutor(max_workers=workers)
+    try:
+        stack: list[tuple[str, Future]] = [
+            ("", executor.submit(scan_dir, path))
+        ]
+        while stack:
+            prefix, future = stack.pop()
+            subdirs: list[tuple[str, Future]] = []
+            for entry in future.result():
+                rel: str = f"{prefix}{entry.name}"
+                is_dir: bool = entry.is_dir and not entry.is_symlink
+                if prune is not None and prune(rel, is_dir):
+                    continue
+                yield rel, entry
+                if is_dir:
+                    subdirs.append(
+                        (f"{rel}/", executor.submit(scan_dir, entry.path))
+                    )
+            stack.extend(reversed(subdirs))
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def glob_files(
+    path: Union[str, Path],
+    *,
+    workers: Optional[int] = None,
+) -> Iterator[Path]:
+    """Yield all files in a directory tree with the parallel directory walker.
+
+    :param path: A root path that want to walk.
+    :param workers: A number of thread workers.
+    :rtype: Iterator[Path]
+    """
+    yield from (
+        Path(entry.path)
+        for _, entry in scan_tree(path, workers=workers)
+        if entry.is_file
+    )
+
+
+def extension(name: str) -> str:
+    """Return the last extension of a filename that include the dot character.
+    A dot-file, like ``.yaml``, will return itself.
+
+    :param name: A filename.
+    :rtype: str
+    """
+    return name[i:] if (i := name.rfind(".")) != -1 else ""
+
+
+def extension_pattern(pattern: str) -> Optional[str]:
+    """Return the ending string of a pattern if it only matches with the end of
+    filename, like ``*.yaml``, otherwise, it will return None.
+
+    :param pattern: A filename pattern.
+    :rtype: str | None
+    """
+    if (
+        pattern.startswith("*")
+        and "." in (ending := pattern[1:])
+        and not any(c in ending for c in "*?[/")
+    ):
+        return ending
+    return None
+
+
+@lru_cache(maxsize=128)
+def compile_pick(patterns: tuple[str, ...]) -> re.Pattern[str]:
+    """Return the cached regular expression that join all filename patterns.
+
+    :param patterns: A tuple of filename patterns.
+    :rtype: re.Pattern[str]
+    """
+    return re.compile(
+        "|".join(fnmatch.translate(f"*/{pattern}") for pattern in patterns)
+    )
 
 
 class PathSearch:
@@ -28,8 +168,11 @@ class PathSearch:
 
     :param root: An input root path that want to search.
     :param exclude: A list of exclude paths.
+    :param workers: A number of thread workers that scan sub-directories
+        concurrently.
     """
 
+    @instrument("PathSearch.search", path=lambda self: self.root)
     def __init__(
         self,
         root: Union[str, Path],
@@ -38,6 +181,7 @@ class PathSearch:
         max_level: int = -1,
         length: int = 4,
         icon: int = 1,
+        workers: Optional[int] = None,
     ) -> None:
         self.root: Path = Path(root) if isinstance(root, str) else root
 
@@ -58,7 +202,10 @@ class PathSearch:
 
         self.output_buf: list = [f"[{self.root.stem}]"]
         self.files: list[Path] = []
-        self.__recurse(self.root, list(self.root.glob("*")), "", 0)
+        self.__extensions: dict[str, list[int]] = {}
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            self.__executor: ThreadPoolExecutor = executor
+            self.__recurse(scan_dir(self.root), "", 0)
 
     @property
     def level(self) -> int:
@@ -67,58 +214,93 @@ class PathSearch:
 
     def __recurse(
         self,
-        path: Path,
-        file_list: list[Path],
+        entries: list[ScanEntry],
         prefix: str,
         level: int,
     ):
-        """Path recursive method for generate buffer of tree and files."""
-        if not file_list or (self.max_level != -1 and self.max_level <= level):
+        """Path recursive method for generate buffer of tree and files. The
+        scanning of sub-directories will submit to the thread pool before
+        recursive, so they are ready when it walks into them.
+        """
+        if not entries or (self.max_level != -1 and self.max_level <= level):
             return
 
         self.real_level: int = max(level, self.real_level)
-        file_list.sort(key=lambda f: (path / f).is_file())
-        for i, sub_path in enumerate(file_list):
-
-            if any(fnmatch.fnmatch(sub_path.name, exc) for exc in self.exclude):
+        entries: list[ScanEntry] = sorted(entries, key=lambda e: e.is_file)
+        excluded: list[bool] = [
+            any(fnmatch.fnmatch(entry.name, exc) for exc in self.exclude)
+            for entry in entries
+        ]
+        prefetch: dict[int, Future] = {}
+        if self.max_level == -1 or level + 1 < self.max_level:
+            prefetch = {
+                i: self.__executor.submit(scan_dir, entry.path)
+                for i, entry in enumerate(entries)
+                if entry.is_dir and not excluded[i]
+            }
+
+        for i, entry in enumerate(entries):
+
+            if excluded[i]:
                 continue
 
-            full_path: Path = path / sub_path
             idc: str = (
-                self.icon.last if i == (len(file_list) - 1) else self.icon.next
+                self.icon.last if i == (len(entries) - 1) else self.icon.next
             )
 
-            if full_path.is_dir():
-                self.output_buf.append(f"{prefix}{idc}[{sub_path}]")
+            if entry.is_dir:
+                self.output_buf.append(f"{prefix}{idc}[{entry.name}]")
                 tmp_prefix: str = (
                     (
                         f"{prefix}{self.icon.normal}"
                         f'{" " * (self.length - len(self.icon))}'
                     )
-                    if len(file_list) > 1 and i != len(file_list) - 1
+                    if len(entries) > 1 and i != len(entries) - 1
                     else f'{prefix}{" " * self.length}'
                 )
                 self.__recurse(
-                    full_path, list(full_path.iterdir()), tmp_prefix, level + 1
+                    prefetch[i].result() if i in prefetch else [],
+                    tmp_prefix,
+                    level + 1,
                 )
-            elif full_path.is_file():  # pragma: no cov
-                self.output_buf.append(f"{prefix}{idc}{sub_path}")
-                self.files.append(full_path)
+            elif entry.is_file:  # pragma: no cov
+                self.output_buf.append(f"{prefix}{idc}{entry.name}")
+                self.__extensions.setdefault(extension(entry.name), []).append(
+                    len(self.files)
+                )
+                self.files.append(Path(entry.path))
 
     def pick(self, filename: Union[str, Collection[str]]) -> list[Path]:
-        """Return filename with match with input argument."""
-        patterns = (filename,) if isinstance(filename, str) else filename
-        return list(
-            filter(
-                (
-                    lambda f: any(
-                        fnmatch.fnmatch(f, f"*/{pattern}")
-                        for pattern in patterns
-                    )
-                ),
-                self.files,
-            )
+        """Return filename with match with input argument. A pattern that only
+        match with the file extension, like ``*.yaml``, will look up from the
+        extension index of files instead of matching all files.
+        """
+        patterns: tuple[str, ...] = (
+            (filename,) if isinstance(filename, str) else tuple(filename)
         )
+        if "*" in patterns:
+            return list(self.files)
+
+        indexes: set[int] = set()
+        remains: list[str] = []
+        for pattern in patterns:
+            if (ext := extension_pattern(pattern)) is None:
+                remains.append(pattern)
+                continue
+            indexes.update(
+                i
+                for i in self.__extensions.get(extension(ext), [])
+                if self.files[i].name.endswith(ext)
+            )
+
+        if remains:
+            regex: re.Pattern[str] = compile_pick(tuple(remains))
+            indexes.update(
+                i
+                for i, f in enumerate(self.files)
+                if i not in indexes and regex.match(str(f))
+            )
+        return [self.files[i] for i in sorted(indexes)]
 
     def tree(self, newline: Optional[str] = None) -> str:  # pragma: no cov
         """Return path tree of root path."""
@@ -140,38 +322,222 @@ def read_ignore(file: Union[str, Path]) -> list[str]:
     return ignores
 
 
-def is_ignored(file: Path, ignores: list[str]) -> bool:
-    """Check if a path should be ignored based on patterns.
+def translate_ignore(pattern: str) -> str:
+    """Translate a glob pattern of the ignore file to the regular expression
+    string that match with a relative path that use ``/`` separator.
+
+    :param pattern: A glob pattern that already strip the negation and the
+        directory-only suffix.
+
+    :rtype: str
+
+    Examples:
+        >>> translate_ignore("build")
+        '(?:.*/)?build'
+        >>> translate_ignore("docs/*")
+        'docs/[^/]*'
+    """
+    anchored: bool = "/" in pattern
+    pattern: str = pattern.lstrip("/")
+    rs: str = ""
+    i, n = 0, len(pattern)
+    while i < n:
+        if pattern.startswith("**/", i):
+            rs += "(?:.*/)?"
+            i += 3
+        elif pattern.startswith("**", i):
+            rs += ".*"
+            i += 2
+        elif (c := pattern[i]) == "*":
+            rs += "[^/]*"
+            i += 1
+        elif c == "?":
+            rs += "[^/]"
+            i += 1
+        elif c == "[" and (j := pattern.find("]", i + 2)) != -1:
+            chars: str = pattern[i + 1 : j]
+            if chars.startswith("!"):
+                chars = f"^{chars[1:]}"
+            rs += f"[{chars.replace(chr(92), chr(92) * 2)}]"
+            i = j + 1
+        elif c == "\\" and i + 1 < n:
+            rs += re.escape(pattern[i + 1])
+            i += 2
+        else:
+            rs += re.escape(c)
+            i += 1
+    return rs if anchored else f"(?:.*/)?{rs}"
+
+
+class IgnoreMatcher:
+    """Ignore Matcher object that compile ignore patterns once with the
+    gitignore semantics;
+
+        *   A pattern that contain ``/`` at the start or middle is anchored to
+            the root path, otherwise, it matches at any level.
+        *   A pattern that end with ``/`` matches only directories.
+        *   A pattern that start with ``!`` re-includes a path that excluded by
+            a previous pattern.
+        *   A path is ignored if any of its parent directories was ignored.
+
+        If it does not have any negation pattern, all patterns will join to a
+    single regular expression.
+
+    :param patterns: A list of ignore patterns.
+    """
+
+    def __init__(self, patterns: Collection[str]) -> None:
+        self.rules: list[tuple[re.Pattern[str], bool, bool]] = []
+        for pattern in patterns:
+            if not (pattern := pattern.strip()) or pattern.startswith("#"):
+                continue
+
+            negate: bool = pattern.startswith("!")
+            if negate:
+                pattern = pattern[1:]
+            elif pattern.startswith(("\\!", "\\#")):
+                pattern = pattern[1:]
+
+            dir_only: bool = pattern.endswith("/")
+            if not (pattern := pattern.rstrip("/")):
+                continue
+            self.rules.append(
+                (re.compile(translate_ignore(pattern)), negate, dir_only)
+            )
+
+        self.has_negate: bool = any(negate for _, negate, _ in self.rules)
+        self.__any: Optional[re.Pattern[str]] = self.__join(self.rules)
+        self.__file: Optional[re.Pattern[str]] = self.__join(
+            [rule for rule in self.rules if not rule[2]]
+        )
+
+    @staticmethod
+    def __join(
+        rules: list[tuple[re.Pattern[str], bool, bool]],
+    ) -> Optional[re.Pattern[str]]:
+        if not rules:
+            return None
+        return re.compile("|".join(f"(?:{r.pattern})" for r, _, _ in rules))
+
+    @classmethod
+    def from_file(cls, file: Union[str, Path]) -> IgnoreMatcher:
+        """Construct the ignore matcher from an ignore file.
+
+        :param file: An ignore file path.
+        """
+        return cls(read_ignore(file))
+
+    def __bool__(self) -> bool:
+        return bool(self.rules)
+
+    def match_entry(self, path: str, is_dir: bool = False) -> bool:
+        """Return True if an entry path matches with this ignore patterns. This
+        method does not check parent directories of this path, so it should
+        use with walking that already pruned ignored directories.
+
+        :param path: A relative path that use ``/`` separator.
+        :param is_dir: A directory flag of this path.
+        :rtype: bool
+        """
+        if not self.has_negate:
+            regex = self.__any if is_dir else self.__file
+            return regex is not None and regex.fullmatch(path) is not None
+
+        ignored: bool = False
+        for regex, negate, dir_only in self.rules:
+            if (dir_only and not is_dir) or ignored != negate:
+                continue
+            if regex.fullmatch(path):
+                ignored = not negate
+        return ignored
+
+    def match(self, path: str, is_dir: bool = False) -> bool:
+        """Return True if a relative path or any of its parent directories
+        matches with this ignore patterns.
+
+        :param path: A relative path that use ``/`` separator.
+        :param is_dir: A directory flag of this path.
+        :rtype: bool
+        """
+        parts: list[str] = path.strip("/").split("/")
+        return any(
+            self.match_entry("/".join(parts[:i]), is_dir=(i < len(parts)))
+            for i in range(1, len(parts))
+        ) or self.match_entry("/".join(parts), is_dir=is_dir)
+
+    def walk(
+        self,
+        path: Union[str, Path],
+        *,
+        workers: Optional[int] = None,
+    ) -> Iterator[Path]:
+        """Yield files in a directory with sorted order that are not ignored.
+        The ignored directories will prune, so it does not visit any files in
+        those directories.
+
+        :param path: A root path that want to walk.
+        :param workers: A number of thread workers.
+        :rtype: Iterator[Path]
+        """
+        yield from (
+            Path(entry.path)
+            for _, entry in scan_tree(
+                path,
+                workers=workers,
+                prune=(self.match_entry if self else None),
+            )
+            if entry.is_file
+        )
+
+
+@lru_cache(maxsize=128)
+def compile_ignore(ignores: tuple[str, ...]) -> IgnoreMatcher:
+    """Return the cached ignore matcher object of ignore patterns.
+
+    :param ignores: A tuple of ignore patterns.
+    :rtype: IgnoreMatcher
+    """
+    return IgnoreMatcher(ignores)
+
+
+def is_ignored(
+    file: Path,
+    ignores: list[str],
+    *,
+    root: Optional[Path] = None,
+) -> bool:
+    """Check if a path should be ignored based on patterns with the gitignore
+    semantics. A path that does not exist as a file will be treated as it may be
+    a directory.
 
     :params file: (Path): a file path to check against ignore patterns
-    :params ignores:
+    :params ignores: A list of ignore patterns.
+    :params root: A root path that anchored patterns relate to. It will use the
+        path as it is if it does not pass.
 
     :returns: True if path should be ignored, False otherwise
     """
-    return any(
-        (
-            file.resolve().match(f"**/{p}/*")
-            or file.resolve().match(f"**/{p}*")
-            or fnmatch.fnmatch(str(file), f"**/{p}/**")
-            or fnmatch.fnmatch(str(file), f"*{p}*")
-        )
-        for pattern in ignores
-        if (p := pattern.rstrip("/"))
+    rel: Path = file.relative_to(root) if root is not None else file
+    return compile_ignore(tuple(ignores)).match(
+        rel.as_posix(), is_dir=not file.is_file()
     )
 
 
-def ls(path: Union[str, Path], ignore_file: Optional[str] = None) -> list[Path]:
-    """List files in a directory, applying ignore-style filtering.
+def ls(
+    path: Union[str, Path],
+    ignore_file: Optional[str] = None,
+    *,
+    workers: Optional[int] = None,
+) -> list[Path]:
+    """List files in a directory, applying ignore-style filtering. Ignored
+    directories will not walk into.
 
     :params base_dir: (str | Path) Base directory to search for files.
     :params ignore_file: (str) Name of the ignore file.
+    :params workers: (int) A number of thread workers that scan directories.
 
     :return: (list[Path]) Paths of file that are not ignored.
     """
     path: Path = Path(path).resolve()
     ignores: list[str] = read_ignore(path / ignore_file) if ignore_file else []
-    return [
-        file
-        for file in glob_files(path)
-        if not is_ignored(file, ignores=ignores)
-    ]
+    return list(IgnoreMatcher(ignores).walk(path, workers=workers))
@@ -14,11 +14,34 @@ This object can dynamic stage with your params config.
 """
 from __future__ import annotations
 
+import hashlib
+import json
 import logging
 import os
+import re
+from collections import Counter, defaultdict
+from collections.abc import Iterator
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, ClassVar, Optional, TypedDict
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    ClassVar,
+    Literal,
+    NamedTuple,
+    Optional,
+    TypedDict,
+    Union,
+)
 from zoneinfo import ZoneInfo
 
 from ddeutil.core import base, hash, merge, splitter
@@ -26,11 +49,8 @@ from ddeutil.core.dtutils import get_date
 
 try:
     from deepdiff import DeepDiff
-except ImportError as err:  # pragma: no cov
-    raise ImportError(
-        "Register module need `deepdiff` package, so, please install it by "
-        "`pip install deepdiff`"
-    ) from err
+except ImportError:  # pragma: no cov
+    DeepDiff = None
 
 try:
     from fmtutil import (
@@ -61,17 +81,31 @@ if TYPE_CHECKING:
     from typing_extensions import Self
 
 from .__type import AnyData, TupleStr
+from .catalog import BaseCatalog, CatalogKey, JsonCatalog, SqliteCatalog
 from .config import (
     DATE_FMT,
     DATE_LOG_FMT,
+    DELTA_KEY,
+    DIGEST_KEY,
     UPDATE_KEY,
     VERSION_KEY,
     Params,
     Rule,
 )
+from .dirs import TAR_COMPRESS, Dir
 from .exceptions import RegisterArgumentError, StoreNotFound
-from .stores import Store
-from .utils import rm
+from .files import JsonFl, JsonLineFl, compress_lib
+from .hooks import instrument
+from .snapshots import FrozenDict, freeze
+from .stores import BaseStore, Generations, SqliteStore, Store, StoreLog
+from .utils import (
+    json_diff,
+    json_patch,
+    lock_file,
+    move_files,
+    reverse_readline,
+    rm,
+)
 
 logger = logging.getLogger("ddeutil.io")
 
@@ -92,14 +126,180 @@ REGISTER_DIFF_LEVEL: dict[int, TupleStr] = {
 __all__: TupleStr = (
     "Register",
     "ArchiveRegister",
+    "DeployResult",
+    "MerkleNode",
+    "merkle",
+    "merkle_diff",
 )
 
 
+class DeployBatch(TypedDict):
+    """Deploy batch dict typing that keep the metadata writes and the moved
+    stages of a config name while it deploys with the ``deploy_many`` method.
+    """
+
+    metadata: dict[CatalogKey, dict[str, Any]]
+    moved: list[str]
+
+
+# NOTE: The current deploy batch of a worker. The metadata writes will keep on
+#   this batch instead of writing to the metadata file if it was set.
+deploy_batch: ContextVar[Optional[DeployBatch]] = ContextVar(
+    "deploy_batch", default=None
+)
+
+# NOTE: The active writer stores of the stage dirs on the current context. The
+#   nested writing of the same stage will reuse the new generation that was
+#   built by the outer writing instead of building another one.
+stage_writers: ContextVar[Optional[dict[Path, BaseStore]]] = ContextVar(
+    "stage_writers", default=None
+)
+
+
+class DeployResult(NamedTuple):
+    """Deploy Result object that keep the result of a config name that deploy
+    with the ``Register.deploy_many`` method.
+    """
+
+    name: str
+    status: Literal["moved", "unchanged", "failed"]
+    stages: TupleStr = ()
+    error: Optional[str] = None
+
+
+class MerkleNode(NamedTuple):
+    """Merkle Node object that keep the digest of a value and the nodes of its
+    children if this value is a dict or a list.
+    """
+
+    digest: str
+    children: Union[dict[Any, MerkleNode], list[MerkleNode], None] = None
+
+
+def merkle(value: Any) -> MerkleNode:
+    """Return the Merkle tree of a value. The digest of a list does not depend
+    on the order of its elements like the ``ignore_order`` flag of DeepDiff.
+
+    :param value: A value that want to generate the Merkle tree.
+    :rtype: MerkleNode
+    """
+    if isinstance(value, dict):
+        children: dict[Any, MerkleNode] = {
+            k: merkle(v) for k, v in value.items()
+        }
+        content: str = ",".join(
+            sorted(f"{k!r}:{node.digest}" for k, node in children.items())
+        )
+        return MerkleNode(_md5(f"d[{content}]"), children)
+    elif isinstance(value, (list, tuple)):
+        nodes: list[MerkleNode] = [merkle(v) for v in value]
+        content: str = ",".join(sorted(node.digest for node in nodes))
+        return MerkleNode(_md5(f"l[{content}]"), nodes)
+    return MerkleNode(_md5(f"{type(value).__name__}:{value!r}"))
+
+
+def _md5(value: str) -> str:
+    return hashlib.md5(value.encode("utf-8")).hexdigest()
+
+
+def merkle_diff(left: MerkleNode, right: MerkleNode) -> int:
+    """Return the difference level between two Merkle trees that walks only the
+    sub-trees that have different digests.
+
+        *   0: Does not have any change.
+        *   1: Some values or types were changed.
+        *   2: Some keys or elements were added or removed.
+
+        The level 1 has priority over the level 2 like the order of the
+    ``REGISTER_DIFF_LEVEL`` mapping.
+
+    :param left: A Merkle tree.
+    :param right: A Merkle tree.
+    :rtype: int
+    """
+    if left.digest == right.digest:
+        return 0
+    elif isinstance(left.children, dict) and isinstance(right.children, dict):
+        level: int = 2 if left.children.keys() != right.children.keys() else 0
+        for k in left.children.keys() & right.children.keys():
+            if (rs := merkle_diff(left.children[k], right.children[k])) == 1:
+                return 1
+            level = max(level, rs)
+        return level
+    elif isinstance(left.children, list) and isinstance(right.children, list):
+        counter: Counter[str] = Counter(node.digest for node in right.children)
+        unmatched_left: list[MerkleNode] = []
+        for node in left.children:
+            if counter[node.digest] > 0:
+                counter[node.digest] -= 1
+            else:
+                unmatched_left.append(node)
+        counter = Counter(node.digest for node in left.children)
+        unmatched_right: list[MerkleNode] = []
+        for node in right.children:
+            if counter[node.digest] > 0:
+                counter[node.digest] -= 1
+            else:
+                unmatched_right.append(node)
+
+        level: int = 2 if len(unmatched_left) != len(unmatched_right) else 0
+        for pair in zip(unmatched_left, unmatched_right):
+            if (rs := merkle_diff(*pair)) == 1:
+                return 1
+            level = max(level, rs)
+        return level
+    return 1
+
+
 class StageFl(TypedDict):
-    """Stage files dict typing for the mypy checker step."""
+    """Stage files dict typing for the mypy checker step. The timestamp and
+    version values were parsed from the stage filename, so they will be the
+    default values of the formatters if the stage format does not include them.
+    """
 
-    parse: FormatterGroup
     file: str
+    timestamp: datetime
+    version: VerPackage
+
+
+class ArchiveFl(TypedDict):
+    """Archived file dict typing for the mypy checker step. It keeps on the
+    index of the compacted archive segments.
+    """
+
+    name: str
+    stage: str
+    version: Optional[str]
+    updt: Optional[str]
+    archived: str
+    member: str
+    segment: Optional[str]
+    compress: Optional[str]
+
+
+ARCHIVE_FILE: re.Pattern[str] = re.compile(
+    r"^(?P<stage>.+?)_(?P<archived>\d{14})_(?P<file>.+)$"
+)
+
+
+def segment_ext(segment: Dir) -> str:
+    """Return the file extension of an archive segment from its compress type.
+
+    :param segment: A Dir object of an archive segment.
+    :rtype: str
+    """
+    if segment.compress == "zip":
+        return "zip"
+    return f"tar.{TAR_COMPRESS[segment.sub_compress]}"
+
+
+def stage_key(sf: StageFl) -> tuple[datetime, VerPackage]:
+    """Return the sorting key of a stage file.
+
+    :param sf: A stage file.
+    :rtype: tuple[datetime, VerPackage]
+    """
+    return sf["timestamp"], sf["version"]
 
 
 CompressConst: ConstantType = make_const(
@@ -125,6 +325,73 @@ FileExtensionConst: ConstantType = make_const(
 )
 
 
+@lru_cache(maxsize=1024)
+def make_fmt_type(name: str, domain: str) -> FormatterGroupType:
+    """Return the cached formatter group that include constant formatters from
+    a config name and domain. It was cached with bounded size, so it does not
+    create new formatter classes for every access of the same config name.
+
+    :param name: A config name.
+    :param domain: A config domain.
+    :rtype: FormatterGroupType
+    """
+    return make_group(
+        {
+            "naming": make_const(fmt=Naming, value=name),
+            "domain": make_const(fmt=Naming, value=domain),
+            "compress": CompressConst,
+            "extension": FileExtensionConst,
+            "version": Version,
+            "timestamp": Datetime,
+        }
+    )
+
+
+@lru_cache(maxsize=1024)
+def compile_stage_format(
+    fmt_type: FormatterGroupType,
+    fmt: str,
+) -> tuple[re.Pattern[str], TupleStr]:
+    """Return the cached compiled regular expression of a stage file format and
+    the group names of its formatters.
+
+    :param fmt_type: A formatter group class.
+    :param fmt: A stage file format string.
+    :rtype: tuple[re.Pattern[str], TupleStr]
+    """
+    _fmt, _fmt_getter = fmt_type.gen_format(fmt=fmt)
+    return re.compile(rf"^{_fmt}$"), tuple(_fmt_getter)
+
+
+def parse_stage_format(
+    fmt_type: FormatterGroupType,
+    value: str,
+    fmt: str,
+) -> Optional[FormatterGroup]:
+    """Parse a stage filename with the compiled stage format. This is the same
+    as the ``parse`` method of the formatter group, but it does not generate the
+    regular expression for every parsing.
+
+    :param fmt_type: A formatter group class.
+    :param value: A stage filename.
+    :param fmt: A stage file format string.
+    :rtype: FormatterGroup | None
+    """
+    pattern, names = compile_stage_format(fmt_type, fmt)
+    if not (search := pattern.match(value)):
+        return None
+
+    groups: dict[str, str] = search.groupdict()
+    rs: dict[str, dict[str, str]] = defaultdict(dict)
+    for name in names:
+        rs[name.split("__")[0]] |= {
+            k.replace(f"{name}___", "", 1): v
+            for k, v in groups.items()
+            if k.startswith(f"{name}___")
+        }
+    return fmt_type(formats=rs)
+
+
 class BaseRegister:
     """Base Register object that is not implement any features without base
     properties.
@@ -134,6 +401,7 @@ class BaseRegister:
     """
 
     metadata: ClassVar[str] = "__METADATA"
+    manifest: ClassVar[str] = "manifest.jsonl"
 
     def __init__(self, name: str, *, domain: Optional[str] = None) -> None:
         self.name: str = name
@@ -174,16 +442,7 @@ class BaseRegister:
 
         :rtype: FormatterGroupType
         """
-        return make_group(
-            {
-                "naming": make_const(fmt=Naming, value=self.name),
-                "domain": make_const(fmt=Naming, value=self.domain),
-                "compress": CompressConst,
-                "extension": FileExtensionConst,
-                "version": Version,
-                "timestamp": Datetime,
-            }
-        )
+        return make_fmt_type(self.name, self.domain)
 
 
 class Register(BaseRegister):
@@ -195,9 +454,16 @@ class Register(BaseRegister):
         before passing to parent base register object with ``:``.
     :param stage: A stage name that want to get data with an input name.
     :param params:
-    :param store:
+    :param store: A store class of the stage areas, default the Store class
+        that keeps one Json file per stage file.
+    :param lazy: A lazy flag that does not load the context data and metadata
+        on the initialize step. They will load and compare on the first access
+        and memoize on this instance.
     """
 
+    compare_deep: ClassVar[bool] = False
+    catalog: ClassVar[type[BaseCatalog]] = JsonCatalog
+
     @classmethod
     def reset(
         cls,
@@ -219,28 +485,61 @@ class Register(BaseRegister):
         :return: itself object that passing the fullname to initialize step.
         """
         domain, n = cls.split_domain(name)
+        catalog: BaseCatalog = cls.get_catalog(params)
         for stage in params.stages:
-            try:
-                # NOTE: Start reset (remove) on the target stage area.
-                cls(name, stage=stage, params=params).remove()
-
-                # NOTE: Remove the metadata file on this stage.
-                meta_file: Path = (
-                    params.paths.data
-                    / cls.metadata
-                    / f"{domain or ''}{n}.{stage}.json"
-                )
-                rm(meta_file)
-            except StoreNotFound:
-                continue
+            # NOTE: Start reset (remove) on the target stage area. It uses the
+            #   lazy mode because it does not need to load any data.
+            cls(name, stage=stage, params=params, lazy=True).remove()
+
+            # NOTE: Remove the metadata on this stage.
+            catalog.delete(domain or "", n, stage)
+
+            # NOTE: Remove the stage manifest file on this stage.
+            rm(
+                params.paths.data
+                / cls.metadata
+                / f"{domain or ''}{n}.{stage}.{cls.manifest}",
+                force_raise=False,
+            )
 
-        # NOTE: Remove the metadata file on the base stage.
-        meta_file: Path = (
-            params.paths.data / cls.metadata / f"{domain or ''}{n}.base.json"
-        )
-        rm(meta_file, force_raise=False)
+        # NOTE: Remove the metadata on the base stage.
+        catalog.delete(domain or "", n, REGISTER_BASE_STAGE_DEFAULT)
         return cls(name, params=params)
 
+    @classmethod
+    def get_catalog(cls, params: Params) -> BaseCatalog:
+        """Return the metadata catalog object of the ``catalog`` class variable
+        that keeps on the metadata dir.
+
+        :param params: A params object.
+        :rtype: BaseCatalog
+        """
+        return cls.catalog(params.paths.data / cls.metadata)
+
+    @classmethod
+    def migrate_catalog(cls, params: Params) -> int:
+        """Migrate all metadata from the Json files on the metadata dir to the
+        catalog of the ``catalog`` class variable. It uses the dir names of the
+        conf path as domains to split the domain and name from filenames.
+
+        :param params: A params object.
+        :rtype: int
+        :returns: A number of migrated metadata.
+        """
+        catalog: BaseCatalog = cls.get_catalog(params)
+        if not isinstance(catalog, SqliteCatalog):
+            raise RegisterArgumentError(
+                "The metadata catalog migration support only the SqliteCatalog."
+            )
+        domains: list[str] = (
+            [p.name for p in params.paths.conf.iterdir() if p.is_dir()]
+            if params.paths.conf.exists()
+            else []
+        )
+        return catalog.migrate(
+            JsonCatalog(params.paths.data / cls.metadata), domains=domains
+        )
+
     @classmethod
     def split_domain(cls, name: str) -> tuple[str, str]:
         rs: list[str] = splitter.must_rsplit(
@@ -256,7 +555,8 @@ class Register(BaseRegister):
         stage: Optional[str] = None,
         *,
         params: Optional[Params] = None,
-        store: Optional[type[Store]] = None,
+        store: Optional[type[BaseStore]] = None,
+        lazy: bool = False,
     ) -> None:
         domain, name = self.split_domain(name)
         super().__init__(name=name, domain=domain)
@@ -267,22 +567,62 @@ class Register(BaseRegister):
             )
         self.params: Optional[Params] = params
         self.stage: str = stage or REGISTER_BASE_STAGE_DEFAULT
-        self.store: Optional[type[Store]] = store
-
-        # NOTE: Load latest version of data from data lake or data store of
-        #   configuration files.
-        self.__raw_data: AnyData = self.get(stage=self.stage)
-        if not self.__raw_data:
-            raise StoreNotFound(
-                f"Register name {self.name!r} "
-                f"{f'in domain {self.domain!r} ' if self.domain else ' '}"
-                f"does not find data in stage: {self.stage!r}."
-            )
+        self.store: Optional[type[BaseStore]] = store
+        self.lazy: bool = lazy
 
         # NOTE: Running metadata tracking cache.
-        self.meta: dict[str, Any] = {}
-        self.__manage_metadata()
+        self.__raw_data: Optional[AnyData] = None
+        self.__meta: Optional[dict[str, Any]] = None
+        self.__changed: Optional[int] = None
+        self.__merkle: Optional[MerkleNode] = None
+        if not lazy:
+            self.__manage_metadata()
+
+    @instrument(
+        "Register.load",
+        path=lambda self: self.fullname,
+        hit=lambda self: self._Register__raw_data is not None,
+    )
+    def __load_data(self) -> AnyData:
+        """Load latest version of data from data lake or data store of
+        configuration files. It will load only once per instance.
+
+        :raise StoreNotFound: If the data does not exist in the current stage.
 
+        :rtype: AnyData
+        """
+        if self.__raw_data is None:
+            if not (raw_data := self.get(stage=self.stage)):
+                raise StoreNotFound(
+                    f"Register name {self.name!r} "
+                    f"{f'in domain {self.domain!r} ' if self.domain else ' '}"
+                    f"does not find data in stage: {self.stage!r}."
+                )
+            self.__raw_data = raw_data
+        return self.__raw_data
+
+    @property
+    def meta(self) -> dict[str, Any]:
+        """Return the metadata of this config name on the current stage.
+
+        :rtype: dict[str, Any]
+        """
+        if self.__meta is None:
+            self.__manage_metadata()
+        return self.__meta
+
+    @property
+    def changed(self) -> int:
+        """Return the changed level between the current stage data and its
+        metadata.
+
+        :rtype: int
+        """
+        if self.__changed is None:
+            self.__manage_metadata()
+        return self.__changed
+
+    @instrument("Register.metadata", path=lambda self: self.fullname)
     def __manage_metadata(self):
         """Manage the latest context data for detect change by metadata
         strategy.
@@ -290,14 +630,17 @@ class Register(BaseRegister):
             The metadata file also keeps on ./data/<self.metadata> dir for all
         config context data.
         """
-        store: Store = Store(path=self.params.paths.data / self.metadata)
-        meta_file: Path = (
-            store.path / f"{self.domain or ''}{self.name}.{self.stage}.json"
-        )
-        self.meta: dict[str, Any] = store.load(path=meta_file, default={})
+        self.__load_data()
+        catalog: BaseCatalog = self.get_catalog(self.params)
+        key: CatalogKey = (self.domain or "", self.name, self.stage)
+        batch: Optional[DeployBatch] = deploy_batch.get()
+        if batch is not None and key in batch["metadata"]:
+            self.__meta = batch["metadata"][key]
+        else:
+            self.__meta = catalog.load(*key)
 
         # NOTE: Compare data from current stage and latest version in metadata.
-        self.changed: int = self.compare_data(self.meta)
+        self.__changed = self.compare_data(self.__meta)
 
         # NOTE: Update metadata if the configuration data does not exist, or it
         #   has any changes.
@@ -311,7 +654,13 @@ class Register(BaseRegister):
                     f"Should update metadata because diff level is "
                     f"{self.changed}."
                 )
-            store.save(path=meta_file, data=self.data(hashing=True))
+            meta: dict[str, Any] = self.data(hashing=True) | {
+                DIGEST_KEY: self.digest
+            }
+            if batch is not None:
+                batch["metadata"][key] = meta
+            else:
+                catalog.save(*key, data=meta)
 
     def __str__(self) -> str:
         return f"({self.fullname}, {self.stage})"
@@ -339,7 +688,7 @@ class Register(BaseRegister):
         :type hashing: bool (Default=False)
         :rtype: dict[str, Any]
         """
-        _data: dict[str, Any] = self.__raw_data.copy()
+        _data: dict[str, Any] = self.__load_data().copy()
         if not self.stage or (self.stage == REGISTER_BASE_STAGE_DEFAULT):
             _data: dict[str, Any] = {
                 k: self.meta[k]
@@ -353,6 +702,15 @@ class Register(BaseRegister):
             else _data
         )
 
+    def snapshot(self) -> FrozenDict:
+        """Return the deeply immutable snapshot of the context data. It does not
+        share any nested mutable object with this register like the ``data``
+        method, so it can share between threads without any copy.
+
+        :rtype: FrozenDict
+        """
+        return freeze(self.data())
+
     @property
     def timestamp(self) -> datetime:
         """Return the current timestamp value of config data. If timestamp value
@@ -403,9 +761,40 @@ class Register(BaseRegister):
             }
         )
 
+    @staticmethod
+    def merkle(data: dict[str, Any]) -> MerkleNode:
+        """Return the Merkle tree of hashed data that exclude the update,
+        version, and digest keys.
+
+        :param data: A hashed data.
+        :rtype: MerkleNode
+        """
+        return merkle(
+            {
+                k: v
+                for k, v in data.items()
+                if k not in (UPDATE_KEY, VERSION_KEY, DIGEST_KEY)
+            }
+        )
+
+    @property
+    def digest(self) -> str:
+        """Return the Merkle digest of the hashed context data. It will compute
+        only once per instance.
+
+        :rtype: str
+        """
+        if self.__merkle is None:
+            self.__merkle = self.merkle(self.data(hashing=True))
+        return self.__merkle.digest
+
+    @instrument("Register.compare_data", path=lambda self: self.fullname)
     def compare_data(self, data: dict[str, Any]) -> int:
-        """Return difference column from dictionary comparison method which use
-        the `deepdiff` library.
+        """Return difference level from dictionary comparison method. It
+        compares the Merkle digest of the current hashed data with the digest
+        key in an input data first, and walk only the different sub-trees if
+        they do not equal. If the ``compare_deep`` class variable was set, it
+        will use the `deepdiff` library instead.
 
         :param data: dict : The data dictionary for compare with current
             configuration data.
@@ -414,12 +803,34 @@ class Register(BaseRegister):
         """
         if not data:
             return 99
+        elif data.get(DIGEST_KEY) == self.digest:
+            return 0
+        elif self.compare_deep:
+            return self.__compare_deep(data)
+        return merkle_diff(self.__merkle, self.merkle(data))
+
+    def __compare_deep(self, data: dict[str, Any]) -> int:
+        """Return difference level from dictionary comparison method which use
+        the `deepdiff` library.
+
+        :param data: dict : The data dictionary for compare with current
+            configuration data.
+
+        :rtype: Literal[0, 1, 2]
+        """
+        if DeepDiff is None:  # pragma: no cov
+            raise ImportError(
+                "Deep comparison need `deepdiff` package, so, please install "
+                "it by `pip install deepdiff`"
+            )
 
         rs: DeepDiff = DeepDiff(
             self.data(hashing=True),
             data,
             ignore_order=True,
-            exclude_paths=[f"root[{k!r}]" for k in (UPDATE_KEY, VERSION_KEY)],
+            exclude_paths=[
+                f"root[{k!r}]" for k in (UPDATE_KEY, VERSION_KEY, DIGEST_KEY)
+            ],
         )
         if not rs:
             return 0
@@ -430,31 +841,257 @@ class Register(BaseRegister):
             f"Compare change do not implement for deepdiff result: {rs}"
         )
 
+    def _parse_stage_file(self, stage: str, file: str) -> Optional[StageFl]:
+        """Return the StageFl data that parse from a stage filename, or None if
+        it does not match with the stage format.
+
+        :param stage: A stage value of this file.
+        :param file: A stage filename.
+
+        :rtype: StageFl | None
+        """
+        try:
+            parse: Optional[FormatterGroup] = parse_stage_format(
+                self.fmt_type,
+                value=file,
+                fmt=rf"{self.params.get_stage(stage).format}\.json",
+            )
+        except FormatterArgumentError:
+            return None
+
+        if parse is None:
+            return None
+        return {
+            "file": file,
+            "timestamp": parse.groups["timestamp"].value,
+            "version": parse.groups["version"].value,
+        }
+
+    def _manifest_path(self, stage: str) -> Path:
+        """Return the stage manifest file path of this config name that keep on
+        the metadata dir.
+
+        :param stage: A stage value.
+        :rtype: Path
+        """
+        return (
+            self.params.paths.data
+            / self.metadata
+            / f"{self.domain or ''}{self.name}.{stage}.{self.manifest}"
+        )
+
+    def _write_manifest(self, stage: str, sfs: list[StageFl]) -> None:
+        """Rewrite the stage manifest file with a list of stage files.
+
+        :param stage: A stage value.
+        :param sfs: A list of stage files.
+        """
+        path: Path = self._manifest_path(stage)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if not sfs:
+            path.write_text("")
+            return
+        JsonLineFl(path).write([self.__manifest_record(sf) for sf in sfs])
+
+    def __manifest_record(self, sf: StageFl) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "domain": self.domain,
+            "file": sf["file"],
+            "timestamp": f"{sf['timestamp']:{DATE_FMT}}",
+            "version": str(sf["version"]),
+        }
+
+    @staticmethod
+    def __manifest_stage_file(record: dict[str, Any]) -> StageFl:
+        return {
+            "file": record["file"],
+            "timestamp": datetime.strptime(record["timestamp"], DATE_FMT),
+            "version": VerPackage.parse(record["version"]),
+        }
+
+    def __read_manifest(self, path: Path) -> list[StageFl]:
+        """Return the sorted list of stage files from a stage manifest file.
+
+        :param path: A stage manifest path.
+        :rtype: list[StageFl]
+        """
+        # NOTE: The latest record of the same file will override the previous.
+        sfs: dict[str, StageFl] = {
+            record["file"]: self.__manifest_stage_file(record)
+            for record in (
+                JsonLineFl(path).read() if path.stat().st_size else []
+            )
+        }
+        return sorted(sfs.values(), key=stage_key)
+
+    def __last_manifest(self, path: Path) -> Optional[StageFl]:
+        """Return the stage file of the last record of a stage manifest file
+        without reading the other records.
+
+        :param path: A stage manifest path.
+        :rtype: Optional[StageFl]
+        """
+        with open(path, encoding="utf-8") as f:
+            line: Optional[str] = next(
+                (x for x in reverse_readline(f) if x.strip()), None
+            )
+        return (
+            None
+            if line is None
+            else self.__manifest_stage_file(json.loads(line))
+        )
+
+    def _stage_pattern(self, stage: str) -> str:
+        """Return the glob pattern of the stage filenames of this config name
+        that formats the naming and domain formatters of the stage format, and
+        replaces the other formatters with the wildcard.
+
+        :param stage: A stage value.
+        :rtype: str
+        """
+        group: FormatterGroup = self.fmt_type({})
+        return re.sub(
+            r"{(\w+)(?::[^{}]*)?}",
+            lambda m: (
+                group.format(m.group(0))
+                if m.group(1) in ("naming", "domain")
+                else "*"
+            ),
+            f"{self.params.get_stage(stage).format}.json",
+        )
+
+    def _manifest_fresh(self, stage: str, store: BaseStore) -> bool:
+        """Return True if the stage manifest file exists and it keeps the
+        latest stage file of this config name. It checks only the stage files
+        of this config name if the stage directory of the file store was
+        changed after writing this manifest, so the stage files of the other
+        config names do not rebuild it, and the stage files of this name that
+        was added by the other process will rebuild it.
+
+        :param stage: A stage value.
+        :param store: A store object of this stage area.
+        :rtype: bool
+        """
+        path: Path = self._manifest_path(stage)
+        try:
+            mtime: int = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return False
+        if (
+            not isinstance(store, Store)
+            or store.path.stat().st_mtime_ns < mtime
+        ):
+            return True
+
+        # NOTE: The stage directory can change within the same mtime tick of
+        #   this manifest, so it checks the equal mtime too.
+        last: Optional[StageFl] = self.__last_manifest(path)
+        if last is not None and not (store.path / last["file"]).exists():
+            return False
+        return not any(
+            (sf := self._parse_stage_file(stage, file.name))
+            and (last is None or stage_key(sf) > stage_key(last))
+            for file in store.path.glob(self._stage_pattern(stage))
+        )
+
+    def _append_manifest(self, stage: str, sf: StageFl) -> None:
+        """Append a stage file record to the stage manifest file. It will not
+        create the manifest if it does not exist, because the next reading will
+        rebuild it from the stage directory.
+
+            The last record of this manifest is always the latest stage file,
+        so it rewrites the sorted manifest if this stage file is older than the
+        last record.
+
+        :param stage: A stage value.
+        :param sf: A stage file.
+        """
+        if not (path := self._manifest_path(stage)).exists():
+            return
+        if (last := self.__last_manifest(path)) is None or (
+            stage_key(last) <= stage_key(sf)
+        ):
+            JsonLineFl(path).write(self.__manifest_record(sf), mode="a")
+            return
+        self._write_manifest(
+            stage,
+            sorted(
+                {
+                    **{x["file"]: x for x in self.__read_manifest(path)},
+                    sf["file"]: sf,
+                }.values(),
+                key=stage_key,
+            ),
+        )
+
     def _stage_files(
         self,
         stage: str,
-        store: Store,
-    ) -> dict[int, StageFl]:
-        """Return the mapping of StageFl data from target stage area.
+        store: BaseStore,
+        *,
+        rebuild: bool = False,
+    ) -> list[StageFl]:
+        """Return the sorted list of StageFl data from target stage area. It
+        reads from the stage manifest file of this config name, and it will
+        rebuild this manifest by listing and parsing all filenames in the stage
+        directory if it does not exist, it is older than the stage directory,
+        or the rebuild flag was set.
 
         :param stage: A stage value that want to search files.
         :param store: A store object that passing path with stage path.
+        :param rebuild: A rebuild flag.
 
-        :rtype: dict[int, StageFl]
+        :rtype: list[StageFl]
         """
-        rs: dict[int, StageFl] = {}
-        for index, file in enumerate((_f.name for _f in store.ls()), start=1):
-            try:
-                rs[index]: StageFl = {
-                    "parse": self.fmt_type.parse(
-                        value=file,
-                        fmt=rf"{self.params.get_stage(stage).format}\.json",
-                    ),
-                    "file": file,
-                }
-            except FormatterArgumentError:
-                continue
-        return rs
+        # NOTE: The generation dir is immutable, so it lists the dir directly
+        #   instead of keeping the manifest that would be stale after flipping.
+        generations: bool = self._generations(stage) is not None
+        if generations or rebuild or not self._manifest_fresh(stage, store):
+            rs: list[StageFl] = sorted(
+                (
+                    sf
+                    for file in store.ls()
+                    if (sf := self._parse_stage_file(stage, file.name))
+                ),
+                key=stage_key,
+            )
+            if not generations:
+                self._write_manifest(stage, rs)
+            return rs
+        return self.__read_manifest(self._manifest_path(stage))
+
+    def _latest_stage_file(
+        self, stage: str, store: BaseStore
+    ) -> Optional[StageFl]:
+        """Return the latest stage file from the last record of the stage
+        manifest file, or None if this manifest can not use.
+
+        :param stage: A stage value.
+        :param store: A store object of this stage area.
+        :rtype: Optional[StageFl]
+        """
+        if self._generations(stage) is not None or not self._manifest_fresh(
+            stage, store
+        ):
+            return None
+        return self.__last_manifest(self._manifest_path(stage))
+
+    def _drop_stage_files(self, stage: str, files: set[str]) -> None:
+        """Remove stage files from the stage manifest file.
+
+        :param stage: A stage value.
+        :param files: A set of stage filenames that was removed.
+        """
+        if files and self._manifest_path(stage).exists():
+            self._write_manifest(
+                stage,
+                [
+                    sf
+                    for sf in self._stage_files(stage, self._stage_store(stage))
+                    if sf["file"] not in files
+                ],
+            )
 
     def get(
         self,
@@ -464,7 +1101,9 @@ class Register(BaseRegister):
         reverse: bool = False,
     ) -> AnyData:
         """Get the context data from the specific stage value (use 'base' if the
-        stage do not pass on this method).
+        stage do not pass on this method). The stage file will find from the
+        stage manifest, and the manifest will rebuild if this file does not
+        exist in the stage directory.
 
         :param stage: A stage value that want to get context data.
         :param order:
@@ -477,20 +1116,175 @@ class Register(BaseRegister):
                 name=self.name, order=order
             )
 
-        store: Store = Store(
-            path=self.params.paths.data / stage,
+        return self.__get_stage(
+            stage, self._stage_store(stage), order=order, reverse=reverse
+        )[0]
+
+    def _generations(self, stage: str) -> Optional[Generations]:
+        """Return the Generations object of a stage area if the rule of this
+        stage sets the generations value. It supports only the file store,
+        because the other stores keep all data in one file. It does not
+        support the StoreLog too, because it appends the log file in place and
+        this file was hard-linked to the older generations.
+
+        :param stage: A stage value.
+        :rtype: Optional[Generations]
+        """
+        store: type[BaseStore] = self.store or Store
+        if (
+            self.params.get_stage(stage).rule.generations
+            and issubclass(store, Store)
+            and not issubclass(store, StoreLog)
+        ):
+            return Generations(self.params.paths.data / stage)
+        return None
+
+    def _stage_store(self, stage: str) -> BaseStore:
+        """Return the store object of a stage area that use the compress rule of
+        this stage. It uses the store class that passing to this register or
+        the Store class by default. If this stage keeps the generations, the
+        store path will be the current generation dir, or the new generation
+        dir of the active writer.
+
+        :param stage: A stage value.
+        :rtype: BaseStore
+        """
+        path: Path = self.params.paths.data / stage
+        if (writers := stage_writers.get()) and path in writers:
+            return writers[path]
+        if (gens := self._generations(stage)) is not None:
+            path: Path = gens.current()
+        return (self.store or Store)(
+            path=path,
             compress=self.params.get_stage(stage).rule.compress,
         )
 
-        if rs := self._stage_files(stage, store):
-            max_data: list = sorted(
-                rs.items(),
-                key=lambda x: (x[1]["parse"],),
-                reverse=reverse,
+    @contextmanager
+    def _stage_writer(self, stage: str) -> Iterator[BaseStore]:
+        """Return the store object of a stage area for writing. If this stage
+        keeps the generations, it locks the stage dir, builds the new
+        generation that hard links all files of the current generation, and
+        flips the current pointer to it only if all writes were successful.
+        After flipping, it removes the old generations that over the rule.
+
+        :param stage: A stage value.
+        :rtype: Iterator[BaseStore]
+        """
+        path: Path = self.params.paths.data / stage
+        writers: dict[Path, BaseStore] = stage_writers.get() or {}
+        if (gens := self._generations(stage)) is None or path in writers:
+            yield self._stage_store(stage)
+            return
+
+        path.mkdir(parents=True, exist_ok=True)
+        with lock_file(path):
+            gen: Path = gens.build()
+            store: BaseStore = (self.store or Store)(
+                path=gen, compress=self.params.get_stage(stage).rule.compress
             )
-            return store.load(path=(store.path / max_data[-order][1]["file"]))
-        return {}
+            token = stage_writers.set(writers | {path: store})
+            try:
+                yield store
+            except BaseException:
+                rm(gen, is_dir=True)
+                raise
+            finally:
+                stage_writers.reset(token)
+            gens.flip(gen)
+            gens.gc(keep=self.params.get_stage(stage).rule.generations)
+
+    def __get_stage(
+        self,
+        stage: str,
+        store: BaseStore,
+        *,
+        order: int = 1,
+        reverse: bool = False,
+        sfs: Optional[list[StageFl]] = None,
+    ) -> tuple[AnyData, list[str]]:
+        """Return the context data from the stage area with an optional stage
+        files that was listed before, and the delta chain of its stage file.
+
+        :param stage: A stage value.
+        :param store: A Store object of this stage area.
+        :param order:
+        :param reverse: A reverse flag that use to get stage file.
+        :param sfs: A list of stage files that was listed before.
+
+        :rtype: tuple[AnyData, list[str]]
+        """
+        # NOTE: The latest stage file is the last record of the manifest, so it
+        #   does not read and sort all records.
+        if (
+            sfs is None
+            and order == 1
+            and not reverse
+            and (latest := self._latest_stage_file(stage, store))
+            and store.exists(latest["file"])
+        ):
+            return self._load_stage_file(store, latest["file"])
+
+        for rebuild in (False, True):
+            if rebuild or sfs is None:
+                sfs = self._stage_files(stage, store, rebuild=rebuild)
+
+            if not sfs:
+                return {}, []
+
+            sf: StageFl = sorted(sfs, key=stage_key, reverse=reverse)[-order]
+            if store.exists(sf["file"]):
+                return self._load_stage_file(store, sf["file"])
+
+            logger.debug(f"Stage manifest of {stage!r} is stale, rebuild it.")
+        return {}, []  # pragma: no cov
+
+    def _delta_chain(
+        self, store: BaseStore, file: str
+    ) -> list[tuple[str, Any]]:
+        """Return the chain of stage filenames and their raw data from a stage
+        file back to its full snapshot.
 
+        :param store: A Store object of the stage area.
+        :param file: A stage filename.
+
+        :raise StoreNotFound: If a parent file of a delta stage file does not
+            exist.
+
+        :rtype: list[tuple[str, Any]]
+        """
+        chain: list[tuple[str, Any]] = [
+            (file, store.load(path=store.path / file))
+        ]
+        while isinstance(raw := chain[-1][1], dict) and DELTA_KEY in raw:
+            parent: str = raw[DELTA_KEY]["parent"]
+            if not (data := store.load(path=store.path / parent)) or any(
+                parent == f for f, _ in chain
+            ):
+                raise StoreNotFound(
+                    f"Parent file {parent!r} of delta stage file "
+                    f"{chain[-1][0]!r} does not exist."
+                )
+            chain.append((parent, data))
+        return chain
+
+    def _load_stage_file(
+        self, store: BaseStore, file: str
+    ) -> tuple[AnyData, list[str]]:
+        """Return the context data of a stage file that apply all deltas from
+        its full snapshot, and its chain of stage filenames.
+
+        :param store: A Store object of the stage area.
+        :param file: A stage filename.
+
+        :rtype: tuple[AnyData, list[str]]
+        """
+        chain: list[tuple[str, Any]] = self._delta_chain(store, file)
+        data: AnyData = chain[-1][1]
+        for _, raw in reversed(chain[:-1]):
+            data = json_patch(data, raw[DELTA_KEY]["ops"])
+        return data, [f for f, _ in chain]
+
+    @instrument("Register.move", path=lambda self: self.fullname)
     def move(
         self,
         stage: str,
@@ -506,15 +1300,36 @@ class Register(BaseRegister):
 
         :rtype: Self
         """
-        store: Store = Store(
-            path=self.params.paths.data / stage,
-            compress=self.params.get_stage(stage).rule.compress,
-        )
+        return self.__move(stage, force=force, retention=retention)
+
+    def __move(
+        self,
+        stage: str,
+        *,
+        force: bool = False,
+        retention: bool = True,
+        sfs: Optional[list[StageFl]] = None,
+    ) -> Self:
+        """Move the config data file to the target stage and return the Register
+        object of this stage that carry the context data in memory, so it does
+        not read the file that was written again.
+
+        :param stage: A stage value that want to move to.
+        :param force: A force moving flag.
+        :param retention: A retention flag.
+        :param sfs: A list of stage files of the target stage that was listed
+            before.
+
+        :rtype: Self
+        """
+        store: BaseStore = self._stage_store(stage)
+        if sfs is None:
+            sfs: list[StageFl] = self._stage_files(stage, store)
+
+        current, chain = self.__get_stage(stage, store, sfs=sfs)
         if (
             self.compare_data(
-                hash.hash_value(
-                    self.get(stage=stage), exclude=(UPDATE_KEY, VERSION_KEY)
-                )
+                hash.hash_value(current, exclude=(UPDATE_KEY, VERSION_KEY))
             )
             > 0
             or force
@@ -522,37 +1337,150 @@ class Register(BaseRegister):
             _filename: str = self.fmt().format(
                 f"{self.params.get_stage(name=stage).format}.json",
             )
-            if (store.path / _filename).exists():
+            if store.exists(_filename):
                 logger.warning(
                     f"File {_filename!r} already exists in {stage!r} stage."
                 )
-            store.save(
-                path=(store.path / _filename),
-                data=merge.merge_dict(
-                    self.data(),
-                    {
-                        UPDATE_KEY: f"{self.timestamp:{DATE_FMT}}",
-                        VERSION_KEY: f"v{str(self.version())}",
-                    },
-                ),
+            data: dict[str, Any] = merge.merge_dict(
+                self.data(),
+                {
+                    UPDATE_KEY: f"{self.timestamp:{DATE_FMT}}",
+                    VERSION_KEY: f"v{str(self.version())}",
+                },
             )
-            # NOTE: Retention process after move data to the stage successful
-            if retention:
-                self.purge(stage=stage)
-        else:
-            logger.warning(
-                f"Config {self.name!r} cannot move {self.stage!r} -> "
-                f"{stage!r} cause the data does not has any change or "
-                f"force moving flag does not set."
-            )
-        return self.switch(stage=stage)
+            with self._stage_writer(stage) as store:
+                store.save(
+                    path=(store.path / _filename),
+                    data=self.__delta(
+                        stage, store, _filename, data, current, chain
+                    ),
+                )
+                if (batch := deploy_batch.get()) is not None:
+                    batch["moved"].append(stage)
+                if sf := self._parse_stage_file(stage, _filename):
+                    self._append_manifest(stage, sf)
+
+                # NOTE: Retention process after move data to the stage
+                #   successful.
+                if retention:
+                    self.purge(stage=stage)
+
+            # NOTE: Carry the data only if the written file be the latest file
+            #   of this stage, that is the same file that the get method will
+            #   return.
+            if sf and all(stage_key(x) <= stage_key(sf) for x in sfs):
+                return self.__switch(stage, data=data, node=self.__merkle)
+            return self.switch(stage=stage)
+
+        logger.warning(
+            f"Config {self.name!r} cannot move {self.stage!r} -> "
+            f"{stage!r} cause the data does not has any change or "
+            f"force moving flag does not set."
+        )
+        return self.__switch(stage, data=current)
+
+    def __delta(
+        self,
+        stage: str,
+        store: BaseStore,
+        filename: str,
+        data: dict[str, Any],
+        current: AnyData,
+        chain: list[str],
+    ) -> dict[str, Any]:
+        """Return the content of a new stage file. It will be the JSON-patch
+        delta from the latest stage file if the delta rule of this stage was
+        set, and the delta chain of the latest file does not reach this rule.
+        Otherwise, it will be the full snapshot of data.
+
+        :param stage: A stage value.
+        :param store: A Store object of this stage area.
+        :param filename: A new stage filename.
+        :param data: A full data of the new stage file.
+        :param current: A full data of the latest stage file.
+        :param chain: A delta chain of the latest stage file.
+
+        :rtype: dict[str, Any]
+        """
+        if (
+            not chain
+            or len(chain) >= self.params.get_stage(stage).rule.delta
+            or filename in chain
+            or store.exists(filename)
+        ):
+            return data
+        return {
+            k: data[k] for k in ("alias", UPDATE_KEY, VERSION_KEY) if k in data
+        } | {
+            DELTA_KEY: {
+                "parent": chain[0],
+                "depth": len(chain),
+                "ops": json_diff(current, data),
+            }
+        }
+
+    def _retain(
+        self, stage: str, store: BaseStore, kept: list[StageFl]
+    ) -> set[str]:
+        """Return a set of stage filenames that are the delta chains of kept
+        stage files, so the purge process should not remove them.
+
+        :param stage: A stage value.
+        :param store: A Store object of this stage area.
+        :param kept: A list of stage files that keep after purging.
+
+        :rtype: set[str]
+        """
+        if self.params.get_stage(stage).rule.delta <= 1:
+            return set()
+        return {
+            f
+            for sf in kept
+            if store.exists(sf["file"])
+            for f, _ in self._delta_chain(store, sf["file"])
+        }
 
     def switch(self, stage: str) -> Self:
         """Switch instance from old stage to new stage with input argument.
 
         :param stage: A stage name that want to switch.
         """
-        return self.__class__(self.fullname, stage=stage, params=self.params)
+        return self.__class__(
+            self.fullname,
+            stage=stage,
+            params=self.params,
+            store=self.store,
+            lazy=self.lazy,
+        )
+
+    def __switch(
+        self,
+        stage: str,
+        data: AnyData,
+        node: Optional[MerkleNode] = None,
+    ) -> Self:
+        """Switch instance to new stage with the context data and its Merkle
+        tree that already exist in memory.
+
+        :param stage: A stage name that want to switch.
+        :param data: A context data of the new stage.
+        :param node: A Merkle tree of the hashed context data.
+
+        :rtype: Self
+        """
+        rs: Self = self.__class__(
+            self.fullname,
+            stage=stage,
+            params=self.params,
+            store=self.store,
+            lazy=True,
+        )
+        rs.__raw_data = data or None
+        rs.__merkle = node
+        if not self.lazy:
+            rs.__manage_metadata()
+        rs.lazy = self.lazy
+        return rs
 
     def purge(self, stage: Optional[str] = None) -> None:
         """Purge configuration files that match with any rules in the stage
@@ -560,10 +1488,7 @@ class Register(BaseRegister):
         """
         stage: str = stage or self.stage
         rule: Rule = self.params.get_stage(stage).rule
-
-        store: Store = Store(
-            path=self.params.paths.data / stage, compress=rule.compress
-        )
+        store: BaseStore = self._stage_store(stage)
 
         if ts_timedelta := rule.timestamp:
             if relativedelta is None:  # pragma: no cov
@@ -572,20 +1497,37 @@ class Register(BaseRegister):
                     "package before."
                 )
 
-            rs: dict[int, StageFl] = self._stage_files(stage, store)
+            if not (rs := self._stage_files(stage, store)):
+                return
 
-            max_index, max_stage_file = max(
-                rs.items(), key=lambda x: x[1]["parse"]
+            max_stage_file: StageFl = rs.pop()
+            upper_bound: datetime = max_stage_file["timestamp"] - relativedelta(
+                **ts_timedelta
             )
-            rs.pop(max_index)
-            upper_bound: FormatterGroup = max_stage_file["parse"].adjust(
-                {"timestamp": -relativedelta(**ts_timedelta)}
+
+            retained: set[str] = self._retain(
+                stage,
+                store,
+                [
+                    max_stage_file,
+                    *(x for x in rs if x["timestamp"] >= upper_bound),
+                ],
             )
+            removed: set[str] = {
+                x["file"]
+                for x in rs
+                if x["timestamp"] < upper_bound and x["file"] not in retained
+            }
+            if not removed:
+                return
 
-            for data in filter(lambda x: x["parse"] < upper_bound, rs.values()):
-                print(f"Start remove {data['file']}")
-                rm(store.path / data["file"])
+            with self._stage_writer(stage) as store:
+                for file in sorted(removed):
+                    logger.debug(f"Start remove {file}")
+                    store.remove(file)
+                self._drop_stage_files(stage, removed)
 
+    @instrument("Register.deploy", path=lambda self: self.fullname)
     def deploy(self, stop: Optional[str] = None) -> Self:
         """Deploy the config data from the current stage to the final stage or
         specific an input stop stage.
@@ -607,11 +1549,120 @@ class Register(BaseRegister):
                 "Params argument."
             )
 
-        for stage in self.params.stages:
-            _base: Register = _base.move(stage)
-            if stage == _stop:
-                break
-        return _base  # pragma: no cov
+        stages: list[str] = list(self.params.stages)
+        stages: list[str] = stages[: stages.index(_stop) + 1]
+
+        # NOTE: Prefetch the stage files of the next stage in the background
+        #   while moving the data to the current stage.
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            listing: Future = executor.submit(
+                self.__prefetch, stages[0], self._stage_store(stages[0])
+            )
+            for index, stage in enumerate(stages):
+                sfs: list[StageFl] = listing.result()
+                if index + 1 < len(stages):
+                    listing: Future = executor.submit(
+                        self.__prefetch,
+                        stages[index + 1],
+                        self._stage_store(stages[index + 1]),
+                    )
+                _base: Register = _base.__move(stage, sfs=sfs)
+        return _base
+
+    def __prefetch(self, stage: str, store: BaseStore) -> list[StageFl]:
+        """Return the stage files of a stage area on the prefetch thread, and
+        close the SQLite connections that this thread opened before it exits.
+
+        :param stage: A stage value.
+        :param store: A store object of this stage area.
+        :rtype: list[StageFl]
+        """
+        try:
+            return self._stage_files(stage, store)
+        finally:
+            SqliteStore.close_all()
+
+    @classmethod
+    def deploy_many(
+        cls,
+        names: Union[str, list[str]],
+        *,
+        params: Params,
+        stop: Optional[str] = None,
+        workers: Optional[int] = None,
+        executor: Literal["thread", "process"] = "thread",
+    ) -> dict[str, DeployResult]:
+        """Deploy many config names concurrently. The metadata writes of all
+        config names will write in one batch after all of them were deployed.
+
+        :param names: A list of config fullnames, or a domain value that want to
+            deploy all config names in this domain.
+        :param params: A params object.
+        :param stop: A stage name for stop when move store from base stage
+            to final stage.
+        :param workers: A number of workers.
+        :param executor: An executor type that use to deploy, it should be
+            `thread` or `process`.
+
+        :raise RegisterArgumentError: If an input executor does not support.
+
+        :rtype: dict[str, DeployResult]
+        """
+        if executor not in ("thread", "process"):
+            raise RegisterArgumentError(
+                f"The executor type {executor!r} does not support, it should "
+                f"be `thread` or `process`."
+            )
+
+        if isinstance(names, str):
+            names: list[str] = cls.domain_names(names, params=params)
+
+        # NOTE: Remove the duplicate names, so two workers never deploy the
+        #   same config name. It is the guarantee of this method instead of any
+        #   lock per name.
+        names: list[str] = list(dict.fromkeys(names))
+
+        # NOTE: Create the metadata and stage dirs before starting workers.
+        catalog: BaseCatalog = cls.get_catalog(params)
+        for stage in params.stages:
+            Store(path=params.paths.data / stage)
+
+        rs: dict[str, DeployResult] = {}
+        metadata: dict[CatalogKey, dict[str, Any]] = {}
+        pool: Executor = (
+            ThreadPoolExecutor(max_workers=workers)
+            if executor == "thread"
+            else ProcessPoolExecutor(max_workers=workers)
+        )
+        with pool:
+            futures: list[Future] = [
+                pool.submit(_deploy_one, cls, name, params, stop)
+                for name in names
+            ]
+            for future in futures:
+                result, meta = future.result()
+                rs[result.name] = result
+                metadata.update(meta)
+
+        catalog.save_many(sorted(metadata.items()))
+        return rs
+
+    @classmethod
+    def domain_names(cls, domain: str, params: Params) -> list[str]:
+        """Return all config fullnames that exist in a domain.
+
+        :param domain: A domain value.
+        :param params: A params object.
+        :rtype: list[str]
+        """
+        store: Store = Store(path=params.paths.conf / domain)
+        return list(
+            dict.fromkeys(
+                f"{domain}:{name}"
+                for file in store.ls(excluded=store.excluded_file_fmt)
+                for name in store.open_file(path=file).read() or {}
+            )
+        )
 
     def remove(self) -> None:
         """Remove all config files that move from the base stage by an input
@@ -628,9 +1679,55 @@ class Register(BaseRegister):
                 "The remove method can not process with the 'base' stage."
             )
 
-        store: Store = Store(path=self.params.paths.data / self.stage)
-        for stage_file in self._stage_files(self.stage, store).values():
-            rm(store.path / stage_file["file"])
+        with self._stage_writer(self.stage) as store:
+            removed: set[str] = set()
+            for stage_file in self._stage_files(self.stage, store):
+                store.remove(stage_file["file"])
+                removed.add(stage_file["file"])
+            self._drop_stage_files(self.stage, removed)
+
+
+def _deploy_one(
+    cls: type[Register],
+    name: str,
+    params: Params,
+    stop: Optional[str] = None,
+) -> tuple[DeployResult, dict[CatalogKey, dict[str, Any]]]:
+    """Deploy a config name with the deploy batch and return its result and its
+    metadata writes. This function was defined on the module level, so it can
+    pickle and run with the process executor.
+
+    :param cls: A register class.
+    :param name: A fullname of config.
+    :param params: A params object.
+    :param stop: A stage name for stop.
+
+    :rtype: tuple[DeployResult, dict[CatalogKey, dict[str, Any]]]
+    """
+    batch: DeployBatch = {"metadata": {}, "moved": []}
+    token = deploy_batch.set(batch)
+    try:
+        cls(name, params=params).deploy(stop=stop)
+        result = DeployResult(
+            name=name,
+            status="moved" if batch["moved"] else "unchanged",
+            stages=tuple(batch["moved"]),
+        )
+    except Exception as err:
+        logger.exception(f"Config {name!r} cannot deploy.")
+        result = DeployResult(
+            name=name,
+            status="failed",
+            stages=tuple(batch["moved"]),
+            error=f"{err.__class__.__name__}: {err}",
+        )
+    finally:
+        deploy_batch.reset(token)
+        # NOTE: The worker thread of the pool does not close its thread-local
+        #   connections, so it closes them after each config name.
+        SqliteStore.close_all()
+        SqliteCatalog.close_all()
+    return result, batch["metadata"]
 
 
 class ArchiveRegister(Register):
@@ -639,6 +1736,9 @@ class ArchiveRegister(Register):
     """
 
     archiving: ClassVar[str] = ".archive"
+    segments: ClassVar[str] = "segments"
+    archive_index: ClassVar[str] = "index.json"
+    archive_pending: ClassVar[str] = "pending.jsonl"
 
     def purge(self, stage: Optional[str] = None) -> None:
         """Purge configuration files that match with any rules in the stage
@@ -649,10 +1749,7 @@ class ArchiveRegister(Register):
         """
         stage: str = stage or self.stage
         rule: Rule = self.params.get_stage(stage).rule
-
-        store: Store = Store(
-            path=self.params.paths.data / stage, compress=rule.compress
-        )
+        store: BaseStore = self._stage_store(stage)
 
         if ts_timedelta := rule.timestamp:
             if relativedelta is None:  # pragma: no cov
@@ -661,23 +1758,34 @@ class ArchiveRegister(Register):
                     "package before."
                 )
 
-            rs: dict[int, StageFl] = self._stage_files(stage, store)
-            max_index, max_stage_file = max(
-                rs.items(), key=lambda x: x[1]["parse"]
-            )
-            rs.pop(max_index)
-            upper_bound: FormatterGroup = max_stage_file["parse"].adjust(
-                {"timestamp": -relativedelta(**ts_timedelta)}
+            if not (rs := self._stage_files(stage, store)):
+                return
+
+            max_stage_file: StageFl = rs.pop()
+            upper_bound: datetime = max_stage_file["timestamp"] - relativedelta(
+                **ts_timedelta
             )
 
-            for sf in filter(lambda x: x["parse"] < upper_bound, rs.values()):
-                file: str = sf["file"]
-                _ac_path: str = f"{stage}_{self.updt:{DATE_LOG_FMT}}_{file}"
-                store.move(
-                    file,
-                    dest=self.params.paths.data / self.archiving / _ac_path,
-                )
-                rm(store.path / file)
+            retained: set[str] = self._retain(
+                stage,
+                store,
+                [
+                    max_stage_file,
+                    *(x for x in rs if x["timestamp"] >= upper_bound),
+                ],
+            )
+            if not (
+                files := [
+                    sf["file"]
+                    for sf in rs
+                    if sf["timestamp"] < upper_bound
+                    and sf["file"] not in retained
+                ]
+            ):
+                return
+
+            with self._stage_writer(stage) as store:
+                self._drop_stage_files(stage, self.archive(stage, store, files))
 
     def remove(self) -> None:
         """Remove all config files from an input stage store area and move it to
@@ -693,16 +1801,354 @@ class ArchiveRegister(Register):
                 "The remove method can not process with the 'base' stage."
             )
 
-        store: Store = Store(path=self.params.paths.data / self.stage)
+        with self._stage_writer(self.stage) as store:
+            self._drop_stage_files(
+                self.stage,
+                self.archive(
+                    self.stage,
+                    store,
+                    [sf["file"] for sf in self._stage_files(self.stage, store)],
+                ),
+            )
+
+    def archive(
+        self, stage: str, store: BaseStore, files: list[str]
+    ) -> set[str]:
+        """Move stage files to the archiving area in one batch. It uses the
+        rename operation, so it does not read and rewrite any file if the
+        archiving area lives on the same filesystem with the stage area. The
+        delta stage file will archive as the full snapshot that applies its
+        delta chain, because its parent files can be purged later.
+
+        :param stage: A stage value of these files.
+        :param store: A Store object of this stage area.
+        :param files: A list of stage filenames that want to archive.
+
+        :raise RegisterArgumentError: If the store does not keep stage files
+            on the file system.
+
+        :rtype: set[str]
+        :returns: A set of filenames that was removed from the stage area.
+        """
+        if not isinstance(store, Store):
+            raise RegisterArgumentError(
+                f"The archiving process does not support the "
+                f"{store.__class__.__name__} that does not keep stage files on "
+                f"the file system."
+            )
+        root: Path = self.params.paths.data / self.archiving
+
+        # NOTE: Prefix the domain to the archived filename, so the same config
+        #   name on the other domain does not replace it.
+        prefix: str = (
+            f"{stage}_{self.updt:{DATE_LOG_FMT}}_"
+            f"{self.domain.replace('/', '.') + '.' if self.domain else ''}"
+        )
+        moved: list[tuple[Path, Path]] = [
+            (store.path / file, root / f"{prefix}{file}")
+            for file in files
+            if (store.path / file).exists()
+        ]
+        if not moved:
+            return set(files)
+
+        # NOTE: Resolve all delta stage files before moving any file, because
+        #   their parent files can be in this batch.
+        snapshots: dict[Path, AnyData] = {}
+        if self.params.get_stage(stage).rule.delta > 1:
+            for src, dest in moved:
+                try:
+                    data, chain = self._load_stage_file(store, src.name)
+                except StoreNotFound as err:
+                    logger.warning(f"Archive the delta stage file as is: {err}")
+                    continue
+                if len(chain) > 1:
+                    snapshots[dest] = data
+
+        # NOTE: Keep the fullname and the compress type of the archived files
+        #   on the pending records, because the archived file does not keep its
+        #   domain, and the compress rule of its stage can change before the
+        #   compaction.
+        root.mkdir(parents=True, exist_ok=True)
+        with lock_file(root / self.archive_pending):
+            JsonLineFl(root / self.archive_pending).write(
+                [
+                    {
+                        "member": dest.name,
+                        "name": self.fullname,
+                        "compress": store.compress,
+                    }
+                    for _, dest in moved
+                ],
+                mode="a",
+            )
+            for src, dest in moved:
+                if dest in snapshots:
+                    store.open_file_stg(dest, compress=store.compress).write(
+                        snapshots[dest]
+                    )
+                    src.unlink()
+            move_files(
+                (src, dest) for src, dest in moved if dest not in snapshots
+            )
+        return set(files)
+
+    @classmethod
+    def read_archive_index(cls, params: Params) -> dict[str, list[ArchiveFl]]:
+        """Return the index of archived versions that was compacted to the
+        segments. It maps a config name to a list of archived records.
+
+        :param params: A params object.
+        :rtype: dict[str, list[ArchiveFl]]
+        """
+        path: Path = params.paths.data / cls.archiving / cls.archive_index
+        return JsonFl(path).read() if path.exists() else {}
+
+    @classmethod
+    def compact(
+        cls,
+        params: Params,
+        *,
+        bucket: str = "%Y%m",
+        compress: str = "zip:zlib",
+        workers: Optional[int] = None,
+    ) -> list[Path]:
+        """Compact the archived stage files in the archiving area to the
+        time-bucketed compressed segments with the Dir object, and keep an
+        index of name and version of all archived files. A segment of the zip
+        compress type will append new members, and the tar compress type will
+        rewrite with its member index.
+
+        :param params: A params object.
+        :param bucket: A datetime format of the bucket that use to group the
+            archived files by their archiving timestamp.
+        :param compress: A compress type of the Dir object.
+        :param workers: A number of thread workers that use to pack.
+
+        :rtype: list[Path]
+        :returns: A list of segment paths that was written.
+        """
+        root: Path = params.paths.data / cls.archiving
+        if not root.exists():
+            return []
+
+        with lock_file(root / cls.archive_pending):
+            return cls.__compact(
+                params, bucket=bucket, compress=compress, workers=workers
+            )
+
+    @classmethod
+    def __compact(
+        cls,
+        params: Params,
+        *,
+        bucket: str,
+        compress: str,
+        workers: Optional[int],
+    ) -> list[Path]:
+        root: Path = params.paths.data / cls.archiving
+        pending_path: Path = root / cls.archive_pending
+        pending: dict[str, dict[str, Any]] = {
+            r["member"]: r
+            for r in (
+                JsonLineFl(pending_path).read()
+                if pending_path.exists() and pending_path.stat().st_size
+                else []
+            )
+        }
 
-        for stage_file in self._stage_files(self.stage, store).values():
-            file: str = stage_file["file"]
-            store.move(
-                file,
-                dest=(
-                    self.params.paths.data
-                    / self.archiving
-                    / f"{self.stage}_{self.updt:{DATE_LOG_FMT}}_{file}"
+        buckets: dict[str, list[tuple[Path, ArchiveFl]]] = defaultdict(list)
+        for file in sorted(root.iterdir(), key=lambda x: x.name):
+            if not file.is_file() or not (
+                record := cls.__archive_record(
+                    params, file, pending.get(file.name)
+                )
+            ):
+                continue
+            archived: datetime = datetime.strptime(record["archived"], DATE_FMT)
+            buckets[f"{archived:{bucket}}"].append((file, record))
+
+        index: dict[str, list[ArchiveFl]] = cls.read_archive_index(params)
+        rs: list[Path] = []
+        for name, files in buckets.items():
+            segment: Dir = Dir(root / cls.segments / name, compress=compress)
+            segment.path = segment.path.with_name(
+                f"{name}.{segment_ext(segment)}"
+            )
+            staging: Path = root / cls.segments / f".{name}"
+            staging.mkdir(parents=True, exist_ok=True)
+
+            # NOTE: Append new members to the existing zip segment, otherwise
+            #   extract the existing members that do not replace with new
+            #   members and rewrite this segment.
+            mode: str = "w"
+            if segment.path.exists():
+                members: set[str] = {file.name for file, _ in files}
+                with segment.open(mode="r") as d:
+                    if segment.compress == "zip":
+                        existing: list[Any] = [
+                            n for n in d.namelist() if n not in members
+                        ]
+                    else:
+                        existing: list[Any] = [
+                            m for m in d.getmembers() if m.name not in members
+                        ]
+
+                    if segment.compress == "zip" and len(existing) == len(
+                        d.namelist()
+                    ):
+                        mode: str = "a"
+                    else:
+                        d.safe_extract(staging, members=existing)
+
+            move_files((file, staging / file.name) for file, _ in files)
+            try:
+                segment.pack(
+                    staging,
+                    workers=workers,
+                    mode=mode,
+                    index=(segment.compress == "tar"),
+                )
+            except Exception:
+                move_files((staging / file.name, file) for file, _ in files)
+                raise
+            rm(staging, is_dir=True)
+
+            for _, record in files:
+                record["segment"] = segment.path.name
+                index[record["name"]] = [
+                    r
+                    for r in index.get(record["name"], [])
+                    if (r["segment"], r["member"])
+                    != (record["segment"], record["member"])
+                ] + [record]
+            rs.append(segment.path)
+
+        if rs:
+            JsonFl(root / cls.archive_index).write(index)
+            compacted: set[str] = {
+                record["member"]
+                for files in buckets.values()
+                for _, record in files
+            }
+            if remain := [r for m, r in pending.items() if m not in compacted]:
+                JsonLineFl(pending_path).write(remain)
+            else:
+                pending_path.write_text("")
+        return rs
+
+    @classmethod
+    def __archive_record(
+        cls,
+        params: Params,
+        file: Path,
+        pending: Optional[dict[str, Any]] = None,
+    ) -> Optional[ArchiveFl]:
+        """Return the archived record of an archived stage file, or None if it
+        is not an archived stage file. It uses the config fullname and the
+        compress type from the pending record of this file that was kept on
+        archiving, or the alias and the current compress rule of its stage if
+        it does not have this record.
+
+        :param params: A params object.
+        :param file: An archived file path.
+        :param pending: A pending record of this archived file.
+        :rtype: ArchiveFl | None
+        """
+        if not (search := ARCHIVE_FILE.match(file.name)) or (
+            (stage := search.group("stage")) not in params.stages
+        ):
+            return None
+        compress: Optional[str] = (
+            pending["compress"]
+            if pending
+            else params.get_stage(stage).rule.compress
+        )
+        try:
+            data: dict[str, Any] = json.loads(
+                cls.__decompress(file.read_bytes(), compress)
+            )
+        except (OSError, ValueError):
+            logger.warning(f"Archived file {file.name!r} can not read data.")
+            return None
+        archived: datetime = datetime.strptime(
+            search.group("archived"), DATE_LOG_FMT
+        )
+        return {
+            "name": (
+                pending["name"]
+                if pending
+                else data.get("alias", search.group("file"))
+            ),
+            "stage": stage,
+            "version": data.get(VERSION_KEY),
+            "updt": data.get(UPDATE_KEY),
+            "archived": f"{archived:{DATE_FMT}}",
+            "member": file.name,
+            "segment": None,
+            "compress": compress,
+        }
+
+    @staticmethod
+    def __decompress(data: bytes, compress: Optional[str]) -> bytes:
+        if compress:
+            return compress_lib(compress).decompress(data)
+        return data
+
+    def get_archive(
+        self,
+        version: Optional[str] = None,
+        *,
+        stage: Optional[str] = None,
+    ) -> AnyData:
+        """Get the context data of an archived version of this config name
+        from the compacted segments. It reads only the member of this version
+        from its segment without unpacking the segment.
+
+        :param version: A version value that want to get. It will get the
+            latest archived version if it does not set.
+        :param stage: A stage value that want to filter.
+
+        :rtype: AnyData
+        """
+        records: list[ArchiveFl] = [
+            r
+            for r in self.read_archive_index(self.params).get(self.fullname, [])
+            if (stage is None or r["stage"] == stage)
+            and (
+                version is None
+                or (
+                    r["version"] is not None
+                    and VerPackage.parse(r["version"])
+                    == VerPackage.parse(version)
+                )
+            )
+        ]
+        if not records:
+            return {}
+
+        record: ArchiveFl = max(records, key=lambda r: r["archived"])
+        segment: Path = (
+            self.params.paths.data
+            / self.archiving
+            / self.segments
+            / record["segment"]
+        )
+        d: Dir = Dir(
+            segment,
+            compress=(
+                "zip"
+                if segment.suffix == ".zip"
+                else f"tar:{segment.suffix.lstrip('.')}"
+            ),
+        )
+        return json.loads(
+            self.__decompress(
+                d.read_member(record["member"]),
+                (
+                    record["compress"]
+                    if "compress" in record
+                    else self.params.get_stage(record["stage"]).rule.compress
                 ),
             )
-            rm(store.path / file)
+        )
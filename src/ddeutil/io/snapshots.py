@@ -0,0 +1,207 @@
+# ------------------------------------------------------------------------------
+# Copyright (c) 2022 Korawich Anuttra. All rights reserved.
+# Licensed under the MIT License. See LICENSE in the project root for
+# license information.
+# ------------------------------------------------------------------------------
+"""Immutable snapshot objects of the config data. The snapshot is a deeply
+frozen mapping view that many threads can share without any copy or lock, and
+the Snapshot holder will swap the whole snapshot atomically on reloading.
+
+    *   FrozenDict      : Read-only mapping that keeps only the frozen values.
+    *   Snapshot        : Holder of the current snapshot with the atomic swap.
+"""
+from __future__ import annotations
+
+import threading
+from collections.abc import Iterator, Mapping
+from types import MappingProxyType
+from typing import Any, Callable, Optional
+
+from .__type import TupleStr
+
+__all__: TupleStr = (
+    "FrozenDict",
+    "Snapshot",
+    "freeze",
+    "thaw",
+)
+
+
+class FrozenDict(Mapping):
+    """Frozen Dict object that is the read-only mapping view of a dict which
+    all nested values was frozen by the ``freeze`` function. It returns itself
+    when it copies, so the defensive deep-copy does not cost anything.
+
+    :param data: A mapping data that want to freeze.
+
+    Examples:
+        >>> data = FrozenDict({"foo": {"bar": [1, 2]}})
+        >>> data["foo"]["bar"]
+        (1, 2)
+    """
+
+    __slots__ = ("__data", "__hash")
+
+    def __init__(self, data: Optional[Mapping[Any, Any]] = None) -> None:
+        self.__data: MappingProxyType = MappingProxyType(
+            {k: freeze(v) for k, v in (data or {}).items()}
+        )
+        self.__hash: Optional[int] = None
+
+    def __getitem__(self, key: Any) -> Any:
+        return self.__data[key]
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.__data)
+
+    def __len__(self) -> int:
+        return len(self.__data)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self.__data
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({dict(self.__data)!r})"
+
+    def __hash__(self) -> int:
+        if self.__hash is None:
+            self.__hash = hash(frozenset(self.__data.items()))
+        return self.__hash
+
+    def __or__(self, other: Mapping[Any, Any]) -> FrozenDict:
+        return FrozenDict({**self.__data, **other})
+
+    def __copy__(self) -> FrozenDict:
+        return self
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> FrozenDict:
+        return self
+
+    def __reduce__(self) -> tuple[type[FrozenDict], tuple[dict[Any, Any]]]:
+        return self.__class__, (dict(self.__data),)
+
+    def thaw(self) -> dict[Any, Any]:
+        """Return the mutable deep copy of this frozen dict.
+
+        :rtype: dict[Any, Any]
+        """
+        return thaw(self)
+
+
+def freeze(value: Any) -> Any:
+    """Return the deeply immutable value. It converts a mapping to FrozenDict,
+    a list or tuple to tuple, and a set to frozenset. It returns the frozen dict
+    as it is without walking its values, so it does not cost anything to
+    freeze the data that was already frozen.
+
+    :param value: A value that want to freeze.
+    :rtype: Any
+    """
+    if isinstance(value, (FrozenDict, str, bytes, int, float, type(None))):
+        return value
+    elif isinstance(value, Mapping):
+        return FrozenDict(value)
+    elif isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    elif isinstance(value, (set, frozenset)):
+        return frozenset(freeze(v) for v in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Return the mutable deep copy of a frozen value. It converts a mapping to
+    dict, a tuple to list, and a frozenset to set.
+
+    :param value: A value that want to thaw.
+    :rtype: Any
+    """
+    if isinstance(value, Mapping):
+        return {k: thaw(v) for k, v in value.items()}
+    elif isinstance(value, (list, tuple)):
+        return [thaw(v) for v in value]
+    elif isinstance(value, (set, frozenset)):
+        return {thaw(v) for v in value}
+    return value
+
+
+class Snapshot:
+    """Snapshot holder object that keeps the current frozen snapshot of the
+    config data with its version number. The swap replaces the version and the
+    snapshot together with one reference assignment, so the readers on many
+    threads always get a consistent snapshot without any lock.
+
+    :param data: An initial data of this snapshot.
+
+    Examples:
+        >>> snapshot = Snapshot()
+        >>> watcher = Store("./conf").watch(["conn"], snapshot.update)
+        >>> snapshot.get()["conn"]
+    """
+
+    def __init__(self, data: Optional[Mapping[Any, Any]] = None) -> None:
+        self.__current: tuple[int, FrozenDict] = (0, freeze(data or {}))
+
+        # NOTE: The lock guards only the writers, so the read-modify-write
+        #   operation such as the update method does not lose any update.
+        self.__lock: threading.Lock = threading.Lock()
+
+    @property
+    def version(self) -> int:
+        """Return the version number that increases on every swap.
+
+        :rtype: int
+        """
+        return self.__current[0]
+
+    def get(self) -> FrozenDict:
+        """Return the current frozen snapshot.
+
+        :rtype: FrozenDict
+        """
+        return self.__current[1]
+
+    def current(self) -> tuple[int, FrozenDict]:
+        """Return the version number and the current frozen snapshot together.
+
+        :rtype: tuple[int, FrozenDict]
+        """
+        return self.__current
+
+    def swap(self, data: Mapping[Any, Any]) -> FrozenDict:
+        """Replace the whole snapshot with a new data.
+
+        :param data: A new data of this snapshot.
+        :rtype: FrozenDict
+        """
+        frozen: FrozenDict = freeze(data)
+        with self.__lock:
+            self.__current = (self.__current[0] + 1, frozen)
+        return frozen
+
+    def reload(self, loader: Callable[[], Mapping[Any, Any]]) -> FrozenDict:
+        """Replace the whole snapshot with the data that return from a loader.
+
+        :param loader: A loader function that return a new data.
+        :rtype: FrozenDict
+        """
+        return self.swap(loader())
+
+    def update(self, name: Any, data: Any) -> FrozenDict:
+        """Replace the data of a name on the snapshot. It can pass to the watch
+        method of the Store object as a callback. It removes this name if the
+        data is empty.
+
+        :param name: A name of data.
+        :param data: A new data of this name.
+        :rtype: FrozenDict
+        """
+        frozen: Any = freeze(data)
+        with self.__lock:
+            version, snapshot = self.__current
+            rs: dict[Any, Any] = dict(snapshot)
+            if frozen:
+                rs[name] = frozen
+            else:
+                rs.pop(name, None)
+            self.__current = (version + 1, FrozenDict(rs))
+            return self.__current[1]
@@ -9,6 +9,14 @@ customize usage.
 
     *   Store           : Store with Yaml open file and use stage with Json.
     *   StoreJsonToCsv  : Store with Json open file and use stage with Yaml.
+    *   StoreLog        : Store that keeps the merge and delete mutations of
+                          stage with the append-only log.
+    *   SqliteStore     : Store that keeps stage data as rows on the SQLite
+                          database file.
+    *   DbmStore        : Store that keeps the latest stage data of any name on
+                          the key-value dbm database file.
+    *   Generations     : Immutable generation dirs of a store path with the
+                          atomic ``current`` pointer.
 
     Store will keep data with 2 stages, that mean data have data layer and stage
 layer.
@@ -16,16 +24,34 @@ layer.
 from __future__ import annotations
 
 import abc
+import dbm
 import inspect
+import json
 import logging
+import os
 import shutil
+import sqlite3
+import threading
+import uuid
 from collections.abc import Iterator
+from contextlib import contextmanager, nullcontext
 from datetime import datetime
+from fnmatch import fnmatch
 from pathlib import Path
-from typing import Any, ClassVar, Optional, Union
+from typing import IO, Any, Callable, ClassVar, Optional, Union
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cov
+    msgpack = None
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cov
+    fcntl = None
 
 from .__type import AnyData, TupleStr
-from .config import VERSION_DEFAULT
+from .config import DELTA_KEY, UPDATE_KEY, VERSION_DEFAULT, VERSION_KEY
 from .files import (
     CsvPipeFl,
     Fl,
@@ -33,18 +59,158 @@ from .files import (
     JsonFl,
     JsonLineFl,
     YamlEnvFl,
+    compress_lib,
 )
+from .hooks import instrument
 from .paths import PathSearch
-from .utils import rm
+from .snapshots import FrozenDict, freeze
+from .utils import json_patch, lock_file, rm
+from .watchers import Watcher
 
 __all__: TupleStr = (
     "BaseStore",
     "Store",
     "StoreJsonToCsv",
     "StoreToJsonLine",
+    "StoreLog",
+    "SqliteStore",
+    "DbmStore",
+    "Generations",
 )
 
 
+def match_key(
+    key: str,
+    name: Optional[str] = None,
+    excluded: Optional[Union[list[str], tuple[str, ...]]] = None,
+) -> bool:
+    """Return True if the filename of a document key matches with a filename
+    pattern and does not match with any excluded filenames.
+
+    :param key: A document key that relative with the store path.
+    :param name: A filename pattern.
+    :param excluded: A list of excluded filenames.
+    :rtype: bool
+    """
+    filename: str = key.rsplit("/", maxsplit=1)[-1]
+    return fnmatch(filename, name or "*") and not any(
+        fnmatch(filename, ex) for ex in excluded or ()
+    )
+
+
+class Generations:
+    """Generations object that manages the immutable generation dirs of a store
+    path. The writer builds the next generation from the current generation
+    with hard links, changes it, and flips the ``current`` pointer (a symlink,
+    or a pointer file on the platform that does not support it) to it with the
+    atomic ``os.replace``. So, the reader that resolves the pointer once per
+    operation always reads a consistent snapshot without any lock.
+
+        <path>/
+            current             --> .generations/00000002
+            .generations/
+                00000001/
+                00000002/
+
+    :param path: A store path.
+    """
+
+    pointer: ClassVar[str] = "current"
+    folder: ClassVar[str] = ".generations"
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path: Path = Path(path) if isinstance(path, str) else path
+
+    def current(self) -> Path:
+        """Return the current generation dir that the pointer points to. It
+        will return the store path if this path does not have any generation
+        dir, or the pointer does not point to a generation dir, such as a
+        config file that has the same name with the pointer.
+
+        :rtype: Path
+        """
+        if not (self.path / self.folder).is_dir():
+            return self.path
+        pointer: Path = self.path / self.pointer
+        try:
+            target: str = os.readlink(pointer)
+        except FileNotFoundError:
+            return self.path
+        except OSError:
+            # NOTE: The pointer is a file that keeps the generation path.
+            try:
+                target = pointer.read_text(encoding="utf-8").strip()
+            except (OSError, UnicodeDecodeError):
+                return self.path
+        gen: Path = self.path / target
+        return gen if gen.parent == self.path / self.folder else self.path
+
+    def generations(self) -> list[Path]:
+        """Return the sorted list of all generation dirs.
+
+        :rtype: list[Path]
+        """
+        if not (root := self.path / self.folder).exists():
+            return []
+        return sorted(p for p in root.iterdir() if p.name.isdigit())
+
+    def build(self) -> Path:
+        """Build the next generation dir that hard links all files from the
+        current generation, or the store path if it does not have any
+        generation. It will copy the file if it can not link.
+
+        :rtype: Path
+        """
+        current: Path = self.current()
+        gens: list[Path] = self.generations()
+        gen: Path = (
+            self.path
+            / self.folder
+            / f"{(int(gens[-1].name) if gens else 0) + 1:08d}"
+        )
+        gen.mkdir(parents=True)
+        for file in current.iterdir():
+            # NOTE: Skip the pointer and the hidden temporary files.
+            if file.name.startswith(".") or file.name == self.pointer:
+                continue
+            elif file.is_file():
+                try:
+                    os.link(file, gen / file.name)
+                except OSError:  # pragma: no cov
+                    shutil.copy2(file, gen / file.name)
+        return gen
+
+    def flip(self, gen: Path) -> None:
+        """Point the current pointer to a generation dir atomically.
+
+        :param gen: A generation dir.
+        """
+        target: str = gen.relative_to(self.path).as_posix()
+        temp: Path = self.path / f".{self.pointer}.{uuid.uuid4().hex[:8]}"
+        try:
+            os.symlink(target, temp, target_is_directory=True)
+        except (OSError, NotImplementedError):  # pragma: no cov
+            temp.write_text(target, encoding="utf-8")
+        os.replace(temp, self.path / self.pointer)
+
+    def gc(self, keep: int = 2) -> list[Path]:
+        """Remove the old generation dirs but keep the newest generations and
+        the current generation. It keeps at least 2 generations, so the reader
+        that resolved the previous pointer still reads its generation.
+
+        :param keep: A number of the newest generations that want to keep.
+        :rtype: list[Path]
+        :returns: A list of removed generation dirs.
+        """
+        current: Path = self.current()
+        removed: list[Path] = [
+            gen for gen in self.generations()[: -max(keep, 2)] if gen != current
+        ]
+        for gen in removed:
+            shutil.rmtree(gen, ignore_errors=True)
+        return removed
+
+
 class BaseStore(abc.ABC):
     """Base Store File object for getting data with `.yaml` format (default
     format for a config file) and mapping environment variables to the content
@@ -77,6 +243,7 @@ class BaseStore(abc.ABC):
         if not self.path.exists():
             self.path.mkdir(parents=True)
 
+    @instrument("Store.get", path=lambda self: self.path)
     def get(self, name: str, *, order: int = 1) -> AnyData:
         """Return configuration data from name of the config that already adding
         `alias` key with this input name.
@@ -90,10 +257,10 @@ class BaseStore(abc.ABC):
         :rtype: AnyData
         :returns: The loaded context data from the open file read method.
         """
-        rs: list[dict[Any, Any]]
-        if not (
-            rs := [
-                {"alias": name} | data
+        return self.select(
+            name,
+            [
+                data
                 for file in self.ls(excluded=self.excluded_file_fmt)
                 if (
                     data := (
@@ -102,8 +269,35 @@ class BaseStore(abc.ABC):
                         .get(name)
                     )
                 )
-            ]
-        ):
+            ],
+            order=order,
+        )
+
+    def snapshot(self, name: str, *, order: int = 1) -> FrozenDict:
+        """Return the deeply immutable snapshot of the configuration data from
+        name of the config, so it can share between threads without any copy.
+
+        :param name: A name of config key that want to search in the path.
+        :param order: An order number that want to get from ordered list
+            of duplicate data.
+
+        :rtype: FrozenDict
+        """
+        return freeze(self.get(name, order=order))
+
+    @staticmethod
+    def select(name: str, rs: list[AnyData], *, order: int = 1) -> AnyData:
+        """Return the config data from a list of duplicate data of a name that
+        ordered by its version.
+
+        :param name: A name of config key.
+        :param rs: A list of duplicate data of this name.
+        :param order: An order number that want to get from ordered list
+            of duplicate data.
+
+        :rtype: AnyData
+        """
+        if not (rs := [{"alias": name} | data for data in rs]):
             return {}
 
         try:
@@ -136,20 +330,44 @@ class BaseStore(abc.ABC):
     ) -> Iterator[Path]:
         """Return all files that already exist in the store path.
 
-        :param path: A specific root path that want to list.
+        :param path: A specific root path that want to list. It resolves the
+            current generation if this path has the generation dirs.
         :param name: A filename pattern that want to list.
         :param excluded: A list of excluded filenames.
         :rtype: Iterator[Path]
         """
-        yield from filter(
-            lambda x: x.is_file(),
-            (
-                PathSearch(
-                    root=(path or self.path),
-                    exclude=excluded,
-                ).pick(filename=(name or "*"))
-            ),
-        )
+        yield from PathSearch(
+            root=Generations(path or self.path).current(),
+            exclude=excluded,
+        ).pick(filename=(name or "*"))
+
+    def key(self, path: Union[str, Path]) -> str:
+        """Return the key of a path that relative with this store path. It uses
+        with the store that does not keep a document as a file.
+
+        :param path: A path or a child path of this store path.
+        :rtype: str
+        """
+        path: Path = Path(path)
+        try:
+            return path.relative_to(self.path).as_posix()
+        except ValueError:
+            return path.as_posix()
+
+    def exists(self, path: Union[str, Path]) -> bool:
+        """Return True if a child path exists in this store path.
+
+        :param path: A child path of this store path.
+        :rtype: bool
+        """
+        return (self.path / path).exists()
+
+    def remove(self, path: Union[str, Path]) -> None:
+        """Remove a child path from this store path if it exists.
+
+        :param path: A child path of this store path.
+        """
+        rm(self.path / path, force_raise=False)
 
     def move(self, path: Union[str, Path], dest: Path) -> None:
         """Copy filename inside this config path to the destination path.
@@ -231,16 +449,18 @@ class Store(BaseStore):
             logging.debug(f"Start writing data to {path}")
             return
         elif merge and (
-            "mode"
-            in inspect.getfullargspec(self.open_file_stg.write).annotations
+            "mode" in inspect.signature(self.open_file_stg.write).parameters
         ):
             self.open_file_stg(path, compress=self.compress).write(
                 **{"data": data, "mode": "a"}
             )
             return
 
-        all_data: AnyData = self.load(path=path)
-        try:
+        # NOTE: Hold the exclusive lock between loading and writing, so the
+        #   other writers do not lose their updates. It does not need to roll
+        #   back if it raises because the writing replaces the file atomically.
+        with self.open_file_stg(path, compress=self.compress).lock():
+            all_data: AnyData = self.load(path=path)
             if isinstance(all_data, list):
                 rs: list[AnyData] = all_data
                 (rs.append(data) if isinstance(data, dict) else rs.extend(data))
@@ -249,14 +469,6 @@ class Store(BaseStore):
 
             # NOTE: Writing data to the stage layer
             self.open_file_stg(path, compress=self.compress).write(rs)
-        except TypeError:
-            # NOTE: Remove the previous saving file path for rollback.
-            rm(path=path, force_raise=False)
-            if all_data:
-                self.open_file_stg(path, compress=self.compress).write(
-                    all_data,
-                )
-            raise
 
     def delete(self, path: Union[str, Path], name: str) -> None:
         """Remove data by name insided the staging file with filename.
@@ -265,9 +477,10 @@ class Store(BaseStore):
         :param name:
         """
         # NOTE: Remove data with the input name key if it exists.
-        if all_data := self.load(path=path):
-            all_data.pop(name, None)
-            (self.open_file_stg(path, compress=self.compress).write(all_data))
+        with self.open_file_stg(path, compress=self.compress).lock():
+            if all_data := self.load(path=path):
+                all_data.pop(name, None)
+                self.open_file_stg(path, compress=self.compress).write(all_data)
 
     def create(
         self, path: Union[str, Path], *, initial_data: AnyData = None
@@ -287,6 +500,72 @@ class Store(BaseStore):
                 merge=False,
             )
 
+    def watch(
+        self,
+        names: Union[str, list[str]],
+        callback: Callable[[str, AnyData], None],
+        *,
+        polling: bool = False,
+    ) -> Watcher:
+        """Watch the config files in the store path, and call a callback with
+        the name and its new data when the data that the ``get`` method will
+        return of any watching name was changed. It keeps the parsed data of
+        the watching names per file, so it re-parses only the changed files.
+
+        :param names: A name or a list of names of config key that want to
+            watch.
+        :param callback: A callback that receive the name and its new data.
+        :param polling: A polling flag that force to use the polling mode.
+
+        :rtype: Watcher
+        :returns: The started Watcher object that should stop after use.
+        """
+        names: list[str] = [names] if isinstance(names, str) else list(names)
+        lock: threading.Lock = threading.Lock()
+
+        def parse(file: Path) -> dict[str, AnyData]:
+            data: dict[str, Any] = (
+                self.open_file(path=file, compress=self.compress).read() or {}
+            )
+            return {name: data[name] for name in names if data.get(name)}
+
+        def pick(name: str) -> AnyData:
+            return self.select(
+                name,
+                [cache[f][name] for f in sorted(cache) if name in cache[f]],
+            )
+
+        def reload(changed: set[Path]) -> None:
+            with lock:
+                files: set[Path] = set(self.ls(excluded=self.excluded_file_fmt))
+                affected: set[str] = set()
+                for file in (
+                    (changed & files)
+                    | (files - cache.keys())
+                    | (cache.keys() - files)
+                ):
+                    affected.update(cache.pop(file, {}))
+                    if file not in files:
+                        continue
+                    try:
+                        cache[file] = parse(file)
+                    except Exception as err:
+                        logging.warning(f"Cannot parse {file} for watch: {err}")
+                        continue
+                    affected.update(cache[file])
+
+                for name in sorted(affected):
+                    if (data := pick(name)) != latest[name]:
+                        latest[name] = data
+                        callback(name, data)
+
+        cache: dict[Path, dict[str, AnyData]] = {
+            file: parse(file)
+            for file in self.ls(excluded=self.excluded_file_fmt)
+        }
+        latest: dict[str, AnyData] = {name: pick(name) for name in names}
+        return Watcher(self.path, reload, polling=polling).start()
+
 
 class StoreJsonToCsv(Store):
     """Store object that getting the Json context data and save it to stage with
@@ -310,3 +589,771 @@ class StoreToJsonLine(Store):
     """
 
     open_file_stg: ClassVar[type[Fl]] = JsonLineFl
+
+
+class StoreLog(Store):
+    """Store object that keeps the merge and delete mutations of the dict stage
+    file on an append-only Json line log file beside it, ``<filename>.log``. So,
+    the cost of a mutation is the size of its update instead of the size of the
+    stage file. The load method will replay this log on the stage data, and it
+    will compact the log to the new stage file when the log size crosses the
+    compact ratio of the stage file size.
+
+        The log records have 2 types, the upsert record, ``{"set": {...}}``,
+    and the tombstone record, ``{"del": "<name>"}``.
+    """
+
+    log_ext: ClassVar[str] = ".log"
+    compact_ratio: ClassVar[float] = 1.0
+    compact_min_size: ClassVar[int] = 4096
+
+    def log_path(self, path: Union[str, Path]) -> Path:
+        """Return the mutation log path of a stage file.
+
+        :param path: A stage file path.
+        :rtype: Path
+        """
+        path: Path = Path(path)
+        return path.with_name(f"{path.name}{self.log_ext}")
+
+    @staticmethod
+    def replay(data: dict[str, Any], log: Path) -> dict[str, Any]:
+        """Return the data that apply all records of a mutation log file. It
+        skips the invalid record only if it is the last record, because it is
+        the partial record that a crashed writer left.
+
+        :param data: A data of the stage file.
+        :param log: A mutation log file path.
+
+        :raise ValueError: If the invalid record is not the last record.
+
+        :rtype: dict[str, Any]
+        """
+        rs: dict[str, Any] = dict(data)
+        with open(log, encoding="utf-8") as f:
+            lines: list[str] = f.read().splitlines()
+        for i, line in enumerate(lines):
+            try:
+                record: dict[str, Any] = json.loads(line)
+            except json.JSONDecodeError as err:
+                if i < len(lines) - 1:
+                    raise ValueError(
+                        f"The log record on line {i + 1} of {log} is invalid."
+                    ) from err
+                logging.warning(f"Skip the partial log record on {log}")
+                break
+            if "set" in record:
+                rs |= record["set"]
+            else:
+                rs.pop(record["del"], None)
+        return rs
+
+    def load(
+        self, path: Union[str, Path], *, default: AnyData = None
+    ) -> AnyData:
+        """Return content data from file with filename and replay its mutation
+        log if it exists, default empty dict.
+
+        :rtype: AnyData
+        """
+        with self.open_file_stg(path, compress=self.compress).lock(shared=True):
+            data: AnyData = super().load(path, default=default)
+            if (log := self.log_path(path)).exists():
+                return self.replay(data, log)
+            return data
+
+    def __logged(self, path: Union[str, Path]) -> bool:
+        """Return True if a stage file can keep its mutations on the log. It
+        loads the stage file only once before the log was created.
+        """
+        return self.log_path(path).exists() or (
+            Path(path).exists() and isinstance(super().load(path), dict)
+        )
+
+    def __append(self, path: Union[str, Path], record: dict[str, Any]) -> None:
+        """Append a record to the mutation log and compact it if its size
+        crosses the compact ratio of the stage file size. It truncates the
+        partial record that a crashed writer left before appending, so this
+        record does not write on the same line.
+        """
+        with open(self.log_path(path), mode="a+b") as f:
+            if end := f.seek(0, os.SEEK_END):
+                f.seek(end - 1)
+                if f.read(1) != b"\n":
+                    f.truncate(self.__last_line_end(f, end))
+            f.write(f"{json.dumps(record, default=str)}\n".encode())
+            f.flush()
+            size: int = os.fstat(f.fileno()).st_size
+        try:
+            stage_size: int = Path(path).stat().st_size
+        except FileNotFoundError:
+            stage_size: int = 0
+        if size > self.compact_ratio * max(stage_size, self.compact_min_size):
+            self.compact(path)
+
+    @staticmethod
+    def __last_line_end(f: IO[bytes], end: int, size: int = 4096) -> int:
+        """Return the position after the last newline before an end position of
+        a binary file, or 0 if it does not have any newline.
+        """
+        pos: int = end
+        while pos > 0:
+            step: int = min(size, pos)
+            pos -= step
+            f.seek(pos)
+            if (i := f.read(step).rfind(b"\n")) >= 0:
+                return pos + i + 1
+        return 0
+
+    def save(
+        self,
+        path: Union[str, Path],
+        data: AnyData,
+        *,
+        merge: bool = False,
+    ) -> None:
+        """Write content data to file with filename. If merge is true and the
+        stage file keeps a dict data, it will append the upsert record to the
+        mutation log instead of re-write the file.
+
+        :param path:
+        :param data:
+        :param merge:
+        """
+        with self.open_file_stg(path, compress=self.compress).lock():
+            if not merge or not self.__logged(path):
+                super().save(path, data, merge=merge)
+                if not merge:
+                    rm(self.log_path(path), force_raise=False)
+                return
+            elif not isinstance(data, dict):
+                raise TypeError(
+                    f"The stage file {path} keeps a dict data, so it does not "
+                    f"merge with {type(data).__name__!r} data."
+                )
+            self.__append(path, {"set": data})
+
+    def delete(self, path: Union[str, Path], name: str) -> None:
+        """Remove data by name inside the staging file with filename. It will
+        append the tombstone record to the mutation log.
+
+        :param path:
+        :param name:
+        """
+        with self.open_file_stg(path, compress=self.compress).lock():
+            if not self.__logged(path):
+                super().delete(path, name)
+                return
+            self.__append(path, {"del": name})
+
+    def compact(self, path: Union[str, Path]) -> None:
+        """Fold the mutation log of a stage file into the new stage file and
+        remove this log.
+
+        :param path: A stage file path.
+        """
+        stg: Fl = self.open_file_stg(path, compress=self.compress)
+        with stg.lock():
+            if not (log := self.log_path(path)).exists():
+                return
+            stg.write(self.load(path))
+            rm(log, force_raise=False)
+        logging.debug(f"Compact the mutation log to {path}")
+
+
+class SqliteStore(BaseStore):
+    """SQLite Store object that keeps config documents and stage data as rows on
+    a SQLite database file in the store path instead of one file per object. A
+    row keeps the relative path of the document as its key, so it can use with
+    the same path arguments as the Store object, and it indexes by the alias
+    name, the version, and the update timestamp of the document.
+
+        The ``save`` with merge flag and ``delete`` methods will load, update,
+    and write a document in one transaction, so they do not lose any update from
+    other connections.
+
+    :param path: A path of the store that keep the database file.
+    :param compress: A compress type of the document blob, it supports the same
+        values with the compress of the Fl object.
+    """
+
+    filename: ClassVar[str] = "store.db"
+    schema: ClassVar[TupleStr] = (
+        (
+            "CREATE TABLE IF NOT EXISTS store ("
+            "path TEXT NOT NULL PRIMARY KEY, "
+            "name TEXT, "
+            "version TEXT, "
+            "updt TEXT, "
+            "compress TEXT, "
+            "data BLOB NOT NULL)"
+        ),
+        "CREATE INDEX IF NOT EXISTS ix_store_name_version "
+        "ON store (name, version)",
+        "CREATE INDEX IF NOT EXISTS ix_store_name_updt ON store (name, updt)",
+    )
+
+    # NOTE: Keep a connection per database path on each thread because the
+    #   SQLite connection should not share between threads or forked processes.
+    __local: ClassVar[threading.local] = threading.local()
+
+    @property
+    def db(self) -> Path:
+        """Return the database file path of this store.
+
+        :rtype: Path
+        """
+        return self.path / self.filename
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """Return the cached connection of this database file on the current
+        thread. It uses the autocommit mode, so any write should use the
+        ``transaction`` method.
+
+        :rtype: sqlite3.Connection
+        """
+        if not hasattr(self.__local, "conns"):
+            self.__local.conns = {}
+        key: tuple[int, Path] = (os.getpid(), self.db)
+        if (conn := self.__local.conns.get(key)) is None:
+            conn = sqlite3.connect(self.db, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            for statement in self.schema:
+                conn.execute(statement)
+            self.__local.conns[key] = conn
+        return conn
+
+    def close(self) -> None:
+        """Close the cached connection of this database file on the current
+        thread.
+        """
+        conns: dict[tuple[int, Path], sqlite3.Connection] = getattr(
+            self.__local, "conns", {}
+        )
+        if (conn := conns.pop((os.getpid(), self.db), None)) is not None:
+            conn.close()
+
+    @classmethod
+    def close_all(cls) -> None:
+        """Close all cached connections of the current process on the current
+        thread. It should call before a short-lived thread exits because its
+        connections will not close until garbage collection.
+        """
+        conns: dict[tuple[int, Path], sqlite3.Connection] = getattr(
+            cls.__local, "conns", {}
+        )
+        for key in [key for key in conns if key[0] == os.getpid()]:
+            conns.pop(key).close()
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Return the connection that start the immediate transaction, so it
+        holds the write lock of this database file until commit or rollback.
+
+        :rtype: Iterator[sqlite3.Connection]
+        """
+        conn: sqlite3.Connection = self.conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def __encode(self, data: AnyData) -> bytes:
+        blob: bytes = json.dumps(data, default=str).encode("utf-8")
+        return (
+            compress_lib(self.compress).compress(blob)
+            if self.compress
+            else blob
+        )
+
+    @staticmethod
+    def __decode(compress: Optional[str], blob: bytes) -> AnyData:
+        if compress:
+            blob = compress_lib(compress).decompress(blob)
+        return json.loads(blob.decode("utf-8"))
+
+    def __read(self, conn: sqlite3.Connection, key: str) -> Optional[AnyData]:
+        row: Optional[tuple[str, bytes]] = conn.execute(
+            "SELECT compress, data FROM store WHERE path = ?", (key,)
+        ).fetchone()
+        return None if row is None else self.__decode(*row)
+
+    def __write(
+        self, conn: sqlite3.Connection, key: str, data: AnyData
+    ) -> None:
+        meta: dict[str, Any] = data if isinstance(data, dict) else {}
+        conn.execute(
+            "INSERT OR REPLACE INTO store "
+            "(path, name, version, updt, compress, data) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                key,
+                meta.get("alias"),
+                meta.get(VERSION_KEY),
+                meta.get(UPDATE_KEY),
+                self.compress,
+                self.__encode(data),
+            ),
+        )
+
+    @instrument("SqliteStore.get", path=lambda self: self.db)
+    def get(
+        self,
+        name: str,
+        *,
+        order: int = 1,
+        version: Optional[str] = None,
+    ) -> AnyData:
+        """Return the document of a name with the indexed lookup. It orders the
+        documents of this name by their update timestamp.
+
+        :param name: An alias name of the document.
+        :param order: An order number of the latest document.
+        :param version: A version value that want to filter.
+
+        :rtype: AnyData
+        """
+        query: str = "SELECT compress, data FROM store WHERE name = ?"
+        params: list[Any] = [name]
+        if version is not None:
+            query += " AND version = ?"
+            params.append(version)
+        row: Optional[tuple[str, bytes]] = self.conn.execute(
+            f"{query} ORDER BY updt DESC, rowid DESC LIMIT 1 OFFSET ?",
+            (*params, max(order - 1, 0)),
+        ).fetchone()
+        return {} if row is None else self.__decode(*row)
+
+    def ls(
+        self,
+        path: Optional[str] = None,
+        name: Optional[str] = None,
+        *,
+        excluded: Optional[Union[list[str], tuple[str, ...]]] = None,
+    ) -> Iterator[Path]:
+        """Return paths of all documents in this store. It does not have any
+        file on these paths, so it should read them with the ``load`` method.
+
+        :param path: A specific child path that want to list.
+        :param name: A filename pattern that want to list.
+        :param excluded: A list of excluded filenames.
+        :rtype: Iterator[Path]
+        """
+        prefix: str = f"{self.key(path)}/" if path else ""
+        for (key,) in self.conn.execute(
+            "SELECT path FROM store WHERE substr(path, 1, ?) = ? ORDER BY path",
+            (len(prefix), prefix),
+        ).fetchall():
+            if match_key(key, name, excluded):
+                yield self.path / key
+
+    def exists(self, path: Union[str, Path]) -> bool:
+        return (
+            self.conn.execute(
+                "SELECT 1 FROM store WHERE path = ?", (self.key(path),)
+            ).fetchone()
+            is not None
+        )
+
+    def remove(self, path: Union[str, Path]) -> None:
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM store WHERE path = ?", (self.key(path),))
+
+    def move(self, path: Union[str, Path], dest: Path) -> None:
+        """Export a document in this store to the destination file with Json
+        format.
+
+        :param path: A child path that exists in this store.
+        :param dest: A destination path.
+        """
+        if not dest.parent.exists():
+            dest.parent.mkdir(parents=True, exist_ok=True)
+        JsonFl(dest).write(self.load(path))
+
+    def load(
+        self, path: Union[str, Path], *, default: AnyData = None
+    ) -> AnyData:
+        """Return the document of a path, default empty dict.
+
+        :rtype: AnyData
+        """
+        if (data := self.__read(self.conn, self.key(path))) is None:
+            return default if (default is not None) else {}
+        return data
+
+    def save(
+        self,
+        path: Union[str, Path],
+        data: AnyData,
+        *,
+        merge: bool = False,
+    ) -> None:
+        """Write a document to a path. If merge is true, it will merge the
+        incoming data with the current document in one transaction.
+
+        :param path:
+        :param data:
+        :param merge:
+        """
+        key: str = self.key(path)
+        with self.transaction() as conn:
+            if merge and (current := self.__read(conn, key)):
+                if isinstance(current, list):
+                    (
+                        current.append(data)
+                        if isinstance(data, dict)
+                        else current.extend(data)
+                    )
+                    data = current
+                else:
+                    data = current | data
+            self.__write(conn, key, data)
+        logging.debug(f"Start writing data to {key} on {self.db}")
+
+    def delete(self, path: Union[str, Path], name: str) -> None:
+        """Remove data by name inside the document of a path in one transaction.
+
+        :param path:
+        :param name:
+        """
+        key: str = self.key(path)
+        with self.transaction() as conn:
+            if current := self.__read(conn, key):
+                current.pop(name, None)
+                self.__write(conn, key, current)
+
+    def create(
+        self, path: Union[str, Path], *, initial_data: AnyData = None
+    ) -> None:
+        """Create a document with an initial data if it does not exist.
+
+        :param path:
+        :param initial_data:
+        :type initial_data: AnyData
+        """
+        key: str = self.key(path)
+        with self.transaction() as conn:
+            if self.__read(conn, key) is None:
+                self.__write(conn, key, initial_data or {})
+
+
+class DbmStore(BaseStore):
+    """Dbm Store object that keeps stage data on the key-value database file of
+    the stdlib ``dbm`` package, it uses the first available module of gnu, ndbm,
+    and dumb. Any document keeps with its relative path key, and the document
+    that has the alias name also keeps the full data with two lookup keys:
+
+        *   ``<name>``              : The latest data of this name by the update
+                                      timestamp.
+        *   ``<name>@<version>``    : The data of this name and version.
+
+        So, reading the latest data of any name is one hash lookup and one
+    decode with ``msgpack`` (or ``json`` if it does not install). The
+    ``save`` method resolves the delta data from its parent documents before
+    updating these lookup keys, and it updates all keys in one opening of the
+    database file under the exclusive lock. The readers open the database file
+    with the read-only flag under the shared lock, so they do not block each
+    other.
+
+    :param path: A path of the store that keep the database file.
+    :param compress: A compress type, it does not use on this store because the
+        values are small encoded binary.
+    """
+
+    filename: ClassVar[str] = "store.dbm"
+    prefix: ClassVar[str] = "file:"
+
+    # NOTE: The dbm modules do not support the concurrent writer, so the
+    #   writers of the same database file on this process share its lock, and
+    #   they also hold the exclusive file lock of this database for the other
+    #   processes.
+    __locks: ClassVar[dict[str, threading.RLock]] = {}
+    __locks_guard: ClassVar[threading.Lock] = threading.Lock()
+
+    @property
+    def db(self) -> Path:
+        """Return the database file path of this store.
+
+        :rtype: Path
+        """
+        return self.path / self.filename
+
+    @property
+    def lock(self) -> threading.RLock:
+        """Return the process lock of the database file of this store.
+
+        :rtype: threading.RLock
+        """
+        key: str = str(self.db.resolve())
+        with self.__locks_guard:
+            return self.__locks.setdefault(key, threading.RLock())
+
+    @contextmanager
+    def open(self, flag: str = "c") -> Iterator[Any]:
+        """Open the database file with the lock. The read-only flag, ``r``,
+        holds only the shared file lock, and it returns an empty mapping if the
+        database file does not exist.
+
+        :param flag: A flag of the ``dbm.open`` function.
+        :rtype: Iterator[Any]
+        """
+        shared: bool = flag == "r"
+
+        # NOTE: The reader still holds the process lock on the platform that
+        #   does not support the file lock.
+        guard: Any = nullcontext() if shared and fcntl else self.lock
+        with guard, lock_file(self.db, shared=shared):
+            if shared and not dbm.whichdb(str(self.db)):
+                yield {}
+                return
+            with dbm.open(str(self.db), flag) as db:
+                yield db
+
+    @staticmethod
+    def encode(data: Any) -> bytes:
+        """Return the encoded binary of data with a tag of its encoder.
+
+        :rtype: bytes
+        """
+        if msgpack is not None:
+            return b"p" + msgpack.packb(data)
+        return b"j" + json.dumps(data, default=str).encode("utf-8")
+
+    @staticmethod
+    def decode(value: bytes) -> Any:
+        """Return the data from the encoded binary with a tag of its encoder.
+
+        :rtype: Any
+        """
+        if value[:1] == b"p":
+            if msgpack is None:  # pragma: no cov
+                raise ImportError(
+                    "Decode the dbm value need `msgpack` package, so, please "
+                    "install it by `pip install msgpack`"
+                )
+            return msgpack.unpackb(value[1:])
+        return json.loads(value[1:])
+
+    def __read(self, db: Any, key: str) -> Optional[Any]:
+        return None if (value := db.get(key)) is None else self.decode(value)
+
+    def __resolve(self, db: Any, data: AnyData) -> AnyData:
+        """Return the full data of a delta data by applying its chain of parent
+        documents on this store.
+        """
+        chain: list[dict[str, Any]] = []
+        parents: set[str] = set()
+        while isinstance(data, dict) and DELTA_KEY in data:
+            chain.append(data)
+            if (parent := data[DELTA_KEY]["parent"]) in parents:
+                return None
+            parents.add(parent)
+            if (data := self.__read(db, f"{self.prefix}{parent}")) is None:
+                return None
+        for delta in reversed(chain):
+            data = json_patch(data, delta[DELTA_KEY]["ops"])
+        return data
+
+    def __write(self, db: Any, key: str, data: AnyData) -> None:
+        """Write a document and update the lookup keys of its alias name."""
+        db[f"{self.prefix}{key}"] = self.encode(data)
+        if not isinstance(data, dict) or not (name := data.get("alias")):
+            return
+        if (full := self.__resolve(db, data)) is None:
+            logging.warning(f"Does not resolve the delta data of {key!r}.")
+            return
+
+        record: list[Any] = [key, full]
+        if (version := data.get(VERSION_KEY)) is not None:
+            db[f"{name}@{version}"] = self.encode(record)
+        latest: Optional[list[Any]] = self.__read(db, name)
+        if latest is None or (
+            str(full.get(UPDATE_KEY, "")) >= str(latest[1].get(UPDATE_KEY, ""))
+        ):
+            db[name] = self.encode(record)
+
+    def __drop(self, db: Any, key: str) -> None:
+        """Remove a document and the lookup keys that point to it. If it was the
+        latest data of its alias name, the next latest document will replace.
+        """
+        if (data := self.__read(db, f"{self.prefix}{key}")) is None:
+            return
+        del db[f"{self.prefix}{key}"]
+        if not isinstance(data, dict) or not (name := data.get("alias")):
+            return
+
+        version_key: str = f"{name}@{data.get(VERSION_KEY)}"
+        if (record := self.__read(db, version_key)) and record[0] == key:
+            del db[version_key]
+        if (record := self.__read(db, name)) and record[0] == key:
+            del db[name]
+            for other in self.__keys(db):
+                doc: AnyData = self.__read(db, f"{self.prefix}{other}")
+                if isinstance(doc, dict) and doc.get("alias") == name:
+                    self.__write(db, other, doc)
+
+    def __keys(self, db: Any) -> list[str]:
+        return sorted(
+            k.decode("utf-8")[len(self.prefix) :]
+            for k in db.keys()
+            if k.startswith(self.prefix.encode("utf-8"))
+        )
+
+    @instrument("DbmStore.get", path=lambda self: self.db)
+    def get(
+        self,
+        name: str,
+        *,
+        order: int = 1,
+        version: Optional[str] = None,
+    ) -> AnyData:
+        """Return the full data of a name with one lookup of its latest key or
+        its version key. If the order more than 1, it will scan all documents
+        of this name and order them by their update timestamp.
+
+        :param name: An alias name of the document.
+        :param order: An order number of the latest document.
+        :param version: A version value that want to get.
+
+        :rtype: AnyData
+        """
+        with self.open("r") as db:
+            if order <= 1:
+                record: Optional[list[Any]] = self.__read(
+                    db, name if version is None else f"{name}@{version}"
+                )
+                return {} if record is None else record[1]
+
+            rs: list[AnyData] = sorted(
+                (
+                    data
+                    for key in self.__keys(db)
+                    if isinstance(
+                        data := self.__resolve(
+                            db, self.__read(db, f"{self.prefix}{key}")
+                        ),
+                        dict,
+                    )
+                    and data.get("alias") == name
+                    and (version is None or data.get(VERSION_KEY) == version)
+                ),
+                key=lambda x: str(x.get(UPDATE_KEY, "")),
+            )
+        return rs[-order] if order <= len(rs) else {}
+
+    def ls(
+        self,
+        path: Optional[str] = None,
+        name: Optional[str] = None,
+        *,
+        excluded: Optional[Union[list[str], tuple[str, ...]]] = None,
+    ) -> Iterator[Path]:
+        """Return paths of all documents in this store. It does not have any
+        file on these paths, so it should read them with the ``load`` method.
+
+        :param path: A specific child path that want to list.
+        :param name: A filename pattern that want to list.
+        :param excluded: A list of excluded filenames.
+        :rtype: Iterator[Path]
+        """
+        prefix: str = f"{self.key(path)}/" if path else ""
+        with self.open("r") as db:
+            keys: list[str] = self.__keys(db)
+        for key in keys:
+            if key.startswith(prefix) and match_key(key, name, excluded):
+                yield self.path / key
+
+    def exists(self, path: Union[str, Path]) -> bool:
+        with self.open("r") as db:
+            return f"{self.prefix}{self.key(path)}" in db
+
+    def remove(self, path: Union[str, Path]) -> None:
+        with self.open() as db:
+            self.__drop(db, self.key(path))
+
+    def move(self, path: Union[str, Path], dest: Path) -> None:
+        """Export a document in this store to the destination file with Json
+        format.
+
+        :param path: A child path that exists in this store.
+        :param dest: A destination path.
+        """
+        if not dest.parent.exists():
+            dest.parent.mkdir(parents=True, exist_ok=True)
+        JsonFl(dest).write(self.load(path))
+
+    def load(
+        self, path: Union[str, Path], *, default: AnyData = None
+    ) -> AnyData:
+        """Return the document of a path, default empty dict.
+
+        :rtype: AnyData
+        """
+        with self.open("r") as db:
+            data: Optional[AnyData] = self.__read(
+                db, f"{self.prefix}{self.key(path)}"
+            )
+        if data is None:
+            return default if (default is not None) else {}
+        return data
+
+    def save(
+        self,
+        path: Union[str, Path],
+        data: AnyData,
+        *,
+        merge: bool = False,
+    ) -> None:
+        """Write a document to a path and update the lookup keys of its alias
+        name. If merge is true, it will merge the incoming data with the current
+        document before writing.
+
+        :param path:
+        :param data:
+        :param merge:
+        """
+        key: str = self.key(path)
+        with self.open() as db:
+            if merge and (current := self.__read(db, f"{self.prefix}{key}")):
+                if isinstance(current, list):
+                    (
+                        current.append(data)
+                        if isinstance(data, dict)
+                        else current.extend(data)
+                    )
+                    data = current
+                else:
+                    data = current | data
+            self.__write(db, key, data)
+        logging.debug(f"Start writing data to {key} on {self.db}")
+
+    def delete(self, path: Union[str, Path], name: str) -> None:
+        """Remove data by name inside the document of a path.
+
+        :param path:
+        :param name:
+        """
+        key: str = self.key(path)
+        with self.open() as db:
+            if current := self.__read(db, f"{self.prefix}{key}"):
+                current.pop(name, None)
+                self.__write(db, key, current)
+
+    def create(
+        self, path: Union[str, Path], *, initial_data: AnyData = None
+    ) -> None:
+        """Create a document with an initial data if it does not exist.
+
+        :param path:
+        :param initial_data:
+        :type initial_data: AnyData
+        """
+        key: str = self.key(path)
+        with self.open() as db:
+            if f"{self.prefix}{key}" not in db:
+                self.__write(db, key, initial_data or {})
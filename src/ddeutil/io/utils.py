@@ -5,11 +5,20 @@
 # ------------------------------------------------------------------------------
 from __future__ import annotations
 
+import copy
+import errno
 import os
 import shutil
-from collections.abc import Iterator
+import threading
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
 from pathlib import Path
-from typing import IO, AnyStr, Callable, Optional, TypeVar, Union
+from typing import IO, Any, AnyStr, Callable, Optional, TypeVar, Union
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cov
+    fcntl = None
 
 from ddeutil.core import convert, import_string
 
@@ -55,6 +64,216 @@ def touch(path: Union[str, Path], times=None) -> None:  # pragma: no cov
         file_handle.close()
 
 
+def fsync_dir(path: Union[str, Path]) -> None:
+    """Flush the entries of a directory to the disk. It does not do anything
+    on the platform that can not open a directory such as Windows.
+
+    :param path: A directory path that want to flush.
+    """
+    try:
+        fd: int = os.open(path, os.O_RDONLY)
+    except OSError:  # pragma: no cov
+        return
+    try:
+        os.fsync(fd)
+    except OSError:  # pragma: no cov
+        pass
+    finally:
+        os.close(fd)
+
+
+_locks: threading.local = threading.local()
+
+
+@contextmanager
+def lock_file(
+    path: Union[str, Path], *, shared: bool = False
+) -> Iterator[None]:
+    """Hold the advisory lock of a file path with the ``fcntl.flock`` function,
+    the shared lock for readers, or the exclusive lock for writers. It locks
+    the file descriptor of the parent dir of this path (or this path itself if
+    it is a dir), so it does not create any lock file, it still works after
+    this path was replaced, and all files in the same dir share one lock. It
+    does not do anything on the platform that does not have the ``fcntl``
+    package such as Windows, or if the dir does not exist yet.
+
+        This lock is reentrant on the same thread with the same or the weaker
+    mode. It does not upgrade the shared lock that this thread already holds to
+    the exclusive lock, because the ``flock`` function converts a lock with
+    releasing it first, so the other process can take this lock between them.
+
+    :param path: A file path that want to lock.
+    :param shared: A shared lock flag.
+
+    :raise RuntimeError: If this thread already holds the shared lock of this
+        path and it wants the exclusive lock.
+
+    :rtype: Iterator[None]
+    """
+    if fcntl is None:  # pragma: no cov
+        yield
+        return
+
+    lock: Path = Path(path).resolve()
+    if not lock.is_dir():
+        lock: Path = lock.parent
+    held: dict[Path, list[Any]] = getattr(_locks, "held", None)
+    if held is None:
+        held = _locks.held = {}
+
+    # NOTE: The lock was already held by this thread.
+    if (record := held.get(lock)) is not None:
+        if record[2] and not shared:
+            raise RuntimeError(
+                f"Can not upgrade the shared lock of {lock} to the exclusive "
+                f"lock on the same thread."
+            )
+        record[1] += 1
+        try:
+            yield
+        finally:
+            record[1] -= 1
+        return
+
+    try:
+        fd: int = os.open(lock, os.O_RDONLY)
+    except FileNotFoundError:
+        yield
+        return
+    try:
+        fcntl.flock(fd, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        held[lock] = [fd, 1, shared]
+        yield
+    finally:
+        held.pop(lock, None)
+        os.close(fd)
+
+
+def move_files(
+    pairs: Iterable[tuple[Union[str, Path], Union[str, Path]]],
+    *,
+    fsync: bool = True,
+) -> list[Path]:
+    """Move many files with the atomic ``os.replace`` function that does only
+    change the metadata of the filesystem. If the source and destination paths
+    do not live on the same device, it will fall back to copy and remove. The
+    destination directories will flush only once after all files were moved.
+
+    :param pairs: A pair of source and destination file paths.
+    :param fsync: A flag that flush the destination directories after moving.
+
+    :rtype: list[Path]
+    :returns: A list of destination paths that was moved.
+    """
+    dirs: set[Path] = set()
+    rs: list[Path] = []
+    for src, dest in pairs:
+        dest: Path = Path(dest)
+        if dest.parent not in dirs:
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            dirs.add(dest.parent)
+        try:
+            os.replace(src, dest)
+        except OSError as err:
+            if err.errno != errno.EXDEV:
+                raise
+            shutil.copy2(src, dest)
+            os.remove(src)
+        rs.append(dest)
+
+    if fsync:
+        for _dir in dirs:
+            fsync_dir(_dir)
+    return rs
+
+
+def _pointer(path: str, key: Union[str, int]) -> str:
+    return f"{path}/{str(key).replace('~', '~0').replace('/', '~1')}"
+
+
+def json_diff(
+    source: Any,
+    target: Any,
+    path: str = "",
+) -> list[dict[str, Any]]:
+    """Return a list of JSON-patch style operations (add, remove, and replace)
+    that change a source data to a target data. It compares dict values
+    recursively and replaces other values as a whole.
+
+    :param source: A source data.
+    :param target: A target data.
+    :param path: A JSON pointer prefix of these values.
+
+    :rtype: list[dict[str, Any]]
+
+    Examples:
+        >>> json_diff({"foo": 1, "bar": 2}, {"foo": 1, "baz": 3})
+        [{'op': 'remove', 'path': '/bar'}, {'op': 'add', 'path': '/baz', \
+'value': 3}]
+    """
+    if isinstance(source, dict) and isinstance(target, dict):
+        rs: list[dict[str, Any]] = [
+            {"op": "remove", "path": _pointer(path, k)}
+            for k in source
+            if k not in target
+        ]
+        for k in target:
+            if k not in source:
+                rs.append(
+                    {"op": "add", "path": _pointer(path, k), "value": target[k]}
+                )
+            elif source[k] != target[k] or type(source[k]) is not type(
+                target[k]
+            ):
+                rs.extend(json_diff(source[k], target[k], _pointer(path, k)))
+        return rs
+    elif source == target and type(source) is type(target):
+        return []
+    return [{"op": "replace", "path": path, "value": target}]
+
+
+def json_patch(data: Any, operations: list[dict[str, Any]]) -> Any:
+    """Apply a list of JSON-patch style operations that was generated by the
+    ``json_diff`` function to a data. It does not change an input data.
+
+    :param data: A data that want to apply operations.
+    :param operations: A list of JSON-patch style operations.
+
+    :rtype: Any
+
+    Examples:
+        >>> json_patch({"foo": {"bar": 1}}, [
+        ...     {"op": "replace", "path": "/foo/bar", "value": 2},
+        ... ])
+        {'foo': {'bar': 2}}
+    """
+    rs: Any = copy.deepcopy(data)
+    for operation in operations:
+        if not (path := operation["path"]):
+            rs = copy.deepcopy(operation["value"])
+            continue
+
+        keys: list[str] = [
+            k.replace("~1", "/").replace("~0", "~") for k in path.split("/")[1:]
+        ]
+        parent: Any = rs
+        for k in keys[:-1]:
+            parent = parent[int(k) if isinstance(parent, list) else k]
+
+        key: Union[str, int] = (
+            int(keys[-1]) if isinstance(parent, list) else keys[-1]
+        )
+        if operation["op"] == "remove":
+            del parent[key]
+        elif operation["op"] in ("add", "replace"):
+            parent[key] = copy.deepcopy(operation["value"])
+        else:
+            raise ValueError(
+                f"JSON patch operation {operation['op']!r} does not support."
+            )
+    return rs
+
+
 def template_secret(value: T, secrets: dict[str, str]) -> T:
     """Map the secret value to an any input data.
 
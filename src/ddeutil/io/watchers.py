@@ -0,0 +1,289 @@
+# ------------------------------------------------------------------------------
+# Copyright (c) 2022 Korawich Anuttra. All rights reserved.
+# Licensed under the MIT License. See LICENSE in the project root for
+# license information.
+# ------------------------------------------------------------------------------
+"""File-change watcher object that watches all files in a directory and calls
+a callback with the changed file paths. It uses the Linux ``inotify`` API with
+the ``ctypes`` package, and it falls back to polling the stat signatures of all
+files on the other platforms.
+
+    The change of any file will confirm with its stat signature (modified
+time, size, and inode number), so the file that was touched by many events
+will report only once, and a burst of events will debounce to one callback.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import select
+import stat
+import struct
+import threading
+from collections.abc import Iterator
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, ClassVar, Optional, Union
+
+from .__type import TupleStr
+
+logger = logging.getLogger("ddeutil.io")
+
+Signature = tuple[int, int, int]
+
+# NOTE: The inotify constants from the `sys/inotify.h` header.
+IN_ATTRIB: int = 0x00000004
+IN_CLOSE_WRITE: int = 0x00000008
+IN_MOVED_FROM: int = 0x00000040
+IN_MOVED_TO: int = 0x00000080
+IN_CREATE: int = 0x00000100
+IN_DELETE: int = 0x00000200
+IN_Q_OVERFLOW: int = 0x00004000
+IN_IGNORED: int = 0x00008000
+IN_ISDIR: int = 0x40000000
+IN_NONBLOCK: int = 0o4000
+IN_CLOEXEC: int = 0o2000000
+IN_MASK: int = (
+    IN_ATTRIB
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+)
+IN_EVENT: struct.Struct = struct.Struct("iIII")
+
+__all__: TupleStr = (
+    "Watcher",
+    "signature",
+)
+
+
+@lru_cache(maxsize=1)
+def inotify() -> Optional[Any]:
+    """Return the C library that has the inotify functions, or None if this
+    platform does not support it.
+
+    :rtype: Optional[Any]
+    """
+    try:
+        import ctypes
+
+        libc = ctypes.CDLL(None, use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [
+            ctypes.c_int,
+            ctypes.c_char_p,
+            ctypes.c_uint32,
+        ]
+        return libc
+    except (ImportError, OSError, AttributeError, TypeError):  # pragma: no cov
+        return None
+
+
+def signature(path: Union[str, Path]) -> Optional[Signature]:
+    """Return the stat signature of a regular file, or None if it does not
+    exist.
+
+    :param path: A file path.
+    :rtype: Optional[Signature]
+    """
+    try:
+        st: os.stat_result = os.stat(path)
+    except OSError:
+        return None
+    if not stat.S_ISREG(st.st_mode):
+        return None
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+class Watcher:
+    """Watcher object that watches all files in a directory with a background
+    thread, and it calls a callback with a set of changed file paths. It skips
+    the hidden files such as the temporary files of the atomic writing.
+
+    :param path: A directory path that want to watch.
+    :param callback: A callback that receive a set of changed file paths.
+    :param polling: A polling flag that force to use the polling mode.
+
+    Examples:
+        >>> with Watcher("./conf", print):
+        ...     ...
+    """
+
+    # NOTE: The polling interval, and the quiet time that a burst of events
+    #   should wait before calling the callback.
+    interval: ClassVar[float] = 0.5
+    debounce: ClassVar[float] = 0.05
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        callback: Callable[[set[Path]], None],
+        *,
+        polling: bool = False,
+    ) -> None:
+        self.path: Path = Path(path) if isinstance(path, str) else path
+        self.callback: Callable[[set[Path]], None] = callback
+        self.polling: bool = polling or inotify() is None
+        self.signatures: dict[Path, Signature] = {}
+        self.__fd: Optional[int] = None
+        self.__wds: dict[int, Path] = {}
+        self.__stop: threading.Event = threading.Event()
+        self.__thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> Watcher:
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+
+    @property
+    def alive(self) -> bool:
+        return self.__thread is not None and self.__thread.is_alive()
+
+    def scan(self, path: Optional[Path] = None) -> dict[Path, Signature]:
+        """Return the stat signatures of all files in a directory.
+
+        :param path: A directory path, default is the watching path.
+        :rtype: dict[Path, Signature]
+        """
+        rs: dict[Path, Signature] = {}
+        for root, _, files in os.walk(path or self.path):
+            for file in files:
+                if file.startswith("."):
+                    continue
+                if (sig := signature(p := Path(root) / file)) is not None:
+                    rs[p] = sig
+        return rs
+
+    def start(self) -> Watcher:
+        """Start watching with the background thread. It keeps the signatures
+        of all files before starting, so it will not call the callback with the
+        existing files.
+
+        :rtype: Watcher
+        """
+        if self.alive:
+            return self
+
+        self.__stop.clear()
+        if not self.polling:
+            self.__fd = inotify().inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+            if self.__fd < 0:  # pragma: no cov
+                logger.warning("Cannot init inotify, use the polling mode.")
+                self.__fd, self.polling = None, True
+            else:
+                for root, _, _ in os.walk(self.path):
+                    self.__add_watch(Path(root))
+        self.signatures = self.scan()
+        self.__thread = threading.Thread(
+            target=self.run, name="ddeutil-io-watcher", daemon=True
+        )
+        self.__thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop watching and wait the background thread."""
+        self.__stop.set()
+        if self.__thread is not None:
+            self.__thread.join()
+            self.__thread = None
+
+    def run(self) -> None:
+        """Watch loop that collects the changed files until it does not have
+        any change within the debounce time, and calls the callback.
+        """
+        try:
+            while not self.__stop.is_set():
+                if not (changed := self.changes(self.interval)):
+                    continue
+                while more := self.changes(self.debounce):
+                    changed |= more
+                try:
+                    self.callback(changed)
+                except Exception as err:
+                    logger.exception(f"Watcher callback was failed: {err}")
+        finally:
+            if self.__fd is not None:
+                os.close(self.__fd)
+                self.__fd, self.__wds = None, {}
+
+    def changes(self, timeout: float) -> set[Path]:
+        """Wait the file events until timeout, and return a set of changed file
+        paths that was confirmed by their stat signatures.
+
+        :param timeout: A timeout in seconds.
+        :rtype: set[Path]
+        """
+        if self.polling:
+            if self.__stop.wait(timeout):
+                return set()
+            current: dict[Path, Signature] = self.scan()
+            changed: set[Path] = {
+                p
+                for p in current.keys() | self.signatures.keys()
+                if current.get(p) != self.signatures.get(p)
+            }
+            self.signatures = current
+            return changed
+
+        candidates: set[Path] = set()
+        for path, mask in self.__events(timeout):
+            if mask & IN_Q_OVERFLOW:
+                candidates |= self.scan().keys() | self.signatures.keys()
+            elif mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    for root, _, _ in os.walk(path):
+                        self.__add_watch(Path(root))
+                    candidates |= self.scan(path).keys()
+                elif mask & (IN_DELETE | IN_MOVED_FROM):
+                    candidates |= {
+                        p for p in self.signatures if path in p.parents
+                    }
+            elif not path.name.startswith("."):
+                candidates.add(path)
+
+        changed: set[Path] = set()
+        for path in candidates:
+            if (sig := signature(path)) == self.signatures.get(path):
+                continue
+            changed.add(path)
+            if sig is None:
+                self.signatures.pop(path, None)
+            else:
+                self.signatures[path] = sig
+        return changed
+
+    def __add_watch(self, path: Path) -> None:
+        wd: int = inotify().inotify_add_watch(
+            self.__fd, os.fsencode(path), IN_MASK
+        )
+        if wd >= 0:
+            self.__wds[wd] = path
+
+    def __events(self, timeout: float) -> Iterator[tuple[Path, int]]:
+        # NOTE: Wake up with the polling interval at least, so the stop event
+        #   will not wait the file event forever.
+        if not select.select([self.__fd], [], [], timeout)[0]:
+            return
+        try:
+            buf: bytes = os.read(self.__fd, 65536)
+        except BlockingIOError:  # pragma: no cov
+            return
+
+        offset: int = 0
+        while offset < len(buf):
+            wd, mask, _, length = IN_EVENT.unpack_from(buf, offset)
+            name: bytes = buf[
+                offset + IN_EVENT.size : offset + IN_EVENT.size + length
+            ].rstrip(b"\0")
+            offset += IN_EVENT.size + length
+            if mask & IN_IGNORED:
+                self.__wds.pop(wd, None)
+                continue
+            elif (base := self.__wds.get(wd)) is None:
+                if mask & IN_Q_OVERFLOW:
+                    yield self.path, mask
+                continue
+            yield (base / os.fsdecode(name) if name else base), mask
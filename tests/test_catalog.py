@@ -0,0 +1,158 @@
+import shutil
+import sqlite3
+from collections.abc import Iterator
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+import yaml
+from ddeutil.io.catalog import JsonCatalog, SqliteCatalog
+from ddeutil.io.config import Params
+from ddeutil.io.exceptions import RegisterArgumentError
+from ddeutil.io.register import Register
+
+
+@pytest.fixture(scope="module")
+def target_path(test_path) -> Iterator[Path]:
+    tgt_path: Path = test_path / "catalog_temp"
+    tgt_path.mkdir(exist_ok=True)
+    (tgt_path / "conf/demo").mkdir(parents=True, exist_ok=True)
+    with open(tgt_path / "conf/demo/test_01_conn.yaml", mode="w") as f:
+        yaml.dump(
+            {
+                "conn_local_file": {
+                    "type": "conn.LocalFileStorage",
+                    "endpoint": "file:///${APP_PATH}/tests/examples/dummy",
+                },
+                "conn_sftp": {"type": "conn.SFTP", "host": "localhost"},
+            },
+            f,
+        )
+    yield tgt_path
+    shutil.rmtree(tgt_path)
+
+
+@pytest.fixture(scope="module")
+def params(target_path) -> Params:
+    return Params(
+        **{
+            "paths": {"root": target_path},
+            "stages": {
+                "raw": {"format": "{naming:%s}.{timestamp:%Y%m%d_%H%M%S}"},
+                "persisted": {"format": "{naming:%s}.{version:v%m.%n.%c}"},
+            },
+        }
+    )
+
+
+class SqliteRegister(Register):
+    catalog = SqliteCatalog
+
+
+def test_catalog_json(target_path):
+    catalog = JsonCatalog(target_path / "json_catalog")
+    assert catalog.load("demo", "conn", "raw") == {}
+
+    catalog.save("demo", "conn", "raw", {"__version": "v0.0.1"})
+    assert catalog.file("demo", "conn", "raw").exists()
+    assert catalog.load("demo", "conn", "raw") == {"__version": "v0.0.1"}
+    assert list(catalog.records(["demo"])) == [
+        (("demo", "conn", "raw"), {"__version": "v0.0.1"})
+    ]
+
+    catalog.delete("demo", "conn", "raw")
+    catalog.delete("demo", "conn", "raw")
+    assert catalog.load("demo", "conn", "raw") == {}
+
+
+def test_catalog_sqlite(target_path):
+    catalog = SqliteCatalog(target_path / "sqlite_catalog")
+    assert catalog.load("demo", "conn", "raw") == {}
+
+    catalog.save_many(
+        [
+            (
+                ("demo", "conn", "raw"),
+                {"__updt": "2024-01-01 00:00:00", "__version": "v0.0.1"},
+            ),
+            (
+                ("demo", "conn", "persisted"),
+                {"__updt": "2024-01-02 00:00:00", "__version": "v0.0.2"},
+            ),
+            (
+                ("", "other", "raw"),
+                {"__updt": "2023-12-31 00:00:00", "__version": "v0.1.0"},
+            ),
+        ]
+    )
+    assert catalog.load("demo", "conn", "raw")["__version"] == "v0.0.1"
+    assert catalog.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert catalog.changed_since(datetime(2024, 1, 1)) == [
+        ("demo", "conn", "raw"),
+        ("demo", "conn", "persisted"),
+    ]
+    assert catalog.changed_since(datetime(2024, 1, 1), stage="raw") == [
+        ("demo", "conn", "raw"),
+    ]
+    assert catalog.latest_versions() == {
+        "demo:conn": "v0.0.2",
+        "other": "v0.1.0",
+    }
+    assert catalog.latest_versions(stage="raw") == {
+        "demo:conn": "v0.0.1",
+        "other": "v0.1.0",
+    }
+
+    catalog.delete("demo", "conn", "raw")
+    assert catalog.load("demo", "conn", "raw") == {}
+
+    conn = catalog.conn
+    SqliteCatalog.close_all()
+    with pytest.raises(sqlite3.ProgrammingError):
+        conn.execute("SELECT 1")
+    assert catalog.conn is not conn
+    catalog.close()
+
+
+def test_catalog_register(params, target_path):
+    with patch(
+        target="ddeutil.io.register.get_date",
+        return_value=datetime(2024, 1, 1, 1),
+    ):
+        Register(name="demo:conn_local_file", params=params).deploy()
+
+    # NOTE: Migrate the Json metadata files to the SQLite catalog.
+    with pytest.raises(RegisterArgumentError):
+        Register.migrate_catalog(params)
+    assert SqliteRegister.migrate_catalog(params) == 3
+
+    catalog = SqliteRegister.get_catalog(params)
+    assert catalog.load("demo", "conn_local_file", "base") == (
+        JsonCatalog(target_path / "data/__METADATA").load(
+            "demo", "conn_local_file", "base"
+        )
+    )
+
+    register = SqliteRegister(name="demo:conn_sftp", params=params)
+    assert register.changed == 99
+    register.deploy()
+    assert SqliteRegister(name="demo:conn_sftp", params=params).changed == 0
+    assert catalog.load("demo", "conn_sftp", "persisted")
+    assert not (
+        target_path / "data/__METADATA/democonn_sftp.base.json"
+    ).exists()
+
+    SqliteRegister.reset(name="demo:conn_sftp", params=params)
+    assert catalog.load("demo", "conn_sftp", "persisted") == {}
+
+    # NOTE: The deploy worker closes its catalog connection after each name.
+    with patch.object(
+        SqliteCatalog, "close_all", wraps=SqliteCatalog.close_all
+    ) as close_all:
+        rs = SqliteRegister.deploy_many(
+            ["demo:conn_sftp", "demo:conn_local_file"], params=params
+        )
+    assert close_all.call_count == 2
+    assert rs["demo:conn_sftp"].status == "moved"
+    assert catalog.load("demo", "conn_sftp", "persisted")
@@ -4,7 +4,7 @@ from pathlib import Path
 from textwrap import dedent
 
 import pytest
-from ddeutil.io.config import Params, Paths, Rule, Stage
+from ddeutil.io.config import Params, Paths, Rule, Stage, format_names
 from ddeutil.io.exceptions import ConfigArgumentError
 
 
@@ -65,6 +65,8 @@ def test_config_rule():
         "timestamp": {},
         "excluded": [],
         "compress": None,
+        "delta": 0,
+        "generations": 0,
     } == asdict(Rule())
 
 
@@ -155,6 +157,8 @@ def test_config_params():
                     "timestamp": {},
                     "excluded": [],
                     "compress": None,
+                    "delta": 0,
+                    "generations": 0,
                 },
                 "layer": 1,
             },
@@ -165,6 +169,8 @@ def test_config_params():
                     "timestamp": {},
                     "excluded": [],
                     "compress": None,
+                    "delta": 0,
+                    "generations": 0,
                 },
                 "layer": 2,
             },
@@ -175,6 +181,8 @@ def test_config_params():
                     "timestamp": {},
                     "excluded": [],
                     "compress": None,
+                    "delta": 0,
+                    "generations": 0,
                 },
                 "layer": 3,
             },
@@ -210,6 +218,8 @@ def test_config_params_toml(toml_conf_path):
                     "timestamp": {},
                     "excluded": [],
                     "compress": None,
+                    "delta": 0,
+                    "generations": 0,
                 },
                 "layer": 1,
             },
@@ -220,6 +230,8 @@ def test_config_params_toml(toml_conf_path):
                     "timestamp": {},
                     "excluded": [],
                     "compress": None,
+                    "delta": 0,
+                    "generations": 0,
                 },
                 "layer": 2,
             },
@@ -243,6 +255,8 @@ def test_config_params_yaml(yaml_conf_path):
                     "timestamp": {},
                     "excluded": [],
                     "compress": None,
+                    "delta": 0,
+                    "generations": 0,
                 },
                 "layer": 1,
             },
@@ -253,6 +267,8 @@ def test_config_params_yaml(yaml_conf_path):
                     "timestamp": {},
                     "excluded": [],
                     "compress": None,
+                    "delta": 0,
+                    "generations": 0,
                 },
                 "layer": 2,
             },
@@ -263,3 +279,14 @@ def test_config_params_yaml(yaml_conf_path):
             "root": Path("."),
         },
     } == asdict(params)
+
+
+def test_config_format_names():
+    assert format_names("{naming:%s}.{timestamp:%Y%m%d}") == (
+        "naming",
+        "timestamp",
+    )
+    assert format_names("{naming:%s}.{timestamp:%Y%m%d}") is format_names(
+        "{naming:%s}.{timestamp:%Y%m%d}"
+    )
+    assert format_names("demo") == ()
@@ -1,9 +1,11 @@
 import shutil
+import zipfile
 from collections.abc import Generator
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
-from ddeutil.io.dirs import Dir
+from ddeutil.io.dirs import Dir, _compress_member
 
 
 @pytest.fixture(scope="module")
@@ -68,3 +70,136 @@ def test_open_dir_common_tar(target_path, data_path):
         "test_file.json",
         "test_file_2.json",
     } == {f.name for f in (target_path / "test_common_tar_extract").rglob("*")}
+
+
+def test_open_dir_pack_zip(target_path, data_path):
+    with open(data_path / ".ignore", mode="w") as f:
+        f.write("*_2.json\n")
+
+    members = Dir(
+        path=target_path / "test_pack_zip.zip",
+        compress="zip:zlib",
+    ).pack(data_path, workers=2, ignore_file=".ignore")
+    assert members == ["test_file.json"]
+
+    members = Dir(
+        path=target_path / "test_pack_zip.zip",
+        compress="zip:zlib",
+    ).pack(data_path, workers=2)
+    assert members == [".ignore", "test_file.json", "test_file_2.json"]
+
+    with zipfile.ZipFile(target_path / "test_pack_zip.zip") as z:
+        assert z.testzip() is None
+        assert z.namelist() == members
+        assert z.read("test_file.json") == b'{"key": "value"}'
+
+    (data_path / ".ignore").unlink()
+
+
+@pytest.mark.parametrize("compress", ["zip", "zip:bz2", "zip:lzma", "tar:xz"])
+def test_open_dir_pack_deterministic(target_path, data_path, compress):
+    ext: str = compress.replace(":", ".")
+    for name in ("first", "second"):
+        Dir(
+            path=target_path / f"test_pack_{name}.{ext}",
+            compress=compress,
+        ).pack(data_path, workers=4)
+
+    with Dir(
+        path=target_path / f"test_pack_first.{ext}",
+        compress=compress,
+    ).open(mode="r") as d:
+        d.safe_extract(target_path / f"test_pack_{ext}_extract")
+
+    assert (
+        target_path / f"test_pack_{ext}_extract/test_file_2.json"
+    ).read_text() == '{"foo": "bar"}'
+
+    if compress.startswith("zip"):
+        assert (target_path / f"test_pack_first.{ext}").read_bytes() == (
+            target_path / f"test_pack_second.{ext}"
+        ).read_bytes()
+
+
+def test_open_dir_pack_incremental(target_path, data_path):
+    archive: Dir = Dir(
+        path=target_path / "test_pack_incremental.zip",
+        compress="zip:zlib",
+    )
+    archive.pack(data_path, incremental=True)
+    assert archive.manifest_path.exists()
+    assert set(archive.read_manifest()) == {
+        "test_file.json",
+        "test_file_2.json",
+    }
+
+    mtime: int = archive.path.stat().st_mtime_ns
+    with patch("ddeutil.io.dirs._compress_member", wraps=_compress_member) as m:
+        archive.pack(data_path, incremental=True)
+        assert m.call_count == 0
+    assert archive.path.stat().st_mtime_ns == mtime
+
+    with open(data_path / "test_file_3.json", mode="w") as f:
+        f.write('{"foo": "baz"}')
+
+    with patch("ddeutil.io.dirs._compress_member", wraps=_compress_member) as m:
+        archive.pack(data_path, incremental=True)
+        assert m.call_count == 1
+
+    with zipfile.ZipFile(archive.path) as z:
+        assert z.testzip() is None
+        assert z.read("test_file.json") == b'{"key": "value"}'
+        assert z.read("test_file_3.json") == b'{"foo": "baz"}'
+
+    # NOTE: The appending would duplicate the changed members.
+    with pytest.raises(ValueError):
+        archive.pack(data_path, mode="a", incremental=True)
+
+    (data_path / "test_file_3.json").unlink()
+
+
+def test_open_dir_pack_incremental_tar(target_path, data_path):
+    archive: Dir = Dir(
+        path=target_path / "test_pack_incremental.tar.gz",
+        compress="tar:gz",
+    )
+    archive.pack(data_path, incremental=True)
+    mtime: int = archive.path.stat().st_mtime_ns
+    archive.pack(data_path, incremental=True)
+    assert archive.path.stat().st_mtime_ns == mtime
+
+
+@pytest.mark.parametrize("compress", ["tar:gz", "tar:bz2", "tar:xz"])
+def test_open_dir_pack_index(target_path, data_path, compress):
+    ext: str = compress.replace(":", ".")
+    archive: Dir = Dir(
+        path=target_path / f"test_pack_index.{ext}",
+        compress=compress,
+    )
+    with patch.object(Dir, "index_block_size", 1):
+        archive.pack(data_path, index=True)
+
+    index = archive.read_index()
+    assert set(index["members"]) == {"test_file.json", "test_file_2.json"}
+    assert len(index["checkpoints"]) == 2
+
+    assert archive.read_member("test_file.json") == b'{"key": "value"}'
+    assert archive.read_member("test_file_2.json") == b'{"foo": "bar"}'
+
+    # NOTE: The archive with multiple compressed blocks still be a valid tar.
+    with archive.open(mode="r") as d:
+        assert d.getnames() == ["test_file.json", "test_file_2.json"]
+
+    # NOTE: Rewrite the archive without the index flag.
+    archive.pack(data_path)
+    assert archive.read_index() is None
+    assert archive.read_member("test_file_2.json") == b'{"foo": "bar"}'
+
+
+def test_open_dir_read_member_zip(target_path, data_path):
+    archive: Dir = Dir(
+        path=target_path / "test_read_member.zip",
+        compress="zip:zlib",
+    )
+    archive.pack(data_path, index=True)
+    assert archive.read_member("test_file.json") == b'{"key": "value"}'
@@ -193,3 +193,24 @@ def test_open_file_binary_bz2(target_path, encoding):
         rs = f.read()
 
     assert b"Write data with binary file in bz2 mode" == rs
+
+
+def test_open_file_atomic_write(target_path):
+    file = Fl(path=target_path / "test_common_file_atomic.text")
+    with file.open(mode="w") as f:
+        f.write("first")
+
+    # NOTE: The reader will see the previous file until the writer closes.
+    with pytest.raises(ValueError):
+        with file.open(mode="w") as f:
+            f.write("second")
+            assert file.path.read_text() == "first"
+            raise ValueError("Stop writing")
+
+    assert file.path.read_text() == "first"
+    assert not list(target_path.glob(".test_common_file_atomic.text.*.tmp"))
+
+    f = file.open(mode="w")
+    f.write("second")
+    f.close()
+    assert file.path.read_text() == "second"
@@ -0,0 +1,138 @@
+import shutil
+from collections.abc import Iterator
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+import yaml
+from ddeutil.io.config import Params
+from ddeutil.io.files import JsonFl, YamlEnvFl
+from ddeutil.io.hooks import (
+    Aggregator,
+    Record,
+    add_hook,
+    hooked,
+    hooks,
+    remove_hook,
+)
+from ddeutil.io.register import Register
+from ddeutil.io.stores import Store
+
+
+@pytest.fixture(scope="module")
+def target_path(test_path) -> Iterator[Path]:
+    tgt_path: Path = test_path / "hooks_temp"
+    (tgt_path / "conf/demo").mkdir(parents=True, exist_ok=True)
+    with open(tgt_path / "conf/demo/test_01_conn.yaml", mode="w") as f:
+        yaml.dump({"conn_hook": {"type": "conn.Dummy", "value": 1}}, f)
+    yield tgt_path
+    shutil.rmtree(tgt_path)
+
+
+def test_hooks_disabled(target_path):
+    assert hooks == []
+    records: list[Record] = []
+    add_hook(records.append)
+    add_hook(records.append)
+    remove_hook(records.append)
+    remove_hook(records.append)
+
+    Store(target_path / "conf/demo").get("conn_hook")
+    assert records == []
+
+
+def test_hooks_fl(target_path):
+    records: list[Record] = []
+    with hooked(records.append):
+        JsonFl(target_path / "test.json").write({"foo": "bar"})
+        assert YamlEnvFl(target_path / "conf/demo/test_01_conn.yaml").read()
+    assert hooks == []
+
+    operations = [r.operation for r in records]
+    assert operations == [
+        "Fl.open",
+        "JsonFl.write",
+        "Fl.open",
+        "EnvFl.search_env_replace",
+        "YamlEnvFl.read",
+    ]
+    assert records[1].path == str(target_path / "test.json")
+    assert records[1].size == (target_path / "test.json").stat().st_size
+    assert all(r.ms >= 0 for r in records)
+
+
+@patch(
+    target="ddeutil.io.register.get_date",
+    return_value=datetime(2024, 1, 1, 1),
+)
+def test_hooks_register(_, target_path):
+    params = Params(
+        **{
+            "paths": {"root": target_path},
+            "stages": {
+                "raw": {"format": "{naming:%s}.{timestamp:%Y%m%d_%H%M%S}"},
+            },
+        }
+    )
+    aggregator = Aggregator()
+    with hooked(aggregator):
+        Register(name="demo:conn_hook", params=params).deploy()
+
+    summary = aggregator.summary()
+    for operation in (
+        "Store.get",
+        "PathSearch.search",
+        "Register.load",
+        "Register.metadata",
+        "Register.compare_data",
+        "Register.deploy",
+        "JsonFl.write",
+    ):
+        assert summary[operation]["count"] >= 1
+    assert summary["Register.deploy"]["count"] == 1
+    assert summary["Register.load"]["misses"] >= 1
+    assert summary["JsonFl.write"]["bytes"] > 0
+    assert (
+        summary["Register.deploy"]["p50"]
+        == summary["Register.deploy"]["total_ms"]
+    )
+    assert "Register.deploy" in aggregator.report()
+
+    aggregator.clear()
+    assert aggregator.summary() == {}
+
+
+def test_aggregator():
+    aggregator = Aggregator()
+    for i in range(1, 101):
+        aggregator(Record("Fl.read", "a.json", float(i), size=10, hit=i > 50))
+    aggregator(Record('Op"quoted', None, 1.0))
+
+    assert aggregator.percentile("Fl.read", 0.5) == 50.0
+    assert aggregator.percentile("Fl.read", 0.9) == 90.0
+    assert aggregator.percentile("Fl.read", 0.99) == 99.0
+    assert aggregator.percentile("not_exists", 0.5) == 0.0
+    assert aggregator.summary()["Fl.read"] | {"total_ms": 0} == {
+        "count": 100,
+        "total_ms": 0,
+        "p50": 50.0,
+        "p90": 90.0,
+        "p99": 99.0,
+        "bytes": 1000,
+        "hits": 50,
+        "misses": 50,
+    }
+
+    text = aggregator.prometheus()
+    assert "# TYPE ddeutil_io_operation_seconds summary" in text
+    assert (
+        'ddeutil_io_operation_seconds{operation="Fl.read",quantile="0.9"} 0.09'
+        in text
+    )
+    assert 'ddeutil_io_operation_seconds_sum{operation="Fl.read"} 5.05' in text
+    assert 'ddeutil_io_operation_seconds_count{operation="Fl.read"} 100' in text
+    assert 'ddeutil_io_bytes_total{operation="Fl.read"} 1000' in text
+    assert 'ddeutil_io_cache_hits_total{operation="Fl.read"} 50' in text
+    assert 'operation="Op\\"quoted"' in text
+    assert text.endswith("\n")
@@ -1,9 +1,18 @@
+import os
 import shutil
 from collections.abc import Generator
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
-from ddeutil.io.paths import PathSearch, is_ignored, ls, replace_sep
+from ddeutil.io.paths import (
+    IgnoreMatcher,
+    PathSearch,
+    glob_files,
+    is_ignored,
+    ls,
+    replace_sep,
+)
 from ddeutil.io.utils import touch
 
 
@@ -177,3 +186,80 @@ def test_is_ignored():
     assert is_ignored(Path("config/settings.ini"), patterns6)
     assert not is_ignored(Path("src/main.py"), patterns6)
     assert not is_ignored(Path("readme.md"), patterns6)
+
+
+def test_ignore_matcher():
+    matcher = IgnoreMatcher(
+        ["*.log", "!keep.log", "build/", "/root.txt", "docs/**/*.md"]
+    )
+    assert matcher.match("foo/error.log")
+    assert not matcher.match("foo/keep.log")
+    assert matcher.match("build", is_dir=True)
+    assert not matcher.match("build")
+    assert matcher.match("src/build/main.py")
+    assert matcher.match("root.txt")
+    assert not matcher.match("src/root.txt")
+    assert matcher.match("docs/readme.md")
+    assert matcher.match("docs/api/v1/readme.md")
+    assert not matcher.match("src/docs.md")
+    assert not IgnoreMatcher([])
+
+
+def test_ls_prune(make_ls: Path):
+    visited: list[str] = []
+    scandir = os.scandir
+
+    def _scandir(path):
+        visited.append(Path(path).name)
+        return scandir(path)
+
+    with patch("ddeutil.io.paths.os.scandir", side_effect=_scandir):
+        files = ls(make_ls, ignore_file=".ignore_file")
+
+    assert len(files) == 4
+    assert "ignore_dir" not in visited
+    assert "tests_dir" not in visited
+
+
+def test_glob_files(make_path: Path):
+    files = list(glob_files(make_path, workers=4))
+    assert files == [
+        make_path / "00_01_test.text",
+        make_path / "dir01/01_01_test.text",
+        make_path / "dir01/01_02_test.text",
+        make_path / "dir02/02_01_test.text",
+    ]
+    assert files == list(glob_files(make_path, workers=1))
+    assert list(glob_files(make_path / "not_exists")) == []
+
+
+def test_base_path_search_tree(make_path):
+    ps = PathSearch(make_path, workers=2)
+    assert ps.tree().splitlines() == [
+        "[test_path_search]",
+        "├─[dir01]",
+        "│  ├─01_01_test.text",
+        "│  └─01_02_test.text",
+        "├─[dir02]",
+        "│  └─02_01_test.text",
+        "└─00_01_test.text",
+    ]
+    assert 2 == ps.level
+
+    ps = PathSearch(make_path, max_level=1)
+    assert [make_path / "00_01_test.text"] == ps.files
+
+
+def test_base_path_search_pick(make_ls: Path):
+    ps = PathSearch(make_ls)
+    assert ps.pick("*.json") == [make_ls / "dir02/02_01_test.json"]
+    assert ps.pick(["*.json", "tests_dir/*"]) == [
+        make_ls / "dir02/tests_dir/02_01_01_demo.yml",
+        make_ls / "dir02/02_01_test.json",
+        make_ls / "tests_dir/03_01_test.yml",
+        make_ls / "tests_dir/03_02_test.yml",
+    ]
+    assert ps.pick("*_ignore.yml") == [make_ls / "dir02/02_02_test_ignore.yml"]
+    assert ps.pick(".ignore_file") == [make_ls / ".ignore_file"]
+    assert ps.pick("*") == ps.files
+    assert ps.pick("*.toml") == []
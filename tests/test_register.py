@@ -8,8 +8,13 @@ from zoneinfo import ZoneInfo
 import pytest
 import yaml
 from ddeutil.io.config import Params
-from ddeutil.io.exceptions import RegisterArgumentError
-from ddeutil.io.register import Register
+from ddeutil.io.exceptions import RegisterArgumentError, StoreNotFound
+from ddeutil.io.register import (
+    Register,
+    merkle,
+    merkle_diff,
+    parse_stage_format,
+)
 
 
 @pytest.fixture(scope="module")
@@ -73,6 +78,11 @@ def test_register(params: Params, mock_get_date):
         "endpoint": "file:///null/tests/examples/dummy",
     } == register.data()
 
+    snapshot = register.snapshot()
+    assert snapshot == register.data()
+    with pytest.raises(TypeError):
+        snapshot["alias"] = "conn"
+
     assert {
         "alias": "62d877a16819c672578d7bded7f5903c",
         "type": "cece9f1b3f4791a04ec3d695cb5ba1a9",
@@ -176,3 +186,72 @@ def test_register_change_data(params, target_path):
 
     register_raw = register.move(stage="raw")
     assert register_raw.data()["__version"] == "v0.1.0"
+
+
+def test_register_merkle_diff():
+    base = {"a": "1", "b": ["x", "y", {"c": "2"}], "d": {"e": True}}
+    assert (
+        merkle(base).digest
+        == merkle(base | {"b": ["y", {"c": "2"}, "x"]}).digest
+    )
+    assert merkle_diff(merkle(base), merkle(base)) == 0
+    assert merkle_diff(merkle(base), merkle(base | {"a": "3"})) == 1
+    assert merkle_diff(merkle(base), merkle(base | {"d": {"e": "t"}})) == 1
+    assert merkle_diff(merkle(base), merkle(base | {"f": "4"})) == 2
+    assert merkle_diff(merkle(base), merkle(base | {"b": ["x", "y"]})) == 2
+    assert merkle_diff(merkle(base), merkle(base | {"b": ["x", "z", {}]})) == 1
+    assert (
+        merkle_diff(merkle(base), merkle(base | {"f": "4", "d": {"e": "t"}}))
+        == 1
+    )
+
+
+def test_register_compare_deep(params):
+    register = Register(name="demo:conn_local_file", params=params)
+    meta = register.data(hashing=True)
+    for data in (
+        meta,
+        meta | {"type": "changed"},
+        meta | {"extra": "added"},
+        {k: v for k, v in meta.items() if k != "endpoint"},
+    ):
+        with patch.object(Register, "compare_deep", True):
+            deep: int = register.compare_data(data)
+        assert deep == register.compare_data(data)
+
+    assert register.compare_data(meta | {"__digest": register.digest}) == 0
+
+
+def test_register_fmt_type_cache(params):
+    register = Register(name="demo:conn_local_file", params=params)
+    fmt_type = register.fmt_type
+    assert fmt_type is register.fmt_type
+    other = Register(name="demo:conn_local_file", params=params)
+    assert fmt_type is other.fmt_type
+
+    fmt: str = r"{naming:%s}.{timestamp:%Y%m%d_%H%M%S}\.json"
+    value: str = "conn_local_file.20240101_010000.json"
+    assert parse_stage_format(fmt_type, value, fmt) == fmt_type.parse(
+        value, fmt
+    )
+    assert parse_stage_format(fmt_type, "conn_other.json", fmt) is None
+
+
+def test_register_lazy(params):
+    with patch.object(Register, "get") as mock_get:
+        register = Register(
+            name="demo:conn_local_file", params=params, lazy=True
+        )
+        assert register.fullname == "demo:conn_local_file"
+        assert register.shortname == "clf"
+        mock_get.assert_not_called()
+
+    register = Register(name="demo:conn_local_file", params=params, lazy=True)
+    assert register.data()["alias"] == "conn_local_file"
+    eager = Register(name="demo:conn_local_file", params=params)
+    assert register.changed == eager.changed
+    assert register.switch("raw").lazy
+
+    register = Register(name="demo:not_exists", params=params, lazy=True)
+    with pytest.raises(StoreNotFound):
+        register.data()
@@ -1,13 +1,17 @@
+import json
 import shutil
 import time
 from collections.abc import Iterator
+from datetime import datetime
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 import yaml
 from ddeutil.io.config import Params
 from ddeutil.io.exceptions import RegisterArgumentError
 from ddeutil.io.register import ArchiveRegister, Register
+from ddeutil.io.stores import DbmStore, SqliteStore
 
 
 @pytest.fixture(scope="module")
@@ -174,3 +178,196 @@ def test_register_archive_deploy_raise(params_archive, target_path):
         ArchiveRegister(
             name="demo:conn_local_file", params=params_archive
         ).remove()
+
+
+@pytest.mark.parametrize("store", [SqliteStore, DbmStore])
+def test_register_archive_store_raise(params_archive, target_path, store):
+    register = ArchiveRegister(
+        name="demo:conn_local_file", params=params_archive
+    )
+    raw = store(target_path / f"data_archive/raw_{store.__name__}")
+    raw.save("conn_local_file.json", {"foo": "bar"})
+
+    # NOTE: The non-file store does not keep any stage file to archive, so it
+    #   should raise instead of dropping its versions from the manifest.
+    with pytest.raises(RegisterArgumentError):
+        register.archive("raw", raw, ["conn_local_file.json"])
+    assert raw.exists("conn_local_file.json")
+
+
+def test_register_archive_rename(params_archive, target_path):
+    register = ArchiveRegister(
+        name="demo:conn_local_file", params=params_archive
+    ).deploy()
+    archive_path = target_path / f"data_archive/{ArchiveRegister.archiving}"
+    before = set(archive_path.rglob("*"))
+
+    # NOTE: Archiving should rename files instead of copy them.
+    with patch("shutil.copy", side_effect=AssertionError("copy was called")):
+        register.remove()
+
+    assert not list((target_path / "data_archive/persisted").rglob("*"))
+    assert len(set(archive_path.rglob("*")) - before) > 0
+
+
+def test_register_archive_compact(params_archive, target_path):
+    archive_path = target_path / f"data_archive/{ArchiveRegister.archiving}"
+    loose = [
+        p
+        for p in archive_path.iterdir()
+        if p.is_file() and p.name != ArchiveRegister.archive_pending
+    ]
+    assert loose
+
+    segments = ArchiveRegister.compact(params_archive)
+    assert all(p.suffix == ".zip" for p in segments)
+    assert not any(
+        p.is_file()
+        and p.name not in (
+            ArchiveRegister.archive_index,
+            ArchiveRegister.archive_pending,
+        )
+        for p in archive_path.iterdir()
+    )
+    assert (archive_path / ArchiveRegister.archive_pending).read_text() == ""
+
+    # NOTE: The index keeps the records by the config fullname with the
+    #   compress type of its archived file.
+    index = ArchiveRegister.read_archive_index(params_archive)
+    assert "conn_local_file" not in index
+    records = index["demo:conn_local_file"]
+    assert {r["member"] for r in records} == {p.name for p in loose}
+    assert {r["compress"] for r in records} == {None}
+
+    register = ArchiveRegister(
+        name="demo:conn_local_file", params=params_archive
+    )
+    assert register.get_archive()["alias"] == "conn_local_file"
+    version = records[0]["version"]
+    data = register.get_archive(version, stage=records[0]["stage"])
+    assert data["__version"] == version
+    assert register.get_archive("v9.9.9") == {}
+
+    # NOTE: Compact new archived files to the tar segments with its index.
+    register.deploy().remove()
+    segments = ArchiveRegister.compact(
+        params_archive, bucket="%Y%m%d%H%M%S", compress="tar:gz"
+    )
+    assert all(p.name.endswith(".tar.gz") for p in segments)
+    assert all(p.with_name(f"{p.name}.index.json").exists() for p in segments)
+    assert register.get_archive(stage="persisted")["alias"] == (
+        "conn_local_file"
+    )
+
+    # NOTE: Append new archived files to the existing zip segment.
+    zip_segments = {p.name for p in archive_path.rglob("*.zip")}
+    register.deploy().remove()
+    segments = ArchiveRegister.compact(params_archive)
+    assert {p.name for p in segments} <= zip_segments
+    assert len(
+        ArchiveRegister.read_archive_index(params_archive)[
+            "demo:conn_local_file"
+        ]
+    ) > len(records)
+    assert ArchiveRegister.compact(params_archive) == []
+
+
+def test_register_archive_domain_compress(target_path):
+    (target_path / "conf/other").mkdir(parents=True, exist_ok=True)
+    with open(target_path / "conf/other/test_01_conn.yaml", mode="w") as f:
+        yaml.dump({"conn_local_file": {"type": "conn.Other"}}, f)
+
+    def make(compress):
+        return Params(
+            **{
+                "paths": {
+                    "root": target_path,
+                    "data": target_path / "data_archive_domain",
+                },
+                "stages": {
+                    "persisted": {
+                        "format": (
+                            "{naming:%s}.{version:v%m.%n.%c}"
+                            + (".{compress:%-g}" if compress else "")
+                        ),
+                        "rule": {"compress": compress},
+                    },
+                },
+            }
+        )
+
+    for domain in ("demo", "other"):
+        ArchiveRegister(
+            name=f"{domain}:conn_local_file", params=make("gzip")
+        ).deploy().remove()
+
+    # NOTE: The compaction uses the compress type that was kept on archiving
+    #   even if the compress rule of its stage was changed.
+    params = make(None)
+    assert ArchiveRegister.compact(params)
+    index = ArchiveRegister.read_archive_index(params)
+    assert {r["compress"] for r in index["other:conn_local_file"]} == {"gzip"}
+    assert (
+        ArchiveRegister(
+            name="demo:conn_local_file", params=params
+        ).get_archive()["type"]
+        == "connection.LocalFileStorage"
+    )
+    assert (
+        ArchiveRegister(
+            name="other:conn_local_file", params=params
+        ).get_archive()["type"]
+        == "conn.Other"
+    )
+
+
+def test_register_archive_delta(target_path):
+    data_path = target_path / "data_archive_delta"
+    params = Params(
+        **{
+            "paths": {"root": target_path, "data": data_path},
+            "stages": {
+                "raw": {
+                    "format": "{naming:%s}.{timestamp:%Y%m%d_%H%M%S}",
+                    "rule": {"delta": 3},
+                },
+            },
+        }
+    )
+    for i in range(3):
+        with open(target_path / "conf/demo/test_02_delta.yaml", mode="w") as f:
+            yaml.dump({"conn_delta": {"type": "conn.Dummy", "value": i}}, f)
+        with patch(
+            target="ddeutil.io.register.get_date",
+            return_value=datetime(2024, 1, 1, 1, i),
+        ):
+            ArchiveRegister(name="demo:conn_delta", params=params).deploy()
+
+    raw_path = data_path / "raw"
+    deltas = [
+        "__delta" in json.loads(f.read_text())
+        for f in sorted(raw_path.glob("*.json"))
+    ]
+    assert deltas == [False, True, True]
+
+    # NOTE: The delta stage files archive as the full snapshots.
+    ArchiveRegister(name="demo:conn_delta", stage="raw", params=params).remove()
+    assert not list(raw_path.glob("*.json"))
+    archived = sorted(
+        (
+            json.loads(f.read_text())
+            for f in (data_path / ArchiveRegister.archiving).glob("raw_*.json")
+        ),
+        key=lambda d: d["value"],
+    )
+    assert [(d["type"], d["value"]) for d in archived] == [
+        ("conn.Dummy", 0),
+        ("conn.Dummy", 1),
+        ("conn.Dummy", 2),
+    ]
+    assert not any("__delta" in d for d in archived)
+
+    assert ArchiveRegister.compact(params)
+    data = ArchiveRegister(name="demo:conn_delta", params=params).get_archive()
+    assert data["type"] == "conn.Dummy"
+    assert "__delta" not in data
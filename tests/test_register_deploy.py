@@ -1,4 +1,5 @@
 import json
+import os
 import shutil
 from collections.abc import Generator
 from datetime import datetime
@@ -7,8 +8,11 @@ from unittest.mock import patch
 
 import pytest
 import yaml
-from ddeutil.io.config import Params
-from ddeutil.io.register import Register
+from ddeutil.io.config import Params, Rule
+from ddeutil.io.exceptions import RegisterArgumentError
+from ddeutil.io.files import JsonLineFl
+from ddeutil.io.register import DeployResult, Register
+from ddeutil.io.stores import DbmStore, SqliteStore, Store, StoreLog
 
 
 @pytest.fixture(scope="module")
@@ -75,3 +79,351 @@ def test_register_multiple_files(params, target_path, root_path):
 
     register = Register(name="demo:conn_local_file", stage="raw", params=params)
     assert str(register.version()) == "0.0.1"
+
+
+def test_register_stage_manifest(params, target_path, mock_get_date):
+    data_path = target_path / "data"
+    register = Register(name="demo:conn_local_file", params=params)
+    register.deploy()
+
+    manifest = data_path / "__METADATA/democonn_local_file.raw.manifest.jsonl"
+    assert manifest.exists()
+    assert "conn_local_file.20240101_010000.json" in manifest.read_text()
+
+    # NOTE: Rebuild the manifest from the stage directory when it is missing.
+    manifest.unlink()
+    rs = Register(name="demo:conn_local_file", stage="raw", params=params)
+    assert rs.data()["type"] == "conn.LocalFileStorage"
+    assert manifest.exists()
+
+    # NOTE: Rebuild the manifest when it points to a file that was removed.
+    with open(manifest, mode="a") as f:
+        json.dump(
+            {
+                "name": "conn_local_file",
+                "domain": "demo",
+                "file": "conn_local_file.20991231_000000.json",
+                "timestamp": "2099-12-31 00:00:00",
+                "version": "0.0.1",
+            },
+            f,
+        )
+        f.write("\n")
+    rs = Register(name="demo:conn_local_file", stage="raw", params=params)
+    assert rs.data()["type"] == "conn.LocalFileStorage"
+    assert "20991231" not in manifest.read_text()
+
+    # NOTE: The latest stage file reads from the last record of the manifest
+    #   without reading all records.
+    with patch.object(JsonLineFl, "read", side_effect=AssertionError):
+        rs = Register(name="demo:conn_local_file", stage="raw", params=params)
+        assert rs.data()["type"] == "conn.LocalFileStorage"
+
+    # NOTE: Rebuild the manifest when the stage directory is newer than it.
+    newer = data_path / "raw/conn_local_file.20240102_000000.json"
+    with open(newer, mode="w") as f:
+        json.dump({"alias": "conn_local_file", "type": "conn.Newer"}, f)
+    mtime = manifest.stat().st_mtime_ns + 1_000_000_000
+    os.utime(data_path / "raw", ns=(mtime, mtime))
+    rs = Register(name="demo:conn_local_file", stage="raw", params=params)
+    assert rs.data()["type"] == "conn.Newer"
+    assert "20240102" in manifest.read_text()
+    newer.unlink()
+    rs = Register(name="demo:conn_local_file", stage="raw", params=params)
+    assert rs.data()["type"] == "conn.LocalFileStorage"
+
+    # NOTE: The stage files of the other config name do not rebuild it.
+    with open(target_path / "conf/demo/test_07_other.yaml", mode="w") as f:
+        yaml.dump({"conn_other": {"type": "conn.Other"}}, f)
+    Register(name="demo:conn_other", params=params).deploy()
+    mtime = (data_path / "raw").stat().st_mtime_ns - 1_000_000_000
+    os.utime(manifest, ns=(mtime, mtime))
+    with patch.object(Register, "_write_manifest", side_effect=AssertionError):
+        rs = Register(name="demo:conn_local_file", stage="raw", params=params)
+        assert rs.data()["type"] == "conn.LocalFileStorage"
+
+
+def test_register_deploy_pipeline(params, target_path, mock_get_date):
+    data_path = target_path / "data"
+    loaded: list[Path] = []
+    load = Store.load
+
+    def wrap_load(self, path, **kwargs):
+        loaded.append(path)
+        return load(self, path, **kwargs)
+
+    with patch.object(Store, "load", wrap_load):
+        rs = Register(name="demo:conn_local_file", params=params).deploy()
+
+    # NOTE: The stage data file will load only once per stage for change
+    #   detection because deploy carries the data in memory.
+    stage_files = [p for p in loaded if "__METADATA" not in str(p)]
+    assert len(stage_files) == len(params.stages)
+    assert rs.stage == "persisted"
+    persisted = Register(
+        name="demo:conn_local_file", stage="persisted", params=params
+    )
+    assert rs.data() == persisted.data()
+    assert (data_path / "persisted/demo_conn_local_file.gz.json").exists()
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_register_deploy_many(params, target_path, executor):
+    with open(target_path / "conf/demo/test_02_conn.yaml", mode="w") as f:
+        yaml.dump(
+            {
+                f"conn_many_{executor}_{i}": {"type": "conn.Dummy", "id": i}
+                for i in range(4)
+            },
+            f,
+        )
+
+    names = [f"demo:conn_many_{executor}_{i}" for i in range(4)]
+    rs = Register.deploy_many(
+        names + names[:1], params=params, workers=2, executor=executor
+    )
+    assert list(rs) == names
+    assert all(r.status == "moved" for r in rs.values())
+    assert rs[names[0]].stages == ("raw", "staging", "persisted")
+    assert (
+        target_path
+        / f"data/__METADATA/democonn_many_{executor}_0.persisted.json"
+    ).exists()
+
+    rs = Register.deploy_many("demo", params=params, executor=executor)
+    assert rs[names[0]] == DeployResult(names[0], "unchanged")
+    assert "demo:conn_local_file" in rs
+
+    # NOTE: The worker closes its connections even if the deploy was failed.
+    with patch.object(SqliteStore, "close_all") as close_all:
+        rs = Register.deploy_many(["demo:not_exists"], params=params)
+    close_all.assert_called_once()
+    assert rs["demo:not_exists"].status == "failed"
+    assert rs["demo:not_exists"].error.startswith("StoreNotFound")
+
+
+@patch("ddeutil.io.register.ProcessPoolExecutor")
+@patch.object(Register, "domain_names", side_effect=ValueError)
+def test_register_deploy_many_raise(_, mock_pool, params):
+    with pytest.raises(RegisterArgumentError):
+        Register.deploy_many([], params=params, executor="async")
+
+    # NOTE: The pool does not create before resolving the config names.
+    with pytest.raises(ValueError):
+        Register.deploy_many("demo", params=params, executor="process")
+    mock_pool.assert_not_called()
+
+
+def test_register_deploy_delta(target_path):
+    params = Params(
+        **{
+            "paths": {
+                "conf": target_path / "conf",
+                "data": target_path / "data_delta",
+            },
+            "stages": {
+                "raw": {
+                    "format": "{naming:%s}.{timestamp:%Y%m%d_%H%M%S}",
+                    "rule": {"delta": 3},
+                },
+            },
+        }
+    )
+    for i in range(5):
+        with open(target_path / "conf/demo/test_03_delta.yaml", mode="w") as f:
+            yaml.dump(
+                {
+                    "conn_delta": {
+                        "type": "conn.Dummy",
+                        "value": i,
+                        "extra": {"foo": "bar"} if i % 2 else {},
+                    }
+                },
+                f,
+            )
+        with patch(
+            target="ddeutil.io.register.get_date",
+            return_value=datetime(2024, 1, 1, 1, i),
+        ):
+            Register(name="demo:conn_delta", params=params).deploy()
+
+    raw_path = target_path / "data_delta/raw"
+    files = sorted(raw_path.glob("*.json"))
+    assert len(files) == 5
+    deltas = ["__delta" in json.loads(f.read_text()) for f in files]
+    assert deltas == [False, True, True, False, True]
+
+    register = Register(name="demo:conn_delta", stage="raw", params=params)
+    assert register.data()["value"] == 4
+    for order in range(1, 6):
+        data = register.get(stage="raw", order=order)
+        assert data["value"] == 5 - order
+        assert data["extra"] == ({"foo": "bar"} if (5 - order) % 2 else {})
+
+    # NOTE: Purge should keep the delta chains of retained stage files.
+    params.stages["raw"].rule = Rule(timestamp={"minutes": 2}, delta=3)
+    register.purge()
+    assert len(list(raw_path.glob("*.json"))) == 5
+
+    params.stages["raw"].rule = Rule(timestamp={"minutes": 1}, delta=3)
+    register.purge()
+    assert len(list(raw_path.glob("*.json"))) == 2
+    assert register.get(stage="raw", order=2)["value"] == 3
+
+
+@pytest.mark.parametrize("store", [SqliteStore, DbmStore])
+def test_register_deploy_store(target_path, store):
+    params = Params(
+        **{
+            "paths": {
+                "root": target_path,
+                "data": target_path / f"data_{store.__name__}",
+            },
+            "stages": {
+                "raw": {
+                    "format": "{naming:%s}.{timestamp:%Y%m%d_%H%M%S}",
+                    "rule": {"timestamp": {"minutes": 1}},
+                },
+                "persisted": {
+                    "format": "{naming:%s}.{version:v%m.%n.%c}.{compress:%-g}",
+                    "rule": {"compress": "gzip"},
+                },
+            },
+        }
+    )
+    for i in range(3):
+        with open(target_path / "conf/demo/test_04_store.yaml", mode="w") as f:
+            yaml.dump({"conn_store": {"type": "conn.Dummy", "value": i}}, f)
+        with patch(
+            target="ddeutil.io.register.get_date",
+            return_value=datetime(2024, 1, 1, 1, i),
+        ):
+            rs = Register(
+                name="demo:conn_store", params=params, store=store
+            ).deploy()
+    assert rs.data()["value"] == 2
+    assert rs.stage == "persisted"
+
+    # NOTE: The prefetch thread closes its connections for each stage.
+    with patch.object(
+        SqliteStore, "close_all", wraps=SqliteStore.close_all
+    ) as close_all:
+        Register(name="demo:conn_store", params=params, store=store).deploy()
+    assert close_all.call_count == 2
+
+    # NOTE: The stage areas keep only the database files.
+    raw_path = target_path / f"data_{store.__name__}/raw"
+    assert not list(raw_path.glob("*.json"))
+
+    raw = store(raw_path)
+    assert [p.name for p in raw.ls()] == [
+        "conn_store.20240101_010100.json",
+        "conn_store.20240101_010200.json",
+    ]
+    assert raw.get("conn_store")["value"] == 2
+    assert (
+        store(target_path / f"data_{store.__name__}/persisted").get(
+            "conn_store", version="v0.0.3"
+        )["value"]
+        == 2
+    )
+
+    register = Register(
+        name="demo:conn_store", stage="raw", params=params, store=store
+    )
+    assert register.get(stage="raw", order=2)["value"] == 1
+    register.remove()
+    assert list(raw.ls()) == []
+
+
+def test_register_deploy_generations(target_path):
+    data_path = target_path / "data_generations"
+    params = Params(
+        **{
+            "paths": {"root": target_path, "data": data_path},
+            "stages": {
+                "raw": {
+                    "format": "{naming:%s}.{timestamp:%Y%m%d_%H%M%S}",
+                    "rule": {"timestamp": {"minutes": 1}, "generations": 2},
+                },
+                "persisted": {"format": "{naming:%s}.{version:v%m.%n.%c}"},
+            },
+        }
+    )
+    for i in range(3):
+        with open(target_path / "conf/demo/test_05_gen.yaml", mode="w") as f:
+            yaml.dump({"conn_gen": {"type": "conn.Dummy", "value": i}}, f)
+        with patch(
+            target="ddeutil.io.register.get_date",
+            return_value=datetime(2024, 1, 1, 1, i),
+        ):
+            rs = Register(name="demo:conn_gen", params=params).deploy()
+    assert rs.data()["value"] == 2
+
+    # NOTE: The raw stage reads from the current generation that the pointer
+    #   points to, and it keeps only 2 generations.
+    raw_path = data_path / "raw"
+    assert (raw_path / "current").is_symlink()
+    assert not list(raw_path.glob("*.json"))
+    gens = sorted(p.name for p in (raw_path / ".generations").iterdir())
+    assert gens == ["00000002", "00000003"]
+    assert [p.name for p in Store(raw_path).ls()] == [
+        "conn_gen.20240101_010100.json",
+        "conn_gen.20240101_010200.json",
+    ]
+
+    # NOTE: The old generation still keeps its snapshot after flipping.
+    assert sorted(
+        p.name for p in (raw_path / ".generations/00000002").iterdir()
+    ) == [
+        "conn_gen.20240101_010000.json",
+        "conn_gen.20240101_010100.json",
+    ]
+
+    register = Register(name="demo:conn_gen", stage="raw", params=params)
+    assert register.get(stage="raw")["value"] == 2
+    assert register.get(stage="raw", order=2)["value"] == 1
+    assert not register._manifest_path("raw").exists()
+
+    register.remove()
+    assert list(Store(raw_path).ls()) == []
+    assert sorted(p.name for p in (raw_path / ".generations").iterdir()) == [
+        "00000003",
+        "00000004",
+    ]
+
+
+def test_register_deploy_generations_log(target_path):
+    data_path = target_path / "data_generations_log"
+    params = Params(
+        **{
+            "paths": {"root": target_path, "data": data_path},
+            "stages": {
+                "raw": {
+                    "format": "{naming:%s}.{timestamp:%Y%m%d_%H%M%S}",
+                    "rule": {"timestamp": {"minutes": 1}, "generations": 2},
+                },
+            },
+        }
+    )
+    for i in range(2):
+        with open(target_path / "conf/demo/test_06_gen.yaml", mode="w") as f:
+            yaml.dump({"conn_gen_log": {"type": "conn.Dummy", "value": i}}, f)
+        with patch(
+            target="ddeutil.io.register.get_date",
+            return_value=datetime(2024, 1, 1, 1, i),
+        ):
+            rs = Register(
+                name="demo:conn_gen_log", params=params, store=StoreLog
+            ).deploy()
+    assert rs.data()["value"] == 1
+
+    # NOTE: The StoreLog appends its log file in place, so it does not use the
+    #   generation dirs that hard link this file.
+    raw_path = data_path / "raw"
+    assert not (raw_path / ".generations").exists()
+    assert not (raw_path / "current").exists()
+    assert [p.name for p in StoreLog(raw_path).ls()] == [
+        "conn_gen_log.20240101_010000.json",
+        "conn_gen_log.20240101_010100.json",
+    ]
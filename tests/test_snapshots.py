@@ -0,0 +1,76 @@
+import copy
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from ddeutil.io.snapshots import FrozenDict, Snapshot, freeze, thaw
+
+
+def test_freeze():
+    data = {"foo": {"bar": [1, {"baz": {2, 3}}]}, "num": 1}
+    frozen = freeze(data)
+    assert isinstance(frozen, FrozenDict)
+    assert frozen == data | {"foo": {"bar": (1, {"baz": frozenset({2, 3})})}}
+    assert isinstance(frozen["foo"], FrozenDict)
+    assert frozen["foo"]["bar"] == (1, FrozenDict({"baz": frozenset({2, 3})}))
+
+    # NOTE: The frozen data does not share any mutable object with the source.
+    data["foo"]["bar"].append(4)
+    assert len(frozen["foo"]["bar"]) == 2
+
+    with pytest.raises(TypeError):
+        frozen["num"] = 2
+
+    with pytest.raises(TypeError):
+        frozen["foo"]["new"] = 2
+
+    with pytest.raises(AttributeError):
+        frozen.new = 1
+
+    # NOTE: Freeze and copy the frozen data does not create any new object.
+    assert freeze(frozen) is frozen
+    assert copy.copy(frozen) is frozen
+    assert copy.deepcopy({"snap": frozen})["snap"] is frozen
+    assert hash(frozen) == hash(freeze(frozen.thaw()))
+    assert pickle.loads(pickle.dumps(frozen)) == frozen
+    assert (frozen | {"num": 2})["num"] == 2
+    assert repr(FrozenDict({"a": 1})) == "FrozenDict({'a': 1})"
+
+    rs = thaw(frozen)
+    assert rs == {"foo": {"bar": [1, {"baz": {2, 3}}]}, "num": 1}
+    rs["foo"]["bar"].append(5)
+    assert len(frozen["foo"]["bar"]) == 2
+
+
+def test_snapshot():
+    snapshot = Snapshot({"conn": {"value": 1}})
+    assert snapshot.version == 0
+    before = snapshot.get()
+    assert before["conn"]["value"] == 1
+
+    snapshot.swap({"conn": {"value": 2}})
+    assert snapshot.current() == (1, FrozenDict({"conn": {"value": 2}}))
+
+    # NOTE: The reader that kept the previous snapshot does not see the swap.
+    assert before["conn"]["value"] == 1
+
+    snapshot.reload(lambda: {"conn": {"value": 3}})
+    assert snapshot.get()["conn"]["value"] == 3
+
+    snapshot.update("other", {"value": 1})
+    snapshot.update("conn", {})
+    assert snapshot.get() == {"other": {"value": 1}}
+    assert snapshot.version == 4
+
+
+def test_snapshot_update_concurrent():
+    snapshot = Snapshot()
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(
+            executor.map(
+                lambda i: snapshot.update(f"conn_{i}", {"value": i}),
+                range(50),
+            )
+        )
+    assert snapshot.version == 50
+    assert len(snapshot.get()) == 50
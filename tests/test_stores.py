@@ -2,13 +2,25 @@ from __future__ import annotations
 
 import json
 import os
+import queue
 import shutil
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 from collections.abc import Iterator
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 import yaml
-from ddeutil.io.stores import Store, StoreJsonToCsv, StoreToJsonLine
+from ddeutil.io.stores import (
+    DbmStore,
+    SqliteStore,
+    Store,
+    StoreJsonToCsv,
+    StoreLog,
+    StoreToJsonLine,
+)
+from ddeutil.io.watchers import Watcher
 
 
 @pytest.fixture(scope="module")
@@ -81,6 +93,29 @@ def test_store_get(target_path):
     assert {} == store.get(name="conn_local_file", order=2)
     assert {} == store.get(name="conn_local_file", order=10)
 
+    snapshot = store.snapshot(name="conn_local_file")
+    assert snapshot == store.get(name="conn_local_file")
+    with pytest.raises(TypeError):
+        snapshot["type"] = "connection.SFTP"
+
+
+def test_store_get_pointer_name(test_path):
+    pointer_path: Path = test_path / "store_file_pointer"
+    pointer_path.mkdir(exist_ok=True)
+    with open(pointer_path / "current", mode="w") as f:
+        yaml.dump({"conn_current": {"type": "connection.Dummy"}}, f)
+
+    # NOTE: The config file that has the same name with the generation pointer
+    #   should not resolve as the pointer if it does not have any generation.
+    store = Store(pointer_path)
+    assert [p.name for p in store.ls()] == ["current"]
+    assert store.get(name="conn_current")["type"] == "connection.Dummy"
+
+    (pointer_path / ".generations").mkdir()
+    assert [p.name for p in store.ls()] == ["current"]
+    assert store.get(name="conn_current")["type"] == "connection.Dummy"
+    shutil.rmtree(pointer_path)
+
 
 def test_store_move(target_path):
     store = Store(target_path)
@@ -253,3 +288,302 @@ def test_store_json_line(target_path):
         merge=True,
     )
     os.unlink(stage_path)
+
+
+@pytest.mark.parametrize("compress", [None, "gzip"])
+def test_store_sqlite(target_path, compress):
+    store = SqliteStore(target_path / f"sqlite_{compress}", compress=compress)
+    stage_path: Path = store.path / "conn_local_file.20240101_010000.json"
+    data = {
+        "alias": "conn_local_file",
+        "type": "connection.LocalFileStorage",
+        "__updt": "2024-01-01 01:00:00",
+        "__version": "v0.0.1",
+    }
+
+    store.create(path=stage_path, initial_data=data)
+    store.create(path=stage_path, initial_data={"foo": "bar"})
+    assert store.exists("conn_local_file.20240101_010000.json")
+    assert store.load(path=stage_path) == data
+    assert store.load(path="not_found.json", default={"foo": "bar"}) == {
+        "foo": "bar"
+    }
+
+    store.save(path=stage_path, data={"temp_additional": "foo"}, merge=True)
+    assert store.load(path=stage_path) == data | {"temp_additional": "foo"}
+
+    # NOTE: The failed merge should roll back without any changes.
+    with pytest.raises(TypeError):
+        store.save(path=stage_path, data="second", merge=True)
+    store.delete(path=stage_path, name="temp_additional")
+    assert store.load(path=stage_path) == data
+
+    store.save(
+        path="conn_local_file.20240102_010000.json",
+        data=data | {"__updt": "2024-01-02 01:00:00", "__version": "v0.0.2"},
+    )
+    assert store.get("conn_local_file")["__version"] == "v0.0.2"
+    assert store.get("conn_local_file", order=2)["__version"] == "v0.0.1"
+    assert store.get("conn_local_file", version="v0.0.1") == data
+    assert store.get("conn_local_file", order=3) == {}
+    assert [p.name for p in store.ls(name="*.json")] == [
+        "conn_local_file.20240101_010000.json",
+        "conn_local_file.20240102_010000.json",
+    ]
+
+    store.save(path="list.json", data=[{"foo": "bar"}])
+    store.save(path="list.json", data=[{"baz": "bar"}], merge=True)
+    assert store.load(path="list.json") == [{"foo": "bar"}, {"baz": "bar"}]
+    assert [p.name for p in store.ls(excluded=["conn_*"])] == ["list.json"]
+
+    store.move("list.json", dest=target_path / "sqlite_export/list.json")
+    assert json.loads(
+        (target_path / "sqlite_export/list.json").read_text()
+    ) == [{"foo": "bar"}, {"baz": "bar"}]
+
+    for file in store.ls():
+        store.remove(file)
+    assert list(store.ls()) == []
+
+    conn = store.conn
+    SqliteStore.close_all()
+    with pytest.raises(sqlite3.ProgrammingError):
+        conn.execute("SELECT 1")
+    assert store.conn is not conn
+    store.close()
+
+
+def test_store_dbm(target_path):
+    store = DbmStore(target_path / "dbm")
+    assert store.get("conn_local_file") == {}
+    assert store.load(path="conn_local_file.v0.0.1.json") == {}
+    assert not store.exists("conn_local_file.v0.0.1.json")
+    assert list(store.ls()) == []
+
+    # NOTE: The readers do not create the database file.
+    assert list(store.path.iterdir()) == []
+
+    data = {
+        "alias": "conn_local_file",
+        "type": "connection.LocalFileStorage",
+        "__updt": "2024-01-01 01:00:00",
+        "__version": "v0.0.1",
+    }
+    store.create(
+        path=store.path / "conn_local_file.v0.0.1.json", initial_data=data
+    )
+    store.create(
+        path="conn_local_file.v0.0.1.json", initial_data={"foo": "bar"}
+    )
+    assert store.exists("conn_local_file.v0.0.1.json")
+    assert store.load(path="conn_local_file.v0.0.1.json") == data
+    assert store.get("conn_local_file") == data
+
+    # NOTE: The readers hold only the shared lock, so they do not block each
+    #   other.
+    with store.open("r"), ThreadPoolExecutor(max_workers=1) as executor:
+        assert (
+            executor.submit(store.get, "conn_local_file").result(timeout=5)
+            == data
+        )
+
+    # NOTE: The delta data will resolve with its parent before keeping it on
+    #   the lookup keys.
+    store.save(
+        path="conn_local_file.v0.0.2.json",
+        data={
+            "alias": "conn_local_file",
+            "__updt": "2024-01-02 01:00:00",
+            "__version": "v0.0.2",
+            "__delta": {
+                "parent": "conn_local_file.v0.0.1.json",
+                "depth": 1,
+                "ops": [
+                    {
+                        "op": "replace",
+                        "path": "/__updt",
+                        "value": "2024-01-02 01:00:00",
+                    },
+                    {"op": "replace", "path": "/__version", "value": "v0.0.2"},
+                    {"op": "add", "path": "/host", "value": "localhost"},
+                ],
+            },
+        },
+    )
+    latest = data | {
+        "__updt": "2024-01-02 01:00:00",
+        "__version": "v0.0.2",
+        "host": "localhost",
+    }
+    assert store.get("conn_local_file") == latest
+    assert store.get("conn_local_file", version="v0.0.1") == data
+    assert store.get("conn_local_file", order=2) == data
+    assert store.get("conn_local_file", order=3) == {}
+    assert [p.name for p in store.ls(name="*.json")] == [
+        "conn_local_file.v0.0.1.json",
+        "conn_local_file.v0.0.2.json",
+    ]
+
+    # NOTE: The older version does not override the latest key.
+    store.save(
+        path="conn_local_file.v0.0.1.json", data={"foo": "bar"}, merge=True
+    )
+    assert store.get("conn_local_file") == latest
+    store.delete(path="conn_local_file.v0.0.1.json", name="foo")
+    assert store.load(path="conn_local_file.v0.0.1.json") == data
+
+    store.save(path="list.json", data=[{"foo": "bar"}])
+    store.save(path="list.json", data=[{"baz": "bar"}], merge=True)
+    assert store.load(path="list.json") == [{"foo": "bar"}, {"baz": "bar"}]
+    store.move("list.json", dest=target_path / "dbm_export/list.json")
+    assert (target_path / "dbm_export/list.json").exists()
+
+    # NOTE: Remove the latest document will switch the latest key back.
+    store.remove("conn_local_file.v0.0.2.json")
+    assert store.get("conn_local_file") == data
+    assert store.get("conn_local_file", version="v0.0.2") == {}
+    store.remove("conn_local_file.v0.0.1.json")
+    assert store.get("conn_local_file") == {}
+    assert [p.name for p in store.ls()] == ["list.json"]
+    assert store.decode(store.encode({"foo": 1})) == {"foo": 1}
+
+    # NOTE: It falls back to the stable json encoder without msgpack.
+    with patch("ddeutil.io.stores.msgpack", None):
+        value: bytes = store.encode({"foo": [1, "bar"]})
+        assert value == b'j{"foo": [1, "bar"]}'
+        assert store.decode(value) == {"foo": [1, "bar"]}
+
+
+def test_store_log(target_path):
+    store = StoreLog(target_path)
+    stage_path: Path = target_path / "connections/test_01_conn_stage_log.json"
+    log_path: Path = store.log_path(stage_path)
+    stage_path.parent.mkdir(parents=True, exist_ok=True)
+
+    store.save(path=stage_path, data={"first": 1}, merge=True)
+    assert not log_path.exists()
+
+    store.save(path=stage_path, data={"second": 2}, merge=True)
+    store.save(path=stage_path, data={"first": 3}, merge=True)
+    store.delete(path=stage_path, name="second")
+    assert log_path.exists()
+    assert Store(target_path).load(path=stage_path) == {"first": 1}
+    assert store.load(path=stage_path) == {"first": 3}
+
+    with pytest.raises(TypeError):
+        store.save(path=stage_path, data="second", merge=True)
+    assert store.load(path=stage_path) == {"first": 3}
+
+    # NOTE: The partial record at the end of log will skip, and the next
+    #   appending truncates it.
+    with open(log_path, mode="a") as f:
+        f.write('{"set": {"first"')
+    assert store.load(path=stage_path) == {"first": 3}
+    store.save(path=stage_path, data={"fourth": 4}, merge=True)
+    assert log_path.read_text().endswith('{"set": {"fourth": 4}}\n')
+    assert store.load(path=stage_path) == {"first": 3, "fourth": 4}
+    store.delete(path=stage_path, name="fourth")
+
+    # NOTE: The invalid record that is not the last record will raise.
+    log_text: str = log_path.read_text()
+    log_path.write_text('{"set": {"first"\n' + log_text)
+    with pytest.raises(ValueError):
+        store.load(path=stage_path)
+    log_path.write_text(log_text)
+
+    store.compact(stage_path)
+    assert not log_path.exists()
+    assert Store(target_path).load(path=stage_path) == {"first": 3}
+
+    with patch.object(StoreLog, "compact_min_size", 64):
+        store.save(path=stage_path, data={"second": 2}, merge=True)
+        assert log_path.exists()
+        store.save(path=stage_path, data={"third": "x" * 100}, merge=True)
+        assert not log_path.exists()
+    assert Store(target_path).load(path=stage_path) == {
+        "first": 3,
+        "second": 2,
+        "third": "x" * 100,
+    }
+
+    # NOTE: The overwrite saving will drop the mutation log.
+    store.delete(path=stage_path, name="third")
+    store.save(path=stage_path, data={"foo": "bar"})
+    assert not log_path.exists()
+    assert store.load(path=stage_path) == {"foo": "bar"}
+    os.unlink(stage_path)
+
+    list_path: Path = (
+        target_path / "connections/test_01_conn_stage_log_list.json"
+    )
+    store.save(path=list_path, data=[{"foo": "bar"}])
+    store.save(path=list_path, data={"baz": "bar"}, merge=True)
+    assert not store.log_path(list_path).exists()
+    assert store.load(path=list_path) == [{"foo": "bar"}, {"baz": "bar"}]
+    os.unlink(list_path)
+
+    # NOTE: The log can exist without its stage file.
+    missing_path: Path = target_path / "connections/test_01_conn_missing.json"
+    store.log_path(missing_path).write_text('{"set": {"foo": "bar"}}\n')
+    store.save(path=missing_path, data={"baz": 1}, merge=True)
+    assert store.load(path=missing_path) == {"foo": "bar", "baz": 1}
+    os.unlink(store.log_path(missing_path))
+
+
+def test_store_save_concurrent(target_path):
+    store = Store(target_path)
+    stage_path: Path = target_path / "connections/test_01_conn_stage_lock.json"
+    stage_path.parent.mkdir(parents=True, exist_ok=True)
+    store.save(path=stage_path, data={})
+
+    def merge(i: int):
+        for j in range(5):
+            store.save(path=stage_path, data={f"{i}_{j}": j}, merge=True)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(merge, range(4)))
+
+    assert len(store.load(path=stage_path)) == 20
+    assert not list(stage_path.parent.glob("*.tmp"))
+    os.unlink(stage_path)
+
+
+@pytest.mark.parametrize("polling", [True, False])
+@patch.object(Watcher, "interval", 0.05)
+def test_store_watch(target_path, polling):
+    watch_path: Path = target_path / f"watch_{polling}"
+    watch_path.mkdir()
+    with open(watch_path / "test_01_conn.yaml", mode="w") as f:
+        yaml.dump({"conn_a": {"value": 1}, "conn_b": {"value": 1}}, f)
+    with open(watch_path / "test_02_conn.yaml", mode="w") as f:
+        yaml.dump({"conn_c": {"value": 1}}, f)
+
+    events: queue.Queue = queue.Queue()
+    store = Store(watch_path)
+    with patch.object(Store, "open_file", wraps=Store.open_file) as mock:
+        watcher = store.watch(
+            ["conn_a", "conn_c"],
+            lambda name, data: events.put((name, data)),
+            polling=polling,
+        )
+        assert mock.call_count == 2
+        try:
+            # NOTE: Change only the unwatched name, it re-parses this file but
+            #   does not call the callback.
+            with open(watch_path / "test_01_conn.yaml", mode="w") as f:
+                yaml.dump({"conn_a": {"value": 1}, "conn_b": {"value": 2}}, f)
+            with open(watch_path / "test_02_conn.yaml", mode="w") as f:
+                yaml.dump({"conn_c": {"value": 2}}, f)
+            assert events.get(timeout=5) == (
+                "conn_c",
+                {"alias": "conn_c", "value": 2},
+            )
+            assert mock.call_count == 4
+
+            (watch_path / "test_02_conn.yaml").unlink()
+            assert events.get(timeout=5) == ("conn_c", {})
+            assert mock.call_count == 4
+            assert events.empty()
+        finally:
+            watcher.stop()
+    assert not watcher.alive
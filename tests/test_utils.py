@@ -1,12 +1,19 @@
 import csv
+import errno
 import os
 import shutil
+import threading
 from collections.abc import Iterator
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 from ddeutil.io.utils import (
+    json_diff,
+    json_patch,
+    lock_file,
     map_func,
+    move_files,
     reverse_readline,
     search_env,
     search_env_replace,
@@ -155,3 +162,89 @@ def test_files_utils_reverse_read(utils_path, csv_data):
         "B,2,test2\n",
         "A,1,test1\n",
     ]
+
+
+def test_move_files(test_path):
+    root = test_path / "move_files_temp"
+    (root / "src").mkdir(parents=True, exist_ok=True)
+    for i in range(3):
+        (root / f"src/file_{i}.txt").write_text(f"data {i}")
+
+    rs = move_files(
+        (root / f"src/file_{i}.txt", root / f"dest/file_{i}.txt")
+        for i in range(3)
+    )
+    assert rs == [root / f"dest/file_{i}.txt" for i in range(3)]
+    assert not any((root / "src").iterdir())
+    assert (root / "dest/file_1.txt").read_text() == "data 1"
+
+    # NOTE: Fall back to copy and remove when it moves across devices.
+    (root / "src/file_x.txt").write_text("data x")
+    with patch(
+        "ddeutil.io.utils.os.replace",
+        side_effect=OSError(errno.EXDEV, "Invalid cross-device link"),
+    ):
+        move_files([(root / "src/file_x.txt", root / "dest/file_x.txt")])
+    assert not (root / "src/file_x.txt").exists()
+    assert (root / "dest/file_x.txt").read_text() == "data x"
+
+    shutil.rmtree(root)
+
+
+def test_json_diff_patch():
+    source = {"a": {"b": [1, 2], "c": "x"}, "d": True, "e": 1}
+    target = {"a": {"b": [1, 3], "c/d": {"f": 1}}, "d": 1, "g": None}
+    ops = json_diff(source, target)
+    assert {"op": "remove", "path": "/e"} in ops
+    assert {"op": "add", "path": "/a/c~1d", "value": {"f": 1}} in ops
+    assert {"op": "replace", "path": "/d", "value": 1} in ops
+    assert json_patch(source, ops) == target
+    assert source["e"] == 1
+    assert json_diff(target, target) == []
+    assert json_patch({}, json_diff({}, [1])) == [1]
+
+    with pytest.raises(ValueError):
+        json_patch({}, [{"op": "move", "path": "/a"}])
+
+
+def test_lock_file(test_path):
+    path: Path = test_path / "test_lock_file.json"
+    locked = threading.Event()
+    before = set(test_path.iterdir())
+
+    # NOTE: All files in the same dir share the lock of this dir.
+    def acquire():
+        with lock_file(test_path / "test_lock_file_other.json"):
+            locked.set()
+
+    with lock_file(path):
+        # NOTE: The nested lock on the same thread is reentrant with the same
+        #   or the weaker mode.
+        with lock_file(path, shared=True):
+            with lock_file(path):
+                pass
+
+        thread = threading.Thread(target=acquire)
+        thread.start()
+        assert not locked.wait(0.2)
+
+    thread.join(timeout=5)
+    assert locked.is_set()
+
+    # NOTE: The nested exclusive lock does not upgrade the shared lock, and
+    #   the shared lock still holds after it raises.
+    locked.clear()
+    with lock_file(path, shared=True):
+        with pytest.raises(RuntimeError):
+            with lock_file(path):
+                pass  # pragma: no cov
+
+        thread = threading.Thread(target=acquire)
+        thread.start()
+        assert not locked.wait(0.2)
+
+    thread.join(timeout=5)
+    assert locked.is_set()
+
+    # NOTE: It does not create any lock file.
+    assert set(test_path.iterdir()) == before
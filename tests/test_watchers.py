@@ -0,0 +1,64 @@
+import shutil
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from ddeutil.io.watchers import Watcher, signature
+
+
+@pytest.fixture(scope="module")
+def target_path(test_path) -> Iterator[Path]:
+    tgt_path: Path = test_path / "watchers_temp"
+    tgt_path.mkdir(exist_ok=True)
+    yield tgt_path
+    shutil.rmtree(tgt_path)
+
+
+def test_signature(target_path):
+    (target_path / "sig.txt").write_text("foo")
+    sig = signature(target_path / "sig.txt")
+    assert sig is not None
+    assert signature(target_path) is None
+    assert signature(target_path / "not_exists.txt") is None
+
+    (target_path / "sig.txt").write_text("foo bar")
+    assert signature(target_path / "sig.txt") != sig
+
+
+@pytest.mark.parametrize("polling", [True, False])
+@patch.object(Watcher, "interval", 0.05)
+def test_watcher(target_path, polling):
+    watch_path: Path = target_path / f"watch_{polling}"
+    (watch_path / "sub").mkdir(parents=True)
+    (watch_path / "exists.txt").write_text("foo")
+    (watch_path / "sub/old.txt").write_text("foo")
+
+    changed: set[Path] = set()
+    event = threading.Event()
+
+    def callback(paths: set[Path]) -> None:
+        changed.update(paths)
+        if len(changed) >= 3:
+            event.set()
+
+    with Watcher(watch_path, callback, polling=polling) as watcher:
+        assert watcher.alive
+        assert watcher.polling or not polling
+
+        # NOTE: Many writes of the same file report it once, and the hidden
+        #   file does not report.
+        for i in range(3):
+            (watch_path / "exists.txt").write_text(f"bar {i}")
+        (watch_path / ".hidden.tmp").write_text("bar")
+        (watch_path / "sub/old.txt").unlink()
+        (watch_path / "sub/new.txt").write_text("baz")
+        assert event.wait(timeout=5)
+
+    assert not watcher.alive
+    assert changed == {
+        watch_path / "exists.txt",
+        watch_path / "sub/old.txt",
+        watch_path / "sub/new.txt",
+    }